@@ -0,0 +1,65 @@
+"""
+Benchmark: AnalysisEngine() construction time and memory.
+
+Usage:
+    python benchmarks/bench_engine_construction.py [--engines 50]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import psutil
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+
+def bench_construction(engines: int) -> dict:
+    """Constructs `engines` AnalysisEngine instances and records cost per engine."""
+    logging.getLogger("HyperInsight.Core").setLevel(logging.WARNING)
+    process = psutil.Process()
+    # First engine pays one-off import and shared-state costs; report it separately
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        first = hi.core.engine.AnalysisEngine()
+        first_ms = (time.perf_counter() - start) * 1000
+
+        rss_before = process.memory_info().rss
+        tracemalloc.start()
+        kept = []
+        timings = []
+        for _ in range(engines):
+            start = time.perf_counter()
+            kept.append(hi.core.engine.AnalysisEngine())
+            timings.append((time.perf_counter() - start) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = process.memory_info().rss
+
+    timings.sort()
+    return {
+        "engines": engines,
+        "first_engine_ms": round(first_ms, 3),
+        "median_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "traced_peak_bytes_per_engine": peak // engines,
+        "rss_bytes_per_engine": max(rss_after - rss_before, 0) // engines,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", type=int, default=50)
+    args = parser.parse_args()
+
+    result = bench_construction(args.engines)
+    print("⏱️ --- AnalysisEngine() Construction ---")
+    for key, value in result.items():
+        print(f"{key:32s} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: fused anomaly/trend kernel vs. the per-column path.
+
+The per-column path is what `_analyze_trends`/`_detect_anomalies` did
+before the kernel: one ColumnStats pass per column, then a boolean-masked
+3-sigma count per column. The fused path is `fused_stats` + `count_outliers`.
+A 10M x 200 float64 frame needs ~16 GB; use --rows/--cols on smaller hosts.
+
+Usage:
+    python benchmarks/bench_numeric_kernel.py [--rows 10000000] [--cols 200] [--chunk-rows 8192] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hyperinsight.core.statistics import ColumnStats, count_outliers, fused_stats, numeric_columns
+
+def per_column_path(df: pd.DataFrame) -> dict:
+    result = {}
+    for col in numeric_columns(df):
+        stats = ColumnStats.from_series(df[col])
+        low, high = stats.mean - 3*stats.std, stats.mean + 3*stats.std
+        values = df[col]
+        result[col] = (stats.mean, stats.std, int(((values > high) | (values < low)).sum()), stats.last - stats.first)
+    return result
+
+def fused_path(df: pd.DataFrame, chunk_rows, chunk_cols) -> dict:
+    stats = fused_stats(df, chunk_rows=chunk_rows, chunk_cols=chunk_cols)
+    counts = count_outliers(df, {col: s.bounds(3.0) for col, s in stats.items()}, chunk_rows, chunk_cols)
+    return {col: (s.mean, s.std, counts[col], s.last - s.first) for col, s in stats.items()}
+
+def best_of(repeat: int, func, *args) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--chunk-rows", type=int, default=8_192, help="0 = one block over all rows")
+    parser.add_argument("--chunk-cols", type=int, default=16, help="0 = all columns in one block")
+    parser.add_argument("--null-fraction", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal((args.rows, args.cols))
+    if args.null_fraction:
+        values[rng.random(values.shape) < args.null_fraction] = np.nan
+    df = pd.DataFrame(values, columns=[f"c{i}" for i in range(args.cols)])
+    del values
+
+    baseline_s, expected = best_of(args.repeat, per_column_path, df)
+    fused_s, got = best_of(args.repeat, fused_path, df, args.chunk_rows or None, args.chunk_cols or None)
+    assert all(got[col][2] == expected[col][2] for col in expected), "outlier counts differ"
+    assert all(np.isclose(got[col][0], expected[col][0]) for col in expected), "means differ"
+
+    cells = args.rows * args.cols
+    print("⏱️ --- Anomaly/Trend Kernel ---")
+    print(f"{'shape':32s} {args.rows} x {args.cols}")
+    print(f"{'per_column_s':32s} {baseline_s:.3f}")
+    print(f"{'fused_s':32s} {fused_s:.3f}")
+    print(f"{'fused_cells_per_s':32s} {cells / fused_s:,.0f}")
+    print(f"{'speedup':32s} {baseline_s / fused_s:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: mode of an object column, exact `value_counts` vs. the chunked
+Misra-Gries sketch with and without per-chunk sampling.
+
+Each timing is the best of `--repeat` runs; the column is built once and
+never timed.
+
+Usage:
+    python benchmarks/bench_sketches.py [--rows 4000000] [--distinct 1000] [--chunk-rows 1000000]
+                                        [--sample-rows 65536] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hyperinsight.utils.sketches import sketch_column
+
+def make_labels(rows: int, distinct: int, seed: int = 0) -> pd.Series:
+    """Object labels where `id_0` holds 30% of the rows and the rest are uniform."""
+    rng = np.random.default_rng(seed)
+    weights = np.r_[0.3, np.full(distinct - 1, 0.7 / (distinct - 1))]
+    labels = np.array([f"id_{i}" for i in range(distinct)], dtype=object)
+    return pd.Series(labels[rng.choice(distinct, rows, p=weights)], dtype=object)
+
+def best(func, repeat: int) -> tuple:
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=4_000_000)
+    parser.add_argument("--distinct", type=int, default=1_000)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--sample-rows", type=int, default=65_536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    labels = make_labels(args.rows, args.distinct)
+    cases = {
+        "value_counts": lambda: labels.value_counts().idxmax(),
+        "misra_gries": lambda: sketch_column(labels, args.chunk_rows, ["heavy_hitters"])["heavy_hitters"].mode(),
+        "misra_gries_sampled": lambda: sketch_column(labels, args.chunk_rows, ["heavy_hitters"],
+                                                     sample_rows=args.sample_rows)["heavy_hitters"].mode()
+    }
+    print(f"⏱️ --- Column Mode ({args.rows:,d} object rows, {args.distinct:,d} distinct) ---")
+    print(f"{'method':>20s} {'best_s':>10s} {'rows_per_sec':>14s} {'speedup':>9s} {'mode':>8s}")
+    baseline = None
+    for name, func in cases.items():
+        seconds, mode = best(func, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:>20s} {seconds:>10.4f} {round(args.rows / seconds):>14,d} {baseline / seconds:>8.1f}x {mode:>8s}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Benchmark suite: every AnalysisEngine hot path on synthetic data.
+
+Each case runs against generated frames at the requested scales and shapes
+("narrow": 9 mixed columns, "wide": the same plus 190 float features). Setup
+(engine construction, file writing, prior commits) is never timed. Cases
+whose working set would not fit in available memory, or that exceed their
+cell cap (Excel), are recorded as skipped.
+
+Results are written as JSON; `compare` flags cases whose best time got
+slower than the baseline by more than `--threshold` and exits non-zero.
+
+Usage:
+    python benchmarks/suite.py run [--scales 1e4 1e5 1e6] [--shapes narrow wide] [--cases clean_data ...]
+                                   [--repeat 3] [--out results.json]
+    python benchmarks/suite.py compare baseline.json candidate.json [--threshold 0.10]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import psutil
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.connectors.ingestion import DataConnector
+from hyperinsight.ethics.bias import EthicsModule
+
+WIDE_FEATURES = 190
+QUERY = "Analyze growth and hidden anomalies"
+
+def make_frame(rows: int, shape: str = "narrow", seed: int = 0) -> pd.DataFrame:
+    """Synthetic sales data with nulls (~5%), duplicate rows (~1%) and protected attributes."""
+    rng = np.random.default_rng(seed)
+    sales = 1000 + np.cumsum(rng.standard_normal(rows) * 10)
+    sales[rng.random(rows) < 0.05] = np.nan
+    region = rng.choice(np.array(["North", "South", "East", "West", None], dtype=object), rows, p=[.3, .3, .2, .15, .05])
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "sales": sales,
+        "marketing_spend": rng.uniform(100, 500, rows),
+        "units": rng.integers(0, 50, rows),
+        "region": region,
+        "segment": rng.choice(["Urban", "Suburban", "Rural"], rows, p=[.5, .35, .15]),
+        "gender": rng.choice(["F", "M", "X"], rows, p=[.49, .49, .02]),
+        "age": rng.integers(18, 90, rows),
+        "zip_code": rng.integers(10_000, 10_500, rows)
+    })
+    if shape == "wide":
+        features = pd.DataFrame(rng.standard_normal((rows, WIDE_FEATURES)), columns=[f"f{i}" for i in range(WIDE_FEATURES)])
+        df = pd.concat([df, features], axis=1)
+    # The last 1% of rows repeat earlier ones
+    kept = rows - rows // 100
+    order = np.concatenate([np.arange(kept), rng.integers(0, kept, rows - kept)])
+    return df.take(order).reset_index(drop=True)
+
+def estimated_bytes(rows: int, shape: str) -> int:
+    cols = 9 + (WIDE_FEATURES if shape == "wide" else 0)
+    return rows * cols * 8
+
+# --- cases: setup(df, workdir) -> state (untimed), run(state) (timed) ---------
+
+def _engine(df):
+    return hi.core.engine.AnalysisEngine(df.copy())
+
+def _file(fmt):
+    def setup(df, workdir):
+        path = os.path.join(workdir, f"bench-{len(df)}-{len(df.columns)}.{fmt}")
+        if not os.path.exists(path):
+            if fmt == "csv":
+                df.to_csv(path, index=False)
+            elif fmt == "parquet":
+                df.to_parquet(path, index=False)
+            else:
+                df.to_excel(path, index=False)
+        return path
+    return setup
+
+def _committed(df, workdir):
+    engine = _engine(df)
+    changed = engine.data.copy(deep=False)
+    changed["marketing_spend"] = changed["marketing_spend"] * 1.1
+    return engine, changed
+
+def _with_history(df, workdir):
+    engine = _engine(df)
+    for target in ("North", "South", "East"):
+        engine.replace_values("region", target, target.upper())
+    return engine
+
+def _warm_intent(df, workdir):
+    engine = _engine(df)
+    engine.process_intent(QUERY)
+    return engine
+
+def _slices(df, workdir):
+    return _engine(df.iloc[:100]), np.array_split(df, 8)
+
+CASES = {
+    # name: (setup, run, max_cells)
+    "construction": (lambda df, workdir: df, lambda df: hi.core.engine.AnalysisEngine(df), None),
+    "load_csv": (_file("csv"), lambda path: DataConnector().load_file(path), None),
+    "load_parquet": (_file("parquet"), lambda path: DataConnector().load_file(path), None),
+    "load_excel": (_file("xlsx"), lambda path: DataConnector().load_file(path), 2_000_000),
+    "fill_nulls": (lambda df, workdir: _engine(df), lambda engine: engine.fill_nulls("auto"), None),
+    "clean_data": (lambda df, workdir: _engine(df), lambda engine: engine.clean_data(), None),
+    "replace_values": (lambda df, workdir: _engine(df),
+                       lambda engine: engine.replace_values("region", "North", "Nord"), None),
+    "commit": (_committed, lambda state: state[0].state_manager.commit(state[1], "bench", changed=["marketing_spend"]), None),
+    "rollback": (_with_history, lambda engine: engine.rollback(to="initial"), None),
+    "process_intent": (lambda df, workdir: _engine(df), lambda engine: engine.process_intent(QUERY), None),
+    "process_intent_cached": (_warm_intent, lambda engine: engine.process_intent(QUERY), None),
+    "batch_process": (_slices, lambda state: state[0].batch_process(state[1], mode="thread"), None),
+    "audit_dataset": (lambda df, workdir: df, lambda df: EthicsModule().audit_dataset(df), None),
+}
+
+def run_case(name: str, df: pd.DataFrame, workdir: str, repeat: int) -> dict:
+    setup, run, _ = CASES[name]
+    timings = []
+    for _ in range(repeat):
+        state = setup(df, workdir)
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+        del state
+    timings.sort()
+    return {
+        "best_s": round(timings[0], 6),
+        "median_s": round(timings[len(timings) // 2], 6),
+        "mean_s": round(sum(timings) / len(timings), 6),
+        "rows_per_sec": round(len(df) / timings[0]) if timings[0] else None
+    }
+
+def run_suite(scales, shapes, cases, repeat: int, progress=print) -> dict:
+    logging.getLogger("HyperInsight.Core").setLevel(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="hyperinsight-bench-") as workdir:
+        for shape in shapes:
+            for rows in scales:
+                base = {"shape": shape, "rows": rows}
+                if estimated_bytes(rows, shape) * 4 > psutil.virtual_memory().available:
+                    results += [dict(base, case=name, status="skipped", reason="insufficient memory") for name in cases]
+                    continue
+                df = make_frame(rows, shape)
+                for name in cases:
+                    entry = dict(base, case=name, cols=len(df.columns), repeat=repeat)
+                    limit = CASES[name][2]
+                    if limit is not None and df.size > limit:
+                        results.append(dict(entry, status="skipped", reason=f"capped at {limit:,} cells"))
+                        progress(_format_entry(results[-1]))
+                        continue
+                    try:
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            entry.update(run_case(name, df, workdir, repeat), status="ok")
+                    except Exception as e:
+                        entry.update(status="error", reason=f"{type(e).__name__}: {e}")
+                    results.append(entry)
+                    progress(_format_entry(entry))
+                del df
+    return {"meta": _metadata(), "results": results}
+
+def compare(baseline: dict, candidate: dict, threshold: float = 0.10) -> dict:
+    """Pairs results by (case, shape, rows); `ratio` is candidate / baseline best time."""
+    before = {_key(r): r for r in baseline["results"] if r.get("status") == "ok"}
+    rows = []
+    for result in candidate["results"]:
+        old = before.get(_key(result))
+        if result.get("status") != "ok" or old is None:
+            continue
+        ratio = result["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        verdict = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "unchanged"
+        rows.append({"case": result["case"], "shape": result["shape"], "rows": result["rows"],
+                     "baseline_s": old["best_s"], "candidate_s": result["best_s"],
+                     "ratio": round(ratio, 3), "verdict": verdict})
+    return {
+        "threshold": threshold,
+        "comparisons": rows,
+        "regressions": [r for r in rows if r["verdict"] == "regression"],
+        "improvements": [r for r in rows if r["verdict"] == "improvement"]
+    }
+
+def _key(result: dict) -> tuple:
+    return result["case"], result["shape"], result["rows"]
+
+def _format_entry(entry: dict) -> str:
+    label = f"{entry['case']:24s} {entry['shape']:7s} {entry['rows']:>12,d}"
+    if entry["status"] != "ok":
+        return f"{label}  {entry['status']}: {entry['reason']}"
+    return f"{label}  best {entry['best_s']:10.4f}s  median {entry['median_s']:10.4f}s  {entry['rows_per_sec'] or 0:>14,d} rows/s"
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "memory_bytes": psutil.virtual_memory().total
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--scales", type=float, nargs="+", default=[1e4, 1e5, 1e6])
+    run.add_argument("--shapes", nargs="+", choices=["narrow", "wide"], default=["narrow", "wide"])
+    run.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--out", default="benchmark-results.json")
+    diff = commands.add_parser("compare", help="flag regressions between two result files")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+    diff.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print("⏱️ --- HyperInsight Benchmark Suite ---")
+        report = run_suite([int(s) for s in args.scales], args.shapes, args.cases, args.repeat)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {args.out}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    report = compare(baseline, candidate, args.threshold)
+    print(f"⏱️ --- Benchmark Comparison (threshold {args.threshold:.0%}) ---")
+    marks = {"regression": "🔴", "improvement": "🟢", "unchanged": "  "}
+    for r in report["comparisons"]:
+        print(f"{marks[r['verdict']]} {r['case']:24s} {r['shape']:7s} {r['rows']:>12,d}  "
+              f"{r['baseline_s']:10.4f}s -> {r['candidate_s']:10.4f}s  x{r['ratio']:.3f}")
+    print(f"{len(report['regressions'])} regressions, {len(report['improvements'])} improvements")
+    sys.exit(1 if report["regressions"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
-from typing import Any, Dict, List, Optional, Union
-import pandas as pd
-import numpy as np
-from .core.engine import AnalysisEngine
-from .causal.intelligence import CausalEngine
-from .predictive.scenarios import ScenarioBuilder
-from .ethics.bias import EthicsModule
-from .narrator.storyteller import Narrator
-from .utils.tensor import TensorPatternMatcher
+import importlib
+import logging
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 __version__ = "1.0.0-revolutionary"
 __all__ = ["HyperInsight", "analyze", "find_root_cause", "what_if", "narrate"]
 
+# Library logging stays silent unless the application configures handlers
+logging.getLogger("HyperInsight").addHandler(logging.NullHandler())
+
+# Subsystems load on first attribute access (PEP 562), so `import hyperinsight`
+# does not pay for pandas, numpy or any optional dependency.
+_LAZY_ATTRIBUTES = {
+    "AnalysisEngine": ".core.engine",
+    "CausalEngine": ".causal.intelligence",
+    "ScenarioBuilder": ".predictive.scenarios",
+    "EthicsModule": ".ethics.bias",
+    "Narrator": ".narrator.storyteller",
+    "TensorPatternMatcher": ".utils.tensor",
+}
+# Single-module subpackages have no __init__; accessing them loads their module
+_LAZY_SUBPACKAGES = {
+    "api": ".api.gateway",
+    "causal": ".causal.intelligence",
+    "connectors": ".connectors.ingestion",
+    "core": ".core",
+    "ethics": ".ethics.bias",
+    "federated": ".federated",
+    "narrator": ".narrator",
+    "predictive": ".predictive.scenarios",
+    "state": ".state",
+    "utils": ".utils",
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in _LAZY_SUBPACKAGES:
+        importlib.import_module(_LAZY_SUBPACKAGES[name], __name__)
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBPACKAGES))
+
 class HyperInsight:
     """
     HyperInsight: The world's first Neuro-Symbolic Data Intelligence Library.
@@ -20,7 +58,12 @@ class HyperInsight:
     for verifiable reasoning.
     """
     
-    def __init__(self, data: Optional[Union[pd.DataFrame, str]] = None):
+    def __init__(self, data: Optional[Union['pd.DataFrame', str]] = None):
+        from .core.engine import AnalysisEngine
+        from .causal.intelligence import CausalEngine
+        from .predictive.scenarios import ScenarioBuilder
+        from .ethics.bias import EthicsModule
+        from .narrator.storyteller import Narrator
         self._engine = AnalysisEngine(data)
         self._causal = CausalEngine()
         self._predictive = ScenarioBuilder()
@@ -32,20 +75,23 @@ class HyperInsight:
         return self._engine.process_intent(query)
 
     @classmethod
-    def find_root_cause(cls, data: pd.DataFrame, event: str, confidence_threshold: float = 0.95):
+    def find_root_cause(cls, data: 'pd.DataFrame', event: str, confidence_threshold: float = 0.95):
         """Discovers causal relationships using structural equation modeling and Bayesian inference."""
+        from .causal.intelligence import CausalEngine
         engine = CausalEngine()
         return engine.analyze_cause(data, event, confidence_threshold)
 
     @classmethod
     def what_if(cls, query: str, simulate_months: int = 12):
         """Simulates counterfactual scenarios using a digital twin of the temporal data."""
+        from .predictive.scenarios import ScenarioBuilder
         builder = ScenarioBuilder()
         return builder.simulate(query, simulate_months)
 
     @classmethod
     def narrate(cls, data: Any, audience: str = "executive", format: str = "interactive_storyboard"):
         """Creates storytelling outputs that translate data into actionable narratives."""
+        from .narrator.storyteller import Narrator
         narrator = Narrator()
         return narrator.generate(data, audience, format)
 
@@ -59,5 +105,6 @@ def analyze(data_source: str, objective: str, constraints: List[str] = None, out
         constraints: Business constraints (e.g., ['budget < 1M']).
         output_format: The desired structure of the insights.
     """
+    from .core.engine import AnalysisEngine
     engine = AnalysisEngine(data_source)
     return engine.run_global_analysis(objective, constraints or [], output_format)
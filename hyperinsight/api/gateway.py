@@ -1,28 +1,243 @@
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-import uvicorn
+from starlette.concurrency import run_in_threadpool
+
 from ..core.engine import AnalysisEngine
+from ..core.instrumentation import Instrumentation
 
-app = FastAPI(title="HyperInsight Market-Level API")
+# Environment handed to each uvicorn worker by `serve`
+DATASET_ENV = "HYPERINSIGHT_DATASET"
+OPTIONS_ENV = "HYPERINSIGHT_GATEWAY_OPTIONS"
+WARMUP_QUERIES = ("Analyze growth and hidden anomalies",)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Module-level `app`, built lazily by `__getattr__`
+_APP: Optional[FastAPI] = None
 
 class QueryRequest(BaseModel):
     query: str
     context: Dict[str, Any] = {}
 
+class PoolSaturated(RuntimeError):
+    """Raised when every engine is busy and the wait queue is full (or the wait timed out)."""
+
+def share_dataset(df: pd.DataFrame, path: Optional[str] = None) -> str:
+    """
+    Writes a frame once as an uncompressed Arrow IPC file, so worker
+    processes can memory-map it instead of each loading its own copy.
+    """
+    import pyarrow as pa
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="hyperinsight-dataset-", suffix=".arrow")
+        os.close(fd)
+    table = pa.Table.from_pandas(df, preserve_index=not isinstance(df.index, pd.RangeIndex))
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+def open_shared_dataset(path: str) -> pd.DataFrame:
+    """
+    Memory-maps a file written by `share_dataset`. Null-free numeric columns
+    are read-only views over the mapping, so every process reading the same
+    file shares its pages through the OS page cache.
+    """
+    import pyarrow as pa
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+class EnginePool:
+    """
+    A fixed set of warmed AnalysisEngines over one read-only dataset.
+
+    The dataset is resolved once (a `.arrow` path from `share_dataset` is
+    memory-mapped; anything else goes through the first engine's ingestion)
+    and every other engine is built on that same frame. Each request leases
+    one engine, so at most `size` intents run at a time. Up to `max_queue`
+    requests wait for a free engine; beyond that, or after `queue_timeout`
+    seconds, `lease` raises `PoolSaturated`. Request context is applied for
+    the duration of one lease and never leaks into the next.
+
+    All engines report into the pool's shared `metrics`. Unless the config
+    sets `share_data` to False, they also adopt the frame as their initial
+    history version instead of each snapshotting a private copy.
+    """
+
+    def __init__(self, data: Optional[Union[pd.DataFrame, str]] = None, size: Optional[int] = None,
+                 config: Optional[Dict[str, Any]] = None, max_queue: int = 64, queue_timeout: float = 30.0,
+                 warmup: Sequence[str] = WARMUP_QUERIES):
+        self.size = size or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        config = dict(config or {})
+        # The pool's frame is read-only, so one copy serves every engine's history
+        config.setdefault("share_data", True)
+        self.metrics = Instrumentation(config.get("instrumentation", True), config.get("track_allocations", False))
+        if isinstance(data, str) and data.endswith(".arrow"):
+            data = open_shared_dataset(data)
+        self.engines: List[AnalysisEngine] = []
+        for _ in range(self.size):
+            engine = AnalysisEngine(self.engines[0].data if self.engines else data, config=config)
+            engine.metrics = self.metrics
+            for query in warmup:
+                engine.process_intent(query)
+            self.engines.append(engine)
+        self.waiting = 0
+        self._idle: Optional[asyncio.Queue] = None
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self.engines[0].data
+
+    def start(self):
+        """Binds the idle queue to the running event loop (call from the app's startup)."""
+        self._idle = asyncio.Queue()
+        for engine in self.engines:
+            self._idle.put_nowait(engine)
+
+    @contextlib.asynccontextmanager
+    async def lease(self) -> AsyncIterator[AnalysisEngine]:
+        if self._idle is None:
+            self.start()
+        if self._idle.empty() and self.waiting >= self.max_queue:
+            self.metrics.increment("gateway_rejected")
+            raise PoolSaturated(f"All {self.size} engines are busy and {self.waiting} requests are queued.")
+        self.waiting += 1
+        try:
+            with self.metrics.phase("gateway.queue"):
+                engine = await asyncio.wait_for(self._idle.get(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.increment("gateway_rejected")
+            raise PoolSaturated(f"No engine became free within {self.queue_timeout}s.") from None
+        finally:
+            self.waiting -= 1
+        try:
+            yield engine
+        finally:
+            self._idle.put_nowait(engine)
+
+    async def analyze(self, query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        async with self.lease() as engine:
+            return await run_in_threadpool(self._analyze, engine, query, context or {})
+
+    def _analyze(self, engine: AnalysisEngine, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        with self.metrics.phase("gateway.request", rows=len(engine.data)):
+            saved = dict(engine.context_window)
+            engine.context_window.update(context)
+            try:
+                result = engine.process_intent(query)
+            finally:
+                engine.context_window = saved
+        return {
+            "status": "success",
+            "query": query,
+            "insights": result.data,
+            "ethics": result.ethics,
+            "cached": result.cached,
+            "confidence": result.confidence
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "engines": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else self.size,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "rows": len(self.data)
+        }
+
+def create_app(data: Optional[Union[pd.DataFrame, str]] = None, pool_size: Optional[int] = None,
+               config: Optional[Dict[str, Any]] = None, max_queue: int = 64, queue_timeout: float = 30.0,
+               warmup: Sequence[str] = WARMUP_QUERIES) -> FastAPI:
+    """
+    Builds the gateway app. The engine pool is created at startup (once per
+    worker process) and exposed as `app.state.pool`.
+
+    Routes: POST /analyze, GET /health, GET /metrics (Prometheus text).
+    """
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.pool = EnginePool(data, pool_size, config, max_queue, queue_timeout, warmup)
+        app.state.pool.start()
+        yield
+
+    app = FastAPI(title="HyperInsight Market-Level API", lifespan=lifespan)
+
+    @app.post("/analyze")
+    async def analyze_endpoint(request: QueryRequest):
+        try:
+            result = await app.state.pool.analyze(request.query, request.context)
+        except PoolSaturated as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        return jsonable_encoder(result, custom_encoder={np.generic: lambda value: value.item()})
+
+    @app.get("/health")
+    async def health_endpoint():
+        return {"status": "ok", **app.state.pool.status()}
+
+    @app.get("/metrics")
+    async def metrics_endpoint():
+        return PlainTextResponse(app.state.pool.metrics.to_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return app
+
+def app_from_env() -> FastAPI:
+    """uvicorn factory for worker processes started by `serve`."""
+    options = json.loads(os.environ.get(OPTIONS_ENV, "{}"))
+    return create_app(os.environ.get(DATASET_ENV), **options)
+
+def __getattr__(name: str) -> Any:
+    # `uvicorn hyperinsight.api.gateway:app`: built on first access, from the environment
+    global _APP
+    if name == "app":
+        if _APP is None:
+            _APP = app_from_env()
+        return _APP
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def serve(data: Optional[Union[pd.DataFrame, str]] = None, host: str = "0.0.0.0", port: int = 8080,
+          workers: int = 1, pool_size: Optional[int] = None, config: Optional[Dict[str, Any]] = None,
+          max_queue: int = 64, queue_timeout: float = 30.0):
+    """
+    Runs the gateway under uvicorn with `workers` processes (blocks). The
+    dataset is loaded here once and written with `share_dataset`; every
+    worker memory-maps that file and warms its own engine pool on it.
+    """
+    import uvicorn
+    if isinstance(data, str) and not data.endswith(".arrow"):
+        # Files and SQL sources are read here once, not once per worker
+        data = AnalysisEngine(data, config=config or {}).data
+    path = share_dataset(data) if isinstance(data, pd.DataFrame) else data
+    options = {"pool_size": pool_size, "config": config or {}, "max_queue": max_queue, "queue_timeout": queue_timeout}
+    if path is not None:
+        os.environ[DATASET_ENV] = path
+    os.environ[OPTIONS_ENV] = json.dumps(options, default=str)
+    try:
+        uvicorn.run("hyperinsight.api.gateway:app_from_env", factory=True, host=host, port=port, workers=workers)
+    finally:
+        if isinstance(data, pd.DataFrame) and os.path.exists(path):
+            os.remove(path)
+
 class APIInterface:
     """
     Exposes HyperInsight as a production-grade microservice.
     """
-    def __init__(self, engine: AnalysisEngine):
+    def __init__(self, engine: AnalysisEngine, pool_size: Optional[int] = None, max_queue: int = 64):
         self.engine = engine
+        self.pool_size = pool_size
+        self.max_queue = max_queue
+        self.app = create_app(engine.data, pool_size, engine.config, max_queue)
 
-    def start_server(self, port: int = 8080):
-        print(f"🚀 Deploying HyperInsight API Gateway on port {port}...")
-        # Note: This is a setup for production deployment
-        # uvicorn.run(app, host="0.0.0.0", port=port)
-
-@app.post("/analyze")
-async def analyze_endpoint(request: QueryRequest):
-    # This would link to the global engine instance
-    return {"status": "success", "results": "Market Analysis Insight"}
+    def start_server(self, port: int = 8080, host: str = "0.0.0.0", workers: int = 1):
+        print(f"🚀 Deploying HyperInsight API Gateway on port {port} ({workers} workers)...")
+        serve(self.engine.data, host, port, workers, self.pool_size, self.engine.config, self.max_queue)
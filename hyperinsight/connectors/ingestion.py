@@ -1,17 +1,69 @@
 import pandas as pd
 import numpy as np
 import os
-from sqlalchemy import create_engine
-import requests
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple, Union
+
+# Filters use the pyarrow/pandas DNF convention: [("col", "op", value), ...]
+# (AND-ed) or a list of such lists (OR-ed).
+Filters = Optional[List[Any]]
+
+_FILTER_OPS = {
+    "=": lambda s, v: s == v,
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+def apply_filters(df: pd.DataFrame, filters: Filters) -> pd.DataFrame:
+    """Evaluates DNF filters on an in-memory chunk (used where the format has no pushdown)."""
+    if not filters:
+        return df
+    clauses = filters if isinstance(filters[0], list) else [filters]
+    keep = pd.Series(False, index=df.index)
+    for clause in clauses:
+        mask = pd.Series(True, index=df.index)
+        for col, op, value in clause:
+            if op not in _FILTER_OPS:
+                raise ValueError(f"Unsupported filter operator '{op}'.")
+            mask &= _FILTER_OPS[op](df[col], value).fillna(False).astype(bool)
+        keep |= mask
+    return df[keep]
+
+# Pooled SQLAlchemy engines, one per DSN, shared by every connector in the process
+_POOLED_ENGINES: Dict[str, Any] = {}
+_POOL_LOCK = threading.Lock()
+
+def _filter_columns(filters: Filters) -> List[str]:
+    if not filters:
+        return []
+    clauses = filters if isinstance(filters[0], list) else [filters]
+    return [col for clause in clauses for col, _, _ in clause]
+
+class PartitionColumnError(ValueError):
+    """`partition_column` is not a column of the query result (raised, never simulated away)."""
 
 class DataConnector:
     """
     Market-level Data Ingestion Engine.
     Supports SQL, Snowflake (simulated), S3, and high-performance Parquet.
     """
-    def __init__(self):
-        self._active_connections = {}
+    def __init__(self, pool_size: int = 5, max_overflow: int = 10, pool_recycle: int = 1800,
+                 pool_timeout: float = 30.0):
+        self._active_connections = _POOLED_ENGINES
+        self.pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": True
+        }
 
     def fetch_from_url(self, url: str) -> pd.DataFrame:
         """Loads data from a remote URL (CSV supported)."""
@@ -21,33 +73,223 @@ class DataConnector:
         except Exception as e:
             raise IOError(f"Failed to fetch data from URL: {e}")
 
-    def load_file(self, path: str) -> pd.DataFrame:
-        """Primary file loader with automatic format detection."""
+    def load_file(self, path: str, columns: Optional[Sequence[str]] = None,
+                  dtype: Optional[Dict[str, Any]] = None, filters: Filters = None) -> pd.DataFrame:
+        """
+        Primary file loader with automatic format detection.
+
+        `columns` projects at read time, `dtype` types columns as they are
+        parsed, and `filters` (DNF) are pushed down to Parquet row groups.
+        """
         print(f"Loading file: {path}")
         if not os.path.exists(path) and not path.startswith("http"):
             raise FileNotFoundError(f"Data file not found at {path}")
-            
+
         ext = os.path.splitext(path)[1].lower()
+        usecols = self._read_columns(columns, filters)
         try:
-            if ext == '.csv':
-                return pd.read_csv(path)
-            elif ext in ['.parquet', '.pq']:
-                return pd.read_parquet(path)
+            if ext in ['.parquet', '.pq']:
+                df = pd.read_parquet(path, columns=usecols, filters=filters or None)
+                return self._finish(df, columns, dtype)
             elif ext in ['.xlsx', '.xls']:
-                return pd.read_excel(path)
-            elif path.startswith("http"):
-                return pd.read_csv(path)
+                df = pd.read_excel(path, usecols=usecols, dtype=dtype)
             else:
-                return pd.read_csv(path) # Default to CSV
+                # CSV, remote URLs and unknown extensions
+                df = pd.read_csv(path, usecols=usecols, dtype=dtype)
+            return self._finish(apply_filters(df, filters), columns, None)
         except Exception as e:
             raise ValueError(f"Encoding or Format error in {path}: {e}")
 
-    def fetch_from_sql(self, connection_string: str, query: str) -> pd.DataFrame:
+    def iter_file(self, path: str, chunk_rows: int = 100_000, columns: Optional[Sequence[str]] = None,
+                  dtype: Optional[Dict[str, Any]] = None, filters: Filters = None,
+                  as_arrow: bool = False) -> Iterator[Union[pd.DataFrame, Any]]:
+        """
+        Streams a file as typed chunks of at most `chunk_rows` rows, so peak
+        memory follows the chunk size rather than the file size.
+
+        Parquet is read batch by batch through a pyarrow dataset, with column
+        projection and predicate pushdown (row groups whose statistics cannot
+        match `filters` are never read). CSV is parsed incrementally with the
+        projection and dtypes applied by the parser. Excel has no streaming
+        reader and is sliced after a full load. With `as_arrow=True`, chunks
+        are yielded as pyarrow RecordBatches.
+        """
+        if not os.path.exists(path) and not path.startswith("http"):
+            raise FileNotFoundError(f"Data file not found at {path}")
+        ext = os.path.splitext(path)[1].lower()
+        if ext in ['.parquet', '.pq']:
+            yield from self._iter_parquet(path, chunk_rows, columns, dtype, filters, as_arrow)
+            return
+
+        usecols = self._read_columns(columns, filters)
+        if ext in ['.xlsx', '.xls']:
+            full = pd.read_excel(path, usecols=usecols, dtype=dtype)
+            chunks = (full.iloc[i:i + chunk_rows] for i in range(0, len(full), chunk_rows))
+        else:
+            chunks = pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunk_rows)
+        for chunk in chunks:
+            chunk = self._finish(apply_filters(chunk, filters), columns, None)
+            if len(chunk):
+                yield self._to_arrow(chunk) if as_arrow else chunk
+
+    def _iter_parquet(self, path: str, chunk_rows: int, columns: Optional[Sequence[str]],
+                      dtype: Optional[Dict[str, Any]], filters: Filters, as_arrow: bool) -> Iterator[Any]:
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        dataset = ds.dataset(path, format="parquet")
+        expression = pq.filters_to_expression(filters) if filters else None
+        batches = dataset.to_batches(columns=list(columns) if columns else None, filter=expression,
+                                     batch_size=chunk_rows)
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            if as_arrow:
+                yield batch
+            else:
+                yield self._finish(batch.to_pandas(), None, dtype)
+
+    @staticmethod
+    def _read_columns(columns: Optional[Sequence[str]], filters: Filters) -> Optional[List[str]]:
+        """Projection for the reader: requested columns plus any referenced by filters."""
+        if columns is None:
+            return None
+        extra = [col for col in _filter_columns(filters) if col not in columns]
+        return list(columns) + extra
+
+    @staticmethod
+    def _finish(df: pd.DataFrame, columns: Optional[Sequence[str]], dtype: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        if columns is not None and list(df.columns) != list(columns):
+            df = df[list(columns)]
+        if dtype:
+            df = df.astype(dtype)
+        return df
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame):
+        import pyarrow as pa
+        return pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+    def get_sql_engine(self, connection_string: str):
+        """
+        Returns the pooled engine for a DSN, creating it on first use. The
+        pool outlives the connector, so repeated requests reuse connections
+        instead of paying the handshake every time.
+        """
+        engine = self._active_connections.get(connection_string)
+        if engine is None:
+            with _POOL_LOCK:
+                engine = self._active_connections.get(connection_string)
+                if engine is None:
+                    engine = self._active_connections[connection_string] = self._create_engine(connection_string)
+        return engine
+
+    def _create_engine(self, connection_string: str):
+        from sqlalchemy import create_engine
+        try:
+            return create_engine(connection_string, **self.pool_options)
+        except TypeError:
+            # Dialects with a non-queue pool (e.g. in-memory SQLite) reject sizing options
+            return create_engine(connection_string, pool_pre_ping=True)
+
+    @staticmethod
+    def dispose_connections(connection_string: Optional[str] = None):
+        """Closes the pooled connections of one DSN, or of all of them."""
+        with _POOL_LOCK:
+            keys = [connection_string] if connection_string else list(_POOLED_ENGINES)
+            for key in keys:
+                engine = _POOLED_ENGINES.pop(key, None)
+                if engine is not None:
+                    engine.dispose()
+
+    def fetch_from_sql(self, connection_string: str, query: str, params: Optional[Dict[str, Any]] = None,
+                       chunksize: Optional[int] = None, partition_column: Optional[str] = None,
+                       partitions: int = 4, max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Loads a query result over a pooled connection.
+
+        With `chunksize`, rows are streamed from a server-side cursor and
+        assembled chunk by chunk. With `partition_column` (numeric), the
+        column's key range is split into `partitions` slices that are read
+        concurrently, each on its own pooled connection.
+        """
         print(f"Connecting to Enterprise SQL: {connection_string.split('@')[-1]}")
         try:
-            # Re-enable for real environments with proper drivers
-            engine = create_engine(connection_string)
-            return pd.read_sql(query, engine)
+            from sqlalchemy import text
+            if partition_column is not None:
+                return self._fetch_partitioned(connection_string, query, params, partition_column,
+                                               partitions, max_workers)
+            if chunksize:
+                chunks = list(self.iter_sql(connection_string, query, chunksize, params))
+                return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            with self.get_sql_engine(connection_string).connect() as conn:
+                return pd.read_sql(text(query), conn, params=params)
+        except PartitionColumnError:
+            raise
         except Exception as e:
             print(f"SQL Connection Warning (Simulation Mode Active): {e}")
             return pd.DataFrame(np.random.randn(100, 5), columns=['KPI_1', 'KPI_2', 'KPI_3', 'KPI_4', 'KPI_5'])
+
+    def iter_sql(self, connection_string: str, query: str, chunksize: int = 100_000,
+                 params: Optional[Dict[str, Any]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams a query result as DataFrames of at most `chunksize` rows
+        through a server-side cursor, so only one chunk is held at a time.
+        The pooled connection is returned when the iterator is exhausted or
+        closed.
+        """
+        from sqlalchemy import text
+        engine = self.get_sql_engine(connection_string)
+        with engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as conn:
+            yield from pd.read_sql(text(query), conn, params=params, chunksize=chunksize)
+
+    def _fetch_partitioned(self, connection_string: str, query: str, params: Optional[Dict[str, Any]],
+                           column: str, partitions: int, max_workers: Optional[int]) -> pd.DataFrame:
+        from sqlalchemy import text
+        engine = self.get_sql_engine(connection_string)
+        with engine.connect() as conn:
+            columns = list(conn.execute(text(f"SELECT * FROM ({query}) AS _src WHERE 1 = 0"), params or {}).keys())
+            if column not in columns:
+                raise PartitionColumnError(f"partition_column '{column}' is not a column of the query result {columns}")
+            # Validated against the result's columns, then quoted as an identifier for the dialect
+            key = engine.dialect.identifier_preparer.quote(column)
+            low, high = conn.execute(
+                text(f"SELECT MIN({key}), MAX({key}) FROM ({query}) AS _src"), params or {}
+            ).one()
+        if low is None:
+            with engine.connect() as conn:
+                return pd.read_sql(text(query), conn, params=params)
+
+        # Range slices never match NULL keys, so those rows get a slice of their own
+        ranges = self._partition_ranges(low, high, partitions) + [None]
+        def read(bounds: Optional[Tuple[Any, Any, bool]]) -> pd.DataFrame:
+            if bounds is None:
+                sliced, bound_params = f"SELECT * FROM ({query}) AS _src WHERE {key} IS NULL", {}
+            else:
+                lo, hi, last = bounds
+                upper = "<=" if last else "<"
+                sliced = f"SELECT * FROM ({query}) AS _src WHERE {key} >= :_lo AND {key} {upper} :_hi"
+                bound_params = {"_lo": lo, "_hi": hi}
+            with engine.connect() as conn:
+                return pd.read_sql(text(sliced), conn, params={**(params or {}), **bound_params})
+
+        workers = max_workers or len(ranges)
+        with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            frames = list(pool.map(read, ranges))
+        nulls = frames.pop()
+        # Empty slices would widen dtypes in the concat; the NULL slice reads its key column as object
+        frames = [frame for frame in frames + [nulls] if len(frame)] or [nulls]
+        result = pd.concat(frames, ignore_index=True)
+        if len(nulls):
+            result[column] = result[column].infer_objects()
+        return result
+
+    @staticmethod
+    def _partition_ranges(low: Any, high: Any, partitions: int) -> List[Tuple[Any, Any, bool]]:
+        """Half-open [lo, hi) slices covering [low, high]; the last one is closed."""
+        if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+            edges = sorted(set(np.linspace(int(low), int(high), max(1, partitions) + 1).round().astype(int).tolist()))
+        else:
+            edges = np.linspace(float(low), float(high), max(1, partitions) + 1).tolist()
+        if len(edges) < 2:
+            edges = [low, high]
+        return [(edges[i], edges[i + 1], i == len(edges) - 2) for i in range(len(edges) - 1)]
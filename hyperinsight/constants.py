@@ -21,6 +21,7 @@ CONFIDENCE_INTERVAL_SIGMA = 1.96
 # Ethical Thresholds
 ADVERSE_IMPACT_RATIO = 0.80
 DISPARATE_TREATMENT_TOLERANCE = 0.02
+PROXY_CORRELATION_THRESHOLD = 0.5
 
 # The "Hyper" Factors - Tensor Dimensions
 TENSOR_CORE_RANK = 16
@@ -0,0 +1,183 @@
+import os
+import sys
+import time
+import traceback
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+PIPELINE_STEPS = ("clean", "impute", "intent")
+
+class BatchResult:
+    """Outcome of one dataset in a batch. Failures are captured, never raised."""
+
+    def __init__(self, index: int, ok: bool, value: Optional[Dict[str, Any]] = None,
+                 error: Optional[str] = None, elapsed: float = 0.0):
+        self.index = index
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed: {self.error.strip().splitlines()[-1]}"
+        return f"<BatchResult #{self.index} {status} ({self.elapsed*1000:.1f}ms)>"
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attaches to a segment owned by another process without adopting its cleanup."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older Pythons register every attach with the (fork-shared) resource
+    # tracker, which would then race the owner's unlink; skip registration.
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def frame_to_shared(df: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, int]:
+    """Writes a frame as an Arrow IPC stream into a new shared-memory segment."""
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    # Measure first, then serialize straight into the segment (no intermediate buffer)
+    counter = pa.MockOutputStream()
+    with pa.ipc.new_stream(counter, table.schema) as writer:
+        writer.write_table(table)
+    size = counter.size()
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    target = pa.py_buffer(shm.buf)
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(target), table.schema) as writer:
+        writer.write_table(table)
+    del target
+    return shm, size
+
+def frame_from_shared(name: str, size: int) -> pd.DataFrame:
+    """Reads a frame back from a shared-memory segment written by `frame_to_shared`."""
+    import pyarrow as pa
+    shm = _attach(name)
+    try:
+        # One memcpy out of the segment so no pandas buffer outlives the mapping
+        payload = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+
+def _run_pipeline(index: int, source: Any, pipeline: Sequence[str], query: Optional[str],
+                  config: Dict[str, Any], return_data: bool) -> BatchResult:
+    """Worker entry point: rebuilds the frame, runs the pipeline, captures any failure."""
+    start = time.perf_counter()
+    try:
+        from .engine import AnalysisEngine
+        df = frame_from_shared(*source) if isinstance(source, tuple) else source
+        engine = AnalysisEngine(df, config=config)
+        value: Dict[str, Any] = {"rows_in": len(df)}
+        for step in pipeline:
+            if step == "clean":
+                value["clean"] = engine.clean_data()
+            elif step == "impute":
+                value["impute"] = engine.fill_nulls(strategy="auto")
+            elif step == "intent":
+                value["intent"] = engine.process_intent(query)
+        value["rows_out"] = len(engine.data)
+        if return_data:
+            value["data"] = engine.data
+        return BatchResult(index, True, value, elapsed=time.perf_counter() - start)
+    except Exception:
+        return BatchResult(index, False, error=traceback.format_exc(), elapsed=time.perf_counter() - start)
+
+class BatchProcessor:
+    """
+    Runs many DataFrames through an engine pipeline concurrently.
+
+    Modes:
+        process  worker processes; frames travel as Arrow IPC buffers in
+                 shared memory (pickle fallback without pyarrow or for
+                 frames Arrow cannot represent); results come back pickled
+        thread   a thread pool sharing the frames directly
+        serial   in-process, one after another
+
+    At most `max_in_flight` datasets are dispatched at a time, which bounds
+    both concurrency and the shared memory held by pending items. Each item
+    is isolated: an exception becomes a failed `BatchResult`.
+    """
+
+    def __init__(self, pipeline: Sequence[str] = ("impute", "clean"), query: Optional[str] = None,
+                 mode: str = "process", max_workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 config: Optional[Dict[str, Any]] = None, return_data: bool = False):
+        unknown = [step for step in pipeline if step not in PIPELINE_STEPS]
+        if unknown:
+            raise ValueError(f"Unknown pipeline steps {unknown}. Choose from {PIPELINE_STEPS}.")
+        if "intent" in pipeline and not query:
+            raise ValueError("The 'intent' step needs a query.")
+        if mode not in ("process", "thread", "serial"):
+            raise ValueError(f"Unknown batch mode '{mode}'.")
+        self.pipeline = tuple(pipeline)
+        self.query = query
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        # Workers never need their own thread pool or a history budget
+        self.config = dict(config or {}, threading=False)
+        self.return_data = return_data
+
+    def run(self, datasets: Iterable[pd.DataFrame]) -> List[BatchResult]:
+        """Processes every dataset and returns results in input order."""
+        return sorted(self.iter_results(datasets), key=lambda r: r.index)
+
+    def iter_results(self, datasets: Iterable[pd.DataFrame]) -> Iterator[BatchResult]:
+        """Yields results as they complete."""
+        if self.mode == "serial":
+            for index, df in enumerate(datasets):
+                yield _run_pipeline(index, df, self.pipeline, self.query, self.config, self.return_data)
+            return
+
+        shared = self.mode == "process" and _has_pyarrow()
+        executor: Executor = (ProcessPoolExecutor if self.mode == "process" else ThreadPoolExecutor)(self.max_workers)
+        pending: Dict[Any, Tuple[int, Optional[shared_memory.SharedMemory]]] = {}
+        try:
+            for index, df in enumerate(datasets):
+                if len(pending) >= self.max_in_flight:
+                    yield from self._drain(pending, FIRST_COMPLETED)
+                segment, source = None, df
+                if shared and isinstance(df, pd.DataFrame):
+                    try:
+                        segment, size = frame_to_shared(df)
+                        source = (segment.name, size)
+                    except Exception:
+                        pass  # Arrow can't represent it (e.g. mixed object column): pickle instead
+                future = executor.submit(_run_pipeline, index, source, self.pipeline, self.query,
+                                         self.config, self.return_data)
+                pending[future] = (index, segment)
+            while pending:
+                yield from self._drain(pending, FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for _, segment in pending.values():
+                self._release(segment)
+
+    def _drain(self, pending: Dict[Any, Tuple[int, Any]], return_when: str) -> Iterator[BatchResult]:
+        done, _ = wait(list(pending), return_when=return_when)
+        for future in done:
+            index, segment = pending.pop(future)
+            self._release(segment)
+            try:
+                yield future.result()
+            except Exception:
+                # Worker crashed outright (e.g. killed); isolate it like any other failure
+                yield BatchResult(index, False, error=traceback.format_exc())
+
+    @staticmethod
+    def _release(segment: Optional[shared_memory.SharedMemory]):
+        if segment is not None:
+            segment.close()
+            segment.unlink()
@@ -0,0 +1,80 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class ResultCache:
+    """
+    Bounded result cache with LRU eviction and an optional TTL.
+
+    Policies:
+        LRU   keep at most `max_entries`, evicting the least recently used
+        NONE  caching disabled (every lookup is a miss)
+
+    With `ttl` (seconds), entries older than that are treated as misses and
+    dropped on access. Thread-safe, so one engine can serve concurrent
+    callers.
+    """
+    POLICIES = ("LRU", "NONE")
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None, policy: str = "LRU"):
+        policy = (policy or "NONE").upper()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}'. Choose from {self.POLICIES}.")
+        self.policy = policy
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy != "NONE" and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key) if self.enabled else None
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -5,21 +5,31 @@ import datetime
 import time
 import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Union, Tuple, Callable
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Union, Tuple, Callable
 from ..state.manager import StateManager
 from ..utils.tensor import TensorPatternMatcher
 from ..utils.nlp import NaturalLanguageProcessor
 from ..utils.math import SymbolicSolver
+from ..utils.memory import parse_size
+from ..utils.sketches import sketch_column, summarize_sketches
+from ..utils.dtypes import DtypeReport, conform_dtypes, optimize_dtypes, replace_in_series, restore_dtypes
 from ..ethics.bias import EthicsModule
 from ..causal.intelligence import CausalEngine
-
-# Configure logging for the Neuro-Symbolic Engine
-logging.basicConfig(level=logging.INFO)
+from .imputation import NullImputer
+from .statistics import StatsCache
+from .batch import BatchProcessor
+from .out_of_core import OutOfCoreEngine
+from .cache import ResultCache
+from .pipeline import LazyPlan
+from .dedup import RowHashIndex
+from .governor import MemoryGovernor, frame_bytes
+from .streaming import StreamingAnomalyDetector
+from .instrumentation import Instrumentation, sample_process
+
+# Handlers are left to the application (importing the library must not configure logging)
 logger = logging.getLogger("HyperInsight.Core")
 
 # Delayed imports to avoid circularity in market-level architecture
-import psutil
-
 def _get_connector():
     from ..connectors.ingestion import DataConnector
     return DataConnector()
@@ -28,6 +38,15 @@ def _get_api():
     from ..api.gateway import APIInterface
     return APIInterface
 
+# Which analysis validates each hypothesis produced by `_formulate_hypotheses`
+HYPOTHESIS_ANALYSES = {
+    "HA_Growth_Momentum_Shift": "trends",
+    "HA_Latent_Correlation_Discovery": "anomalies"
+}
+
+# Top-level data phases summed into the audit's throughput; none runs inside another, so no row is counted twice
+THROUGHPUT_PHASES = ("ingestion", "imputation", "cleaning", "append", "replace", "pipeline", "batch")
+
 class AnalysisEngine:
     """
     Market-Level Neuro-Symbolic Engine for Enterprise Scale.
@@ -35,36 +54,90 @@ class AnalysisEngine:
     def __init__(self, data: Optional[Union[pd.DataFrame, str, Dict]] = None, config: Dict = {}):
         self.config = {
             "max_memory": config.get("max_memory", "8GB"),
+            "lean_threshold": config.get("lean_threshold", 0.8),
+            "optimize_dtypes": config.get("optimize_dtypes", True),
+            "categorical_ratio": config.get("categorical_ratio", 0.5),
+            "arrow_strings": config.get("arrow_strings", False),
             "threading": config.get("threading", True),
-            "cache_policy": "LRU"
+            "cache_policy": config.get("cache_policy", "LRU"),
+            "cache_size": config.get("cache_size", 256),
+            "cache_ttl": config.get("cache_ttl"),
+            "approximate": config.get("approximate", False),
+            "sketch_chunk_rows": config.get("sketch_chunk_rows", 1_000_000),
+            "sketch_sample_rows": config.get("sketch_sample_rows", 65_536),
+            "history_budget": config.get("history_budget"),
+            "spill_dir": config.get("spill_dir"),
+            "share_data": config.get("share_data", False),
+            "lazy": config.get("lazy", False),
+            "dedup_memory_limit": config.get("dedup_memory_limit"),
+            "instrumentation": config.get("instrumentation", True),
+            "track_allocations": config.get("track_allocations", False),
+            "reliability_target": config.get("reliability_target", 0.999)
         }
         self.start_time = datetime.datetime.now()
         self.trace_id = hashlib.sha256(str(self.start_time).encode()).hexdigest()[:12]
         self.performance_logs = []
+        self.metrics = Instrumentation(self.config["instrumentation"], self.config["track_allocations"])
         
         logger.info(f"[PRODUCTION INITIALIZATION] Trace ID: {self.trace_id}")
         
         self.connector = _get_connector()
-        if isinstance(data, str):
-            if data.startswith("sql://"):
-                self.data = self.connector.fetch_from_sql(data, "SELECT * FROM target")
+        # Frames the engine loads itself get compact dtypes; frames passed in are left as they are
+        self.dtype_report: Optional[DtypeReport] = None
+        with self.metrics.phase("ingestion") as timer:
+            if isinstance(data, str):
+                if data.startswith("sql://"):
+                    self.data = self.connector.fetch_from_sql(data, "SELECT * FROM target")
+                else:
+                    self.data = self.connector.load_file(data)
+                if self.config["optimize_dtypes"]:
+                    self.data, self.dtype_report = optimize_dtypes(
+                        self.data, self.config["categorical_ratio"], self.config["arrow_strings"],
+                        numeric=self.config["optimize_dtypes"] == "aggressive")
+                    logger.info(f"🗜️ Compact dtypes on ingestion: {self.dtype_report}")
             else:
-                self.data = self.connector.load_file(data)
-        else:
-            self.data = data if data is not None else self._generate_default_dataset()
-            
-        self._check_system_resources()
+                self.data = data if data is not None else self._generate_default_dataset()
+            timer.rows = len(self.data)
             
         self.pattern_matcher = TensorPatternMatcher()
         self.nlp_processor = NaturalLanguageProcessor()
         self.solver = SymbolicSolver()
         self.ethics = EthicsModule()
         self.causal = CausalEngine()
-        self.state_manager = StateManager(self.data)
+        self.imputer = NullImputer.from_config(self.config)
+        self.state_manager = StateManager(
+            self.data,
+            memory_budget=parse_size(self.config["history_budget"]),
+            spill_dir=self.config["spill_dir"],
+            # A shared (read-only) frame is adopted as the initial version rather than copied
+            copy=not self.config["share_data"]
+        )
+        self.stats = StatsCache(self.state_manager)
+        self.intent_cache = ResultCache(self.config["cache_size"], self.config["cache_ttl"], self.config["cache_policy"])
+        self.analysis_cache = ResultCache(self.config["cache_size"], self.config["cache_ttl"], self.config["cache_policy"])
         self.context_window = {}
-        
+        self.plan = LazyPlan()
+        self._lazy = self.config["lazy"]
+        self._row_index: Optional[RowHashIndex] = None
+        self.detector: Optional[StreamingAnomalyDetector] = None
+        self.governor = MemoryGovernor(self, parse_size(self.config["max_memory"]), self.config["lean_threshold"],
+                                       self.config["categorical_ratio"])
+
+        self._check_system_resources()
+        self.governor.check("ingestion")
         self._warm_up_queues()
 
+    @staticmethod
+    def scan(path: str, chunk_rows: int = 100_000, columns: Optional[List[str]] = None,
+             dtype: Optional[Dict[str, Any]] = None, filters: Optional[List[Any]] = None,
+             query: Optional[str] = None) -> 'OutOfCoreEngine':
+        """
+        Out-of-core mode: the file stays on disk and is analyzed chunk by
+        chunk, with column projection and (for Parquet) predicate pushdown.
+        With `query`, `path` is a SQL DSN streamed through a server-side cursor.
+        """
+        return OutOfCoreEngine(path, chunk_rows, columns, dtype, filters, connector=_get_connector(), query=query)
+
     def set_context(self, key: str, information: Any):
         """Adds semantic context to the engine for better analytical understanding."""
         print(f"Context Updated: {key}")
@@ -73,53 +146,233 @@ class AnalysisEngine:
     def get_context_summary(self) -> str:
         return f"Context Window: {len(self.context_window)} dimensions active."
 
-    def fill_nulls(self, strategy: str = "auto", constant: Any = None):
+    def fill_nulls(self, strategy: str = "auto", constant: Any = None, group_by: Optional[str] = None,
+                   columns: Optional[List[str]] = None):
         """
         Revolutionary Null Imputation Engine. 
         Applies strategy across the entire dataset with high-performance vectorization.
+
+        Strategies: "auto"/"mean" (mean for numbers, mode otherwise), "median",
+        "mode" and "constant". With `group_by`, statistics are computed per
+        group (e.g. per `region`) and fall back to the global value.
         """
+        if self._lazy:
+            self.plan.impute(strategy, constant, group_by, columns)
+            return f"Deferred: imputation ({strategy}). Pending plan: {self.plan.describe()}"
         print(f"Initializing Global Imputation (Strategy: {strategy})...")
-        new_df = self.data.copy()
-        
-        if strategy == "auto":
-            # Intelligent Strategy: Mean for numbers, Mode for objects
-            for col in new_df.columns:
-                if new_df[col].dtype in [np.float64, np.int64]:
-                    new_df[col] = new_df[col].fillna(new_df[col].mean())
-                else:
-                    new_df[col] = new_df[col].fillna(new_df[col].mode()[0] if not new_df[col].mode().empty else "Unknown")
-        elif strategy == "constant" and constant is not None:
-            new_df = new_df.fillna(constant)
-        
-        self.data = new_df
-        self.state_manager.commit(self.data, f"Global Null Imputation ({strategy})")
+        # Over the memory budget, columns are filled (and committed) in groups that fit
+        groups = self.governor.plan_chunks("fill_nulls", self.data, columns)
+        source = self.data
+        for part, group in enumerate(groups, 1):
+            label = f" [part {part}/{len(groups)}]" if len(groups) > 1 else ""
+            if label:
+                self.governor.admit_columns("fill_nulls" + label, self.data, group)
+            with self.metrics.phase("imputation", rows=len(self.data)):
+                fills = self.imputer.compute_fill_values(source, strategy, constant, group_by, group)
+                self.data = self.imputer.apply(self.data, fills)
+            self._commit_version(f"Global Null Imputation ({strategy}){label}", changed=list(fills))
         return f"Nulls neutralized across {len(self.data.columns)} columns."
 
-    def clean_data(self):
-        """Autonomously cleans the dataset (handles NaNs, duplicates)."""
+    def clean_data(self, subset: Optional[List[str]] = None):
+        """
+        Autonomously cleans the dataset (handles NaNs, duplicates).
+
+        Duplicates are detected through a row-hash index kept with the
+        cleaned version (`subset` restricts the key columns). Rows added
+        after the last clean are checked against it, so only they are hashed.
+        """
+        if self._lazy:
+            self.plan.clean(subset)
+            return f"Deferred: cleaning. Pending plan: {self.plan.describe()}"
         print("Intelligent Data Cleaning in progress...")
-        initial_copy = self.data.copy()
-        new_df = self.data.copy()
-        # Simulate cleaning
-        initial_rows = len(new_df)
-        new_df = new_df.dropna().drop_duplicates()
-        removed = initial_rows - len(new_df)
-        self.data = new_df
-        # Re-initialize state manager with original copy if this is the first clean
-        if self.state_manager._current_index == 0:
-            self.state_manager._history[0] = initial_copy
-        self.state_manager.commit(self.data, f"Cleaned {removed} rows")
+        with self.metrics.phase("cleaning", rows=len(self.data)):
+            # Re-initialize state manager with the pre-clean frame if this is the first clean
+            if self.state_manager._current_index == 0:
+                self.state_manager.rebase(self.data)
+            index = self._dedup_index(subset)
+            start = index.rows
+            fresh = self.data.iloc[start:] if start else self.data
+            keep = np.ones(len(fresh), dtype=bool)
+            for col in fresh.columns:
+                if fresh[col].hasnans:
+                    keep &= fresh[col].notna().to_numpy()
+            hashes = index.hash_rows(fresh)
+            keep[keep] = index.insert_hashes(hashes[keep])
+            removed = int((~keep).sum())
+            if removed:
+                mask = np.ones(len(self.data), dtype=bool)
+                mask[start:] = keep
+                try:
+                    self.governor.admit("clean_data", int(self.governor.data_bytes() * mask.mean()))
+                except MemoryError:
+                    # The index already holds the hashes of rows that are not dropped yet
+                    index.release()
+                    self._row_index = None
+                    raise
+                self.data = self.data[mask]
+        # Row-only change: the history stores a row mask, not the surviving columns
+        self._commit_version(f"Cleaned {removed} rows", changed=[])
+        index.rows, index.version_id = len(self.data), self.state_manager.version_id
         return f"Cleaned {removed} rows successfully."
 
+    def _dedup_index(self, subset: Optional[List[str]]) -> RowHashIndex:
+        """The row-hash index of the current version, or a fresh one if it describes other data."""
+        index = self._row_index
+        key = list(subset) if subset is not None else None
+        if (index is not None and index.version_id == self.state_manager.version_id
+                and index.subset == key and index.rows <= len(self.data)):
+            return index
+        if index is not None:
+            index.release()
+        self._row_index = RowHashIndex(key, parse_size(self.config["dedup_memory_limit"]), self.config["spill_dir"])
+        return self._row_index
+
+    def append(self, rows: Union[pd.DataFrame, Dict, List[Dict]], message: Optional[str] = None) -> str:
+        """
+        Adds rows to the dataset as an append-only version that stores only
+        the new rows. Cached aggregates and outlier tails are merged with the
+        batch's, so trends and 3-sigma anomalies update in O(batch), and the
+        next `clean_data` only deduplicates the new rows.
+
+        Rows without their own labels continue an integer index; explicit
+        labels must not already exist.
+        """
+        if self._lazy and self.plan:
+            self.commit()
+        rows = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+        # Concatenation copies the current frame as well as the batch
+        self.governor.admit("append", self.governor.data_bytes() + frame_bytes(rows))
+        with self.metrics.phase("append") as timer:
+            result = self._append(rows, message)
+            timer.rows = len(self.data)
+        return result
+
+    def _append(self, rows: Union[pd.DataFrame, Dict, List[Dict]], message: Optional[str]) -> str:
+        index = self.data.index
+        if isinstance(rows.index, pd.RangeIndex) and rows.index.start == 0 and pd.api.types.is_integer_dtype(index.dtype):
+            start = index.stop if isinstance(index, pd.RangeIndex) and index.step == 1 else (index.max() + 1 if len(index) else 0)
+            rows = rows.set_axis(pd.RangeIndex(start, start + len(rows)))
+        elif not rows.index.is_unique or rows.index.isin(index).any():
+            raise ValueError("Appended rows reuse existing index labels.")
+
+        message = message or f"Appended {len(rows)} rows"
+        previous = self.stats.entries(self.data.columns)
+        row_index = self._row_index
+        indexed = row_index is not None and row_index.version_id == self.state_manager.version_id
+        # Batches are cast to the frame's compact dtypes where lossless, keeping the append-only path
+        combined = pd.concat([self.data, conform_dtypes(rows, self.data.dtypes)])
+        if list(combined.columns) == list(self.data.columns) and combined.dtypes.equals(self.data.dtypes):
+            # Same schema: store only the new rows, converted to the frame's dtypes
+            batch = combined.iloc[len(self.data):]
+            self.data = combined
+            self._commit_version(message, appended=batch)
+            self.stats.extend(previous, batch)
+            if indexed:
+                row_index.version_id = self.state_manager.version_id
+        else:
+            self.data = combined
+            self._commit_version(message)
+        return f"Appended {len(rows)} rows ({len(self.data)} total)."
+
     def replace_values(self, column: str, target: Any, replacement: Any):
         """Replaces values and commits to history."""
+        if self._lazy:
+            self.plan.replace(column, target, replacement)
+            return f"Deferred: {target} -> {replacement} in {column}. Pending plan: {self.plan.describe()}"
         print(f"Replacing '{target}' with '{replacement}' in column '{column}'...")
-        self.data[column] = self.data[column].replace(target, replacement)
-        self.state_manager.commit(self.data, f"Replaced {target} -> {replacement} in {column}")
+        self.governor.admit_columns("replace_values", self.data, [column])
+        with self.metrics.phase("replace", rows=len(self.data)):
+            self.data[column] = replace_in_series(self.data[column], target, replacement)
+        self._commit_version(f"Replaced {target} -> {replacement} in {column}", changed=[column])
+
+    def optimize_dtypes(self) -> DtypeReport:
+        """
+        Stores the data in the narrowest lossless dtypes (categoricals for
+        low-cardinality text, Arrow strings with `arrow_strings`, and
+        downcast numbers with `optimize_dtypes="aggressive"`) as one
+        version, and returns the per-column savings. Sources loaded by the
+        engine are optimized on ingestion already.
+        """
+        data, report = optimize_dtypes(self.data, self.config["categorical_ratio"], self.config["arrow_strings"],
+                                       numeric=self.config["optimize_dtypes"] == "aggressive")
+        changed = list(report.changed)
+        if self.dtype_report is not None:
+            report = self.dtype_report.then(report)
+        self.dtype_report = report
+        if changed:
+            self.data = data
+            self._commit_version(f"Optimized dtypes of {len(changed)} columns", changed=changed)
+        return report
+
+    def restore_dtypes(self) -> str:
+        """Casts the columns compacted by ingestion or `optimize_dtypes` back to their original dtypes."""
+        if self.dtype_report is None:
+            return "No optimized dtypes to restore."
+        columns = [col for col in self.dtype_report.changed if col in self.data.columns]
+        self.governor.admit("restore_dtypes", sum(self.dtype_report.changed[col]["bytes_before"] for col in columns))
+        self.data = restore_dtypes(self.data, self.dtype_report)
+        self.dtype_report = None
+        self._commit_version(f"Restored original dtypes of {len(columns)} columns", changed=columns)
+        return f"Restored original dtypes of {len(columns)} columns."
+
+    def lazy(self, enabled: bool = True) -> 'AnalysisEngine':
+        """
+        Switches lazy mode. While lazy, `replace_values`, `fill_nulls` and
+        `clean_data` only record a plan; `collect()` previews it and
+        `commit()` runs it as fused passes and stores a single version.
+        Turning lazy mode off commits anything still pending.
+        """
+        if not enabled and self.plan:
+            self.commit()
+        self._lazy = enabled
+        return self
+
+    def collect(self) -> pd.DataFrame:
+        """Materializes the pending plan without touching `self.data` or the history."""
+        result, _ = self.plan.execute(self.data, self.imputer)
+        return result
+
+    def commit(self, message: Optional[str] = None) -> str:
+        """Runs the pending plan in fused passes and commits the result as one version."""
+        if not self.plan:
+            return "Nothing to commit."
+        description = self.plan.describe()
+        print(f"Executing fused plan: {description}")
+        if self.state_manager.current_version == 0 and any(kind == "dropna" for kind, _ in self.plan.ops):
+            self.state_manager.rebase(self.data)
+        initial_rows = len(self.data)
+        self.governor.admit("commit", self.governor.data_bytes())
+        with self.metrics.phase("pipeline", rows=initial_rows):
+            self.data, changed = self.plan.execute(self.data, self.imputer)
+        self.plan.clear()
+        self._commit_version(message or f"Fused pipeline: {description}", changed=changed)
+        return f"Committed fused plan ({description}): {len(changed)} columns changed, {initial_rows - len(self.data)} rows removed."
 
     def rollback(self, to: Optional[str] = None):
         """Rolls back the dataset to a previous state."""
-        self.data = self.state_manager.rollback(to)
+        with self.metrics.phase("rollback") as timer:
+            self.data = self.state_manager.rollback(to)
+            timer.rows = len(self.data)
+
+    def memory_status(self) -> Dict[str, Any]:
+        """
+        Engine-owned bytes (data, in-memory history, caches) against
+        `max_memory`, whether Lean Mode is on, and every action the memory
+        governor took (evictions, compactions, spills, chunked or refused
+        operations).
+        """
+        return self.governor.status()
+
+    def _commit_version(self, message: str, changed: Optional[List[str]] = None,
+                        appended: Optional[pd.DataFrame] = None):
+        """Commits `self.data` (or an append of `appended`), timed as the "commit" phase with the bytes stored."""
+        with self.metrics.phase("commit", rows=len(self.data)) as timer:
+            before = self.state_manager.stored_bytes
+            if appended is None:
+                self.state_manager.commit(self.data, message, changed=changed)
+            else:
+                self.state_manager.append(appended, message)
+            timer.nbytes = max(self.state_manager.stored_bytes - before, 0)
 
     def write_report(self, filename: str = "insights_report.txt"):
         """Saves a humanized report to a text file."""
@@ -153,6 +406,10 @@ STATUS: Verified
         print(f"Data Version:  {status['current_version']}")
         print(f"Checkpoints:   {status['checkpoints']}")
         print(f"Memory Depth:  {status['total_history']} versions")
+        print(f"History Size:  {status['memory']['stored_bytes'] / 1e6:.2f} MB (full copies: {status['memory']['full_copy_bytes'] / 1e6:.2f} MB)")
+        memory = self.governor.status()
+        budget = f" of {memory['budget_human']}" if memory["budget"] is not None else ""
+        print(f"Engine Memory: {memory['usage']['total'] / 1e6:.2f} MB{budget}{' (🚨 Lean Mode)' if memory['lean_mode'] else ''}")
         print(f"Policy:        {'🔓 Rollback Allowed' if status['rollback_allowed'] else '🔒 Rollback Forbidden'}")
         print("-------------------------------\n")
 
@@ -160,12 +417,31 @@ STATUS: Verified
         """Pre-computes common data statistics to accelerate future queries."""
         if self.data is not None and not self.data.empty:
             logger.info("⚡ Warming up data queues and pre-calculating tensors...")
-            # Simulate a computationally intensive warm-up
-            self.stats_cache = {
-                "mean": self.data.select_dtypes(include=[np.number]).mean().to_dict(),
-                "std": self.data.select_dtypes(include=[np.number]).std().to_dict(),
-                "columns": list(self.data.columns)
-            }
+            self.stats.aggregates(self.data)
+            if self.config["approximate"]:
+                self._column_sketches()
+
+    def _column_sketches(self) -> Dict[str, Dict[str, Any]]:
+        """Mergeable per-chunk sketches (distinct counts, medians, modes), cached per column version."""
+        chunk_rows, sample_rows = self.config["sketch_chunk_rows"], self.config["sketch_sample_rows"]
+        return {col: self.stats.get(self.data, col, "sketches",
+                                    lambda s: sketch_column(s, chunk_rows, sample_rows=sample_rows))
+                for col in self.data.columns}
+
+    @property
+    def stats_cache(self) -> Dict[str, Any]:
+        """Summary statistics of the current data version, served from the version-aware cache."""
+        aggregates = self.stats.aggregates(self.data)
+        cache = {
+            "mean": {col: s.mean for col, s in aggregates.items()},
+            "std": {col: s.std for col, s in aggregates.items()},
+            "columns": list(self.data.columns)
+        }
+        if self.config["approximate"]:
+            sketches = self._column_sketches()
+            cache["sketches"] = sketches
+            cache["approximate"] = {col: summarize_sketches(s) for col, s in sketches.items()}
+        return cache
 
     def _initialize_source(self, source: str) -> pd.DataFrame:
         """
@@ -194,26 +470,96 @@ STATUS: Verified
         The main pipeline for processing a natural language analytical query.
         """
         logger.info(f"🧠 Processing complex intent: {query}")
-        
-        # Phase 1: Semantic Decomposition
-        intent_triplets = self.nlp_processor.extract_triplets(query)
-        logger.info(f"🧩 Decomposed into {len(intent_triplets)} semantic primitives.")
-        
-        # Phase 2: Hypothesis Generation
-        hypotheses = self._formulate_hypotheses(intent_triplets)
-        
-        # Phase 4: Symbolic Validation
-        validated_insights = {}
-        for hyp in hypotheses:
-            if "growth" in hyp.lower():
-                validated_insights["trends"] = self._analyze_trends()
-            if "hidden" in hyp.lower():
-                validated_insights["anomalies"] = self._detect_anomalies()
-                
-        # Phase 5: Ethical Guardrails
-        audit = self.ethics.audit_dataset(self.data)
-        
-        return AnalysisResultWrapper(validated_insights, audit, query)
+        with self.metrics.phase("intent"):
+            # Phase 1: Semantic Decomposition
+            with self.metrics.phase("intent.parse"):
+                intent_triplets = self.nlp_processor.extract_triplets(query)
+            logger.info(f"🧩 Decomposed into {len(intent_triplets)} semantic primitives.")
+
+            # Same intent on the same committed version and context: serve the cached result
+            key = self._intent_key(intent_triplets)
+            found, cached = self.intent_cache.get(key)
+            if found:
+                self.metrics.increment("intent_cache_hits")
+                insights, audit = cached
+                return AnalysisResultWrapper(dict(insights), dict(audit), query, cached=True)
+
+            # Phase 2: Hypothesis Generation
+            with self.metrics.phase("intent.hypotheses"):
+                hypotheses = self._formulate_hypotheses(intent_triplets)
+
+            # Phase 4: Symbolic Validation
+            with self.metrics.phase("intent.validation"):
+                validated_insights = {name: self._run_analysis(name) for name in self._plan_analyses(hypotheses)}
+
+            # Phase 5: Ethical Guardrails
+            with self.metrics.phase("intent.ethics"):
+                audit = self._run_analysis("ethics")
+
+            self.intent_cache.put(key, (dict(validated_insights), dict(audit)))
+            return AnalysisResultWrapper(validated_insights, dict(audit), query)
+
+    def process_intents(self, queries: List[str]) -> List['AnalysisResultWrapper']:
+        """
+        Answers many queries with shared scans.
+
+        All queries are parsed first and their hypotheses merged into one
+        deduplicated plan; each analysis (trends, anomalies, ethics audit)
+        then runs at most once for the current data version, and the results
+        are fanned back out to one wrapper per query, in input order.
+        """
+        logger.info(f"🧠 Processing {len(queries)} intents with shared scans")
+        with self.metrics.phase("intents", rows=len(queries)):
+            return self._process_intents(queries)
+
+    def _process_intents(self, queries: List[str]) -> List['AnalysisResultWrapper']:
+        parsed, results = [], [None] * len(queries)
+        for i, query in enumerate(queries):
+            key = self._intent_key(self.nlp_processor.extract_triplets(query))
+            found, cached = self.intent_cache.get(key)
+            if found:
+                insights, audit = cached
+                results[i] = AnalysisResultWrapper(dict(insights), dict(audit), query, cached=True)
+            else:
+                parsed.append((i, query, key))
+
+        plans = {key: self._plan_analyses(self._formulate_hypotheses(list(key[1]))) for _, _, key in parsed}
+        needed = list(dict.fromkeys(name for plan in plans.values() for name in plan))
+        if parsed:
+            needed.append("ethics")
+        shared = {name: self._run_analysis(name) for name in needed}
+
+        for i, query, key in parsed:
+            insights = {name: shared[name] for name in plans[key]}
+            self.intent_cache.put(key, (dict(insights), dict(shared["ethics"])))
+            results[i] = AnalysisResultWrapper(insights, dict(shared["ethics"]), query)
+        return results
+
+    def _plan_analyses(self, hypotheses: List[str]) -> List[str]:
+        """Deduplicated, ordered analyses needed to validate the hypotheses."""
+        return list(dict.fromkeys(HYPOTHESIS_ANALYSES[hyp] for hyp in hypotheses if hyp in HYPOTHESIS_ANALYSES))
+
+    def _run_analysis(self, name: str) -> Any:
+        """Runs one named analysis, at most once per data version (results are kept in `analysis_cache`)."""
+        key = (self.state_manager.version_id, name)
+        found, value = self.analysis_cache.get(key)
+        if not found:
+            runners = {"trends": self._analyze_trends, "anomalies": self._detect_anomalies,
+                       "ethics": lambda: self.ethics.audit_dataset(self.data)}
+            # Audits are timed as "audit"; the numeric analyses as "analysis.<name>"
+            with self.metrics.phase("audit" if name == "ethics" else f"analysis.{name}", rows=len(self.data)):
+                value = runners[name]()
+            self.analysis_cache.put(key, value)
+        return value
+
+    def _intent_key(self, triplets: List[Tuple[str, str, str]]) -> Tuple[Any, ...]:
+        """Cache key: (data version identity, normalized intent triplets, context fingerprint)."""
+        normalized = tuple(sorted({tuple(str(part).lower() for part in triplet) for triplet in triplets}))
+        return (self.state_manager.version_id, normalized, self._context_fingerprint())
+
+    def _context_fingerprint(self) -> str:
+        payload = repr(sorted((repr(k), repr(v)) for k, v in self.context_window.items()))
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
     def _formulate_hypotheses(self, triplets: List[Tuple[str, str, str]]) -> List[str]:
         """Maps NLP intent to internal analytical hypotheses."""
@@ -253,68 +599,168 @@ STATUS: Verified
         """Measures data volatility and sparsity."""
         return {"volatility": 0.15, "sparsity": self.data.isnull().sum().sum() / self.data.size, "dimensionality": len(self.data.columns)}
 
+    def numeric_profile(self, sigma: float = 3.0, outliers: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Structured per-column summary of the numeric data: moments, range,
+        first/last change and (optionally) sigma-rule outlier counts. Computed
+        by the fused block kernel and cached per column version.
+        """
+        aggregates = self.stats.aggregates(self.data)
+        counts = self.stats.outliers(self.data, sigma) if outliers else {}
+        profile = {}
+        for col, s in aggregates.items():
+            profile[col] = {
+                "count": s.count, "mean": s.mean, "std": s.std, "min": s.min, "max": s.max,
+                "first": s.first, "last": s.last, "change": (s.last - s.first) / (abs(s.first) + 1e-9)
+            }
+            if outliers:
+                low, high = s.bounds(sigma)
+                profile[col].update(low=low, high=high, outliers=counts[col])
+        return profile
+
+    def calculate_uplift(self, treatment: str, outcome: str, by: Optional[List[str]] = None,
+                         **options: Any) -> Dict[str, Any]:
+        """
+        Bootstrap CATE of `treatment` on `outcome` in the current frame (see
+        `CausalEngine.calculate_uplift` for `treated`, `replicates`,
+        `confidence` and `seed`). Cached per data version and arguments.
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        # Options may hold lists (e.g. several treated levels), so they are keyed by their repr
+        key = (self.state_manager.version_id, "uplift", treatment, outcome, tuple(by), repr(sorted(options.items())))
+        found, value = self.analysis_cache.get(key)
+        if not found:
+            with self.metrics.phase("analysis.uplift", rows=len(self.data)):
+                value = self.causal.calculate_uplift(treatment, outcome, self.data, by=by, **options)
+            self.analysis_cache.put(key, value)
+        return value
+
     def _analyze_trends(self):
         """Actually calculates YoY/MoM growth for numeric columns."""
-        numeric_df = self.data.select_dtypes(include=[np.number])
-        if numeric_df.empty: return "No numeric data for trend analysis."
-        
-        trends = {}
-        for col in numeric_df.columns:
-            change = (numeric_df[col].iloc[-1] - numeric_df[col].iloc[0]) / (abs(numeric_df[col].iloc[0]) + 1e-9)
-            trends[col] = f"{change*100:.1f}% total change"
+        profile = self.numeric_profile(outliers=False)
+        if not profile: return "No numeric data for trend analysis."
+        trends = {col: f"{p['change']*100:.1f}% total change" for col, p in profile.items()}
         return f"Real Trend Analysis: {trends}"
 
     def _detect_anomalies(self):
         """Uses 3-sigma rule for actual outlier detection."""
-        numeric_df = self.data.select_dtypes(include=[np.number])
-        if numeric_df.empty: return "No numeric data for anomaly detection."
-        
-        anomalies = {}
-        for col in numeric_df.columns:
-            mean, std = numeric_df[col].mean(), numeric_df[col].std()
-            outliers = numeric_df[(numeric_df[col] > mean + 3*std) | (numeric_df[col] < mean - 3*std)]
-            if not outliers.empty:
-                anomalies[col] = f"{len(outliers)} statistical outliers detected."
+        profile = self.numeric_profile(sigma=3.0)
+        if not profile: return "No numeric data for anomaly detection."
+        anomalies = {col: f"{p['outliers']} statistical outliers detected." for col, p in profile.items() if p['outliers']}
         return f"Real Anomaly Audit: {anomalies or 'System is within 3-sigma bounds.'}"
 
+    def monitor(self, batches: Union[Iterable[pd.DataFrame], AsyncIterable[pd.DataFrame]], sigma: float = 3.0,
+                halflife: Optional[float] = 10_000, warmup: int = 30, columns: Optional[List[str]] = None,
+                seed: bool = True):
+        """
+        Live 3-sigma monitoring: streams DataFrame micro-batches (a plain or
+        async iterator) through a StreamingAnomalyDetector and yields each
+        batch's anomalies. With `seed`, the detector starts from the current
+        data's cached statistics. The detector is kept on `self.detector`.
+        """
+        options = dict(sigma=sigma, halflife=halflife, warmup=warmup)
+        if seed and self.data is not None and not self.data.empty:
+            self.detector = StreamingAnomalyDetector.from_stats(self.stats.aggregates(self.data, columns), **options)
+        else:
+            self.detector = StreamingAnomalyDetector(columns, **options)
+        if hasattr(batches, "__aiter__"):
+            return self.detector.arun(batches)
+        return self.detector.run(batches)
+
     def _find_optimal_analytical_path(self, params: Dict) -> List[str]:
         """Calculates the most efficient sequence of operational nodes."""
         return ["Node_DataClean", "Node_TensorProject", "Node_CausalInference", "Node_Storytelling"]
 
     def _check_system_resources(self):
-        """Monitors CPU and RAM for market-level stability."""
-        mem = psutil.virtual_memory()
-        cpu = psutil.cpu_percent()
-        self.performance_logs.append({"ts": time.time(), "cpu": cpu, "mem_percent": mem.percent})
-        if mem.percent > 90:
+        """Monitors CPU and RAM for market-level stability (sampled at start-up and on every report)."""
+        sample = sample_process()
+        self.performance_logs.append({"ts": time.time(), "cpu": sample["cpu_percent"],
+                                      "mem_percent": sample["system_memory_percent"], "rss_bytes": sample["rss_bytes"]})
+        del self.performance_logs[:-1000]
+        if sample["system_memory_percent"] > 90:
             logger.warning("🚨 CRITICAL: System Memory Pressure Detected. Activating Lean Mode.")
+            self.governor.pressure(f"system memory at {sample['system_memory_percent']:.0f}%")
 
-    def batch_process(self, datasets: List[pd.DataFrame], parallel: bool = True):
-        """Processes multiple enterprise streams in parallel."""
-        print(f"⚙️ Batch Processing {len(datasets)} streams...")
-        # Complex multi-threading logic for market-level performance
-        results = []
-        for d in datasets:
-            results.append(self.run_global_analysis("Batch Auto-Optimize", [], "json"))
-        return results
+    def batch_process(self, datasets: List[pd.DataFrame], parallel: bool = True,
+                      pipeline: Tuple[str, ...] = ("impute", "clean"), query: Optional[str] = None,
+                      mode: Optional[str] = None, max_workers: Optional[int] = None,
+                      max_in_flight: Optional[int] = None, ordered: bool = True):
+        """
+        Processes multiple enterprise streams in parallel.
 
-    def get_performance_audit(self):
+        Each dataset runs through `pipeline` (any of "clean", "impute",
+        "intent") in its own engine. `mode` is "process" (default when
+        `parallel`), "thread" or "serial". Failures are isolated per item.
+        Returns a list of `BatchResult` in input order, or an iterator in
+        completion order when `ordered=False`.
+        """
+        if query and "intent" not in pipeline:
+            pipeline = tuple(pipeline) + ("intent",)
+        count = len(datasets) if hasattr(datasets, "__len__") else "streaming"
+        print(f"⚙️ Batch Processing {count} streams...")
+        processor = BatchProcessor(
+            pipeline=pipeline, query=query,
+            mode=mode or ("process" if parallel else "serial"),
+            max_workers=max_workers, max_in_flight=max_in_flight,
+            config={k: v for k, v in self.config.items() if k in ("approximate", "sketch_chunk_rows", "sketch_sample_rows")}
+        )
+        if ordered:
+            with self.metrics.phase("batch") as timer:
+                results = processor.run(datasets)
+                timer.rows = sum(r.value["rows_in"] for r in results if r.ok)
+            return results
+        return processor.iter_results(datasets)
+
+    def get_performance_audit(self) -> Dict[str, Any]:
+        """
+        Measured latency and throughput. `average_latency` and the quantiles
+        cover `process_intent` calls; `throughput` is data rows over time
+        across the top-level data phases (`THROUGHPUT_PHASES`: ingestion,
+        imputation, cleaning, append, replace, fused pipeline and batch).
+        Nested phases (commits, analyses inside intents) and query counts
+        are left out. `reliability_score` is the configured objective
+        (`reliability_target`), `success_rate` the measured one.
+        """
+        phases = self.metrics.snapshot()["phases"]
+        intent = phases.get("intent")
+        data_phases = [phases[name] for name in THROUGHPUT_PHASES if name in phases]
+        rows = sum(p["rows"] for p in data_phases)
+        seconds = sum(p["total_s"] for p in data_phases)
+        calls = sum(p["count"] for p in phases.values())
+        errors = sum(p["errors"] for p in phases.values())
         return {
-            "average_latency": "12ms",
-            "throughput": "5M rows/sec",
-            "reliability_score": 0.999
+            "average_latency": f"{intent['mean_ms']:.1f}ms" if intent else "n/a",
+            "latency_ms": {q: intent[q] for q in ("p50_ms", "p95_ms", "p99_ms")} if intent else {},
+            "throughput": f"{rows / seconds:,.0f} rows/sec" if seconds else "n/a",
+            "reliability_score": self.config["reliability_target"],
+            "success_rate": round(1 - errors / calls, 6) if calls else None,
+            "phases": phases
         }
 
     def diagnostic_report(self):
         """Generates a health report of the Neuro-Symbolic engine state."""
+        self._check_system_resources()
+        snapshot = self.metrics.snapshot()
         return {
             "uptime": str(datetime.datetime.now() - self.start_time),
-            "engine_load": "0.15 TFlops",
+            "engine_load": f"{snapshot['process']['cpu_percent']:.1f}% CPU",
             "active_paradigms": ["ENTROPY", "GIBBS_FREE_INSIGHT"],
-            "cache_hits": 142,
+            "cache_hits": self.stats.hits,
+            "cache_misses": self.stats.misses,
+            "intent_cache": self.intent_cache.metrics(),
+            "analysis_cache": self.analysis_cache.metrics(),
+            "memory": self.governor.status(),
+            "dtypes": self.dtype_report.summary() if self.dtype_report is not None else None,
+            "instrumentation": snapshot,
             "tensor_resonance": "Synchronized"
         }
 
+    def export_metrics(self, format: str = "prometheus") -> str:
+        """Instrumentation dump in Prometheus text ("prometheus") or OpenMetrics ("openmetrics") format."""
+        if format not in ("prometheus", "openmetrics"):
+            raise ValueError(f"Unknown metrics format '{format}'. Use 'prometheus' or 'openmetrics'.")
+        return self.metrics.to_prometheus(openmetrics=format == "openmetrics")
+
     def recursive_feature_discovery(self, depth: int = 3):
         """Performs multi-level feature engineering and cross-interaction discovery."""
         print(f"🔍 Starting recursive discovery at depth {depth}...")
@@ -344,10 +790,11 @@ class GlobalAnalysisResult:
         return output
 
 class AnalysisResultWrapper:
-    def __init__(self, insights: Dict, ethics_audit: Dict, original_query: str):
+    def __init__(self, insights: Dict, ethics_audit: Dict, original_query: str, cached: bool = False):
         self.data = insights
         self.ethics = ethics_audit
         self.query = original_query
+        self.cached = cached
         self.confidence = 0.89 + np.random.rand() * 0.1
         
     def __repr__(self):
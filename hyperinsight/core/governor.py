@@ -0,0 +1,229 @@
+import logging
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import pandas as pd
+
+from ..utils.memory import compact_series, format_size
+
+logger = logging.getLogger("HyperInsight.Core")
+
+# While in Lean Mode, result caches keep at most this many entries
+LEAN_CACHE_ENTRIES = 32
+# A rewritten column is allocated twice: its new values and the history's private copy
+REWRITE_COPIES = 2
+
+def frame_bytes(df: pd.DataFrame, columns: Optional[Sequence[Hashable]] = None) -> int:
+    """Deep size of `df` (or of its `columns`, without the index)."""
+    if columns is None:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    return int(df[list(columns)].memory_usage(index=False, deep=True).sum())
+
+class MemoryBudgetExceeded(MemoryError):
+    """An operation's estimated working set does not fit the engine's memory budget."""
+
+class MemoryGovernor:
+    """
+    Enforces an AnalysisEngine's `max_memory` over the bytes it owns: the
+    current frame, the in-memory history and the caches.
+
+    Operations call `admit(name, extra)` with the bytes they are about to
+    allocate. Once usage would pass `lean_threshold` of the budget, the
+    engine enters Lean Mode (result caches are capped) and relief runs in
+    order of cost until the operation fits:
+        evict_caches    intent, analysis and statistics caches, dedup index
+        compact_data    lossless integer/float downcasts and low-cardinality
+                        categoricals, committed as one version
+        spill_history   older versions moved to Arrow files (needs pyarrow)
+    An operation that still does not fit the budget raises
+    MemoryBudgetExceeded; column-wise work can be split into groups that
+    fit with `plan_chunks`. Host memory pressure (`pressure`) only enters
+    Lean Mode and evicts caches. Every action is kept in `actions` and
+    reported by `status()`.
+    """
+
+    def __init__(self, engine, budget: Optional[int], lean_threshold: float = 0.8, categorical_ratio: float = 0.5):
+        self.engine = engine
+        self.budget = budget
+        self.lean_threshold = lean_threshold
+        self.categorical_ratio = categorical_ratio
+        self.lean_mode = False
+        self.actions: List[Dict[str, Any]] = []
+        self._data_bytes = (None, 0)  # ((version id, frame id), bytes)
+
+    @property
+    def threshold(self) -> float:
+        return self.lean_threshold * self.budget
+
+    def data_bytes(self) -> int:
+        """Deep size of the engine's current frame (cached per version)."""
+        key = (self.engine.state_manager.version_id, id(self.engine.data))
+        if self._data_bytes[0] != key:
+            self._data_bytes = (key, frame_bytes(self.engine.data))
+        return self._data_bytes[1]
+
+    def usage(self) -> Dict[str, int]:
+        """Engine-owned bytes. The history keeps private copies, so a fresh engine owns about twice its frame."""
+        engine = self.engine
+        index = engine._row_index
+        data = self.data_bytes()
+        history = engine.state_manager.hot_bytes
+        caches = engine.stats.nbytes + (index.memory_bytes if index is not None else 0)
+        return {"data": data, "history": history, "caches": caches, "total": data + history + caches}
+
+    def admit(self, operation: str, extra: int = 0):
+        """Makes room for `extra` more bytes, or raises MemoryBudgetExceeded."""
+        if not self._make_room(operation, extra):
+            used = self.usage()["total"]
+            detail = (f"{operation} needs {format_size(extra)} but {format_size(used)} of "
+                      f"{format_size(self.budget)} is in use")
+            self._record("refused", detail)
+            raise MemoryBudgetExceeded(f"{detail}. Process the source out of core with AnalysisEngine.scan().")
+
+    def admit_columns(self, operation: str, df: pd.DataFrame, columns: Sequence[Hashable]):
+        """`admit` for an operation that rewrites `columns` of `df` and commits them."""
+        self.admit(operation, REWRITE_COPIES * frame_bytes(df, columns))
+
+    def plan_chunks(self, operation: str, df: pd.DataFrame,
+                    columns: Optional[Sequence[Hashable]] = None) -> List[Optional[List[Hashable]]]:
+        """
+        Column groups for a column-wise rewrite of the columns holding nulls
+        (imputation). One group (`[columns]`) when the whole rewrite fits;
+        otherwise groups that each fit in half the free budget, or
+        MemoryBudgetExceeded when a single column does not.
+        """
+        targets = list(df.columns if columns is None else columns)
+        sizes = {col: REWRITE_COPIES * frame_bytes(df, [col]) for col in targets if df[col].hasnans}
+        if not sizes or self._make_room(operation, sum(sizes.values())):
+            return [None if columns is None else targets]
+        # Each part's commit stays in memory (as the current version) while the next part runs
+        capacity = (self.budget - self.usage()["total"]) // 2
+        if max(sizes.values()) > capacity:
+            self.admit(operation, 2 * max(sizes.values()))
+            capacity = (self.budget - self.usage()["total"]) // 2
+        groups, group, size = [], [], 0
+        for col, nbytes in sizes.items():
+            if group and size + nbytes > capacity:
+                groups.append(group)
+                group, size = [], 0
+            group.append(col)
+            size += nbytes
+        groups.append(group)
+        self._record("chunked", f"{operation} split into {len(groups)} column groups of at most {format_size(capacity)}")
+        return groups
+
+    def check(self, reason: str):
+        """Applies relief when usage is above the Lean Mode threshold; never refuses."""
+        if self.budget is None:
+            return
+        used = self.usage()["total"]
+        if used <= self.threshold:
+            return
+        self.enter_lean_mode(f"{reason}: {format_size(used)} of {format_size(self.budget)} in use")
+        used = self.relieve(self.threshold)
+        if used > self.budget:
+            self._record("over_budget", f"{format_size(used)} still in use after relief")
+
+    def pressure(self, reason: str):
+        """
+        Host-level memory pressure: enters Lean Mode and drops the caches.
+        Data and history are left alone; compaction and spilling only run
+        against the engine's own budget (`check`, `admit`).
+        """
+        self.enter_lean_mode(reason)
+        used = self.usage()["total"]
+        detail = self._evict_caches(0, used)
+        if detail is not None:
+            self._record("evict_caches", detail, used - self.usage()["total"])
+
+    def enter_lean_mode(self, reason: str):
+        if self.lean_mode:
+            return
+        self.lean_mode = True
+        for cache in (self.engine.intent_cache, self.engine.analysis_cache):
+            cache.max_entries = min(cache.max_entries, LEAN_CACHE_ENTRIES)
+        logger.warning(f"🚨 Lean Mode activated: {reason}")
+        self._record("lean_mode", reason)
+
+    def relieve(self, target: float) -> int:
+        """Runs relief steps until usage is at most `target` bytes; returns the usage reached."""
+        used = self.usage()["total"]
+        for name, step in (("evict_caches", self._evict_caches), ("compact_data", self._compact_data),
+                           ("spill_history", self._spill_history)):
+            if used <= target:
+                break
+            detail = step(target, used)
+            after = self.usage()["total"]
+            if detail is not None:
+                self._record(name, detail, used - after)
+            used = after
+        return used
+
+    def status(self) -> Dict[str, Any]:
+        usage = self.usage()
+        return {
+            "budget": self.budget,
+            "budget_human": format_size(self.budget) if self.budget is not None else None,
+            "usage": usage,
+            "utilization": round(usage["total"] / self.budget, 4) if self.budget else None,
+            "lean_mode": self.lean_mode,
+            "history_budget": self.engine.state_manager.memory_budget,
+            "actions": list(self.actions)
+        }
+
+    def _make_room(self, operation: str, extra: int) -> bool:
+        if self.budget is None:
+            return True
+        used = self.usage()["total"]
+        if used + extra <= self.threshold:
+            return True
+        self.enter_lean_mode(f"{operation} needs {format_size(extra)} with {format_size(used)} in use")
+        return self.relieve(self.threshold - extra) + extra <= self.budget
+
+    def _evict_caches(self, target: float, used: int) -> Optional[str]:
+        engine = self.engine
+        entries = len(engine.intent_cache) + len(engine.analysis_cache) + len(engine.stats._entries)
+        index = engine._row_index
+        if not entries and index is None:
+            return None
+        engine.intent_cache.clear()
+        engine.analysis_cache.clear()
+        engine.stats.clear()
+        if index is not None:
+            index.release()
+            engine._row_index = None
+        return f"{entries} cached results dropped" + (", dedup index released" if index is not None else "")
+
+    def _compact_data(self, target: float, used: int) -> Optional[str]:
+        engine = self.engine
+        compacted = {}
+        for col in engine.data.columns:
+            compact = compact_series(engine.data[col], self.categorical_ratio)
+            if compact is not None:
+                compacted[col] = compact
+        if not compacted:
+            return None
+        detail = ", ".join(f"{col}: {engine.data[col].dtype} -> {s.dtype}" for col, s in compacted.items())
+        data = engine.data.copy(deep=False)
+        for col, compact in compacted.items():
+            data[col] = compact
+        engine.data = data
+        engine._commit_version("Lean Mode compaction", changed=list(compacted))
+        return detail
+
+    def _spill_history(self, target: float, used: int) -> Optional[str]:
+        manager = self.engine.state_manager
+        budget = int(max(target - (used - manager.hot_bytes), 0))
+        if manager.memory_budget is not None:
+            budget = min(budget, manager.memory_budget)
+        try:
+            spilled = manager.set_memory_budget(budget)
+        except ImportError:
+            return None
+        return f"history budget {format_size(budget)}, {format_size(spilled)} spilled to disk"
+
+    def _record(self, action: str, detail: str, freed: int = 0):
+        self.actions.append({"ts": time.time(), "action": action, "detail": detail, "freed_bytes": max(int(freed), 0)})
+        del self.actions[:-1000]
+        self.engine.metrics.increment(f"governor_{action}")
+        logger.info(f"🧮 Memory governor: {action} ({detail})")
@@ -0,0 +1,164 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..utils.dtypes import widen_for
+from ..utils.sketches import sketch_column
+
+# Below this many rows a thread pool costs more than it saves
+PARALLEL_MIN_ROWS = 100_000
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+def _first_mode(series: pd.Series) -> Any:
+    modes = series.mode(dropna=True)
+    return modes.iloc[0] if not modes.empty else np.nan
+
+class NullImputer:
+    """
+    Vectorized Null Imputation Engine.
+
+    Only columns that actually contain nulls are touched. Columns are split
+    into dtype groups (any numeric dtype vs. the rest) and each group gets a
+    single statistics pass, run column-parallel on a thread pool for large
+    frames. Filled columns are written into a shallow copy, so untouched
+    columns are never duplicated.
+
+    Strategies:
+        auto    mean for numeric columns, mode for everything else
+        mean    same as auto
+        median  median for numeric columns, mode for everything else
+        mode    mode for every column
+        constant  a single fill value for every column
+
+    With `approximate=True`, modes come from merged per-chunk Misra-Gries
+    sketches and medians from t-digests, so memory per column stays bounded
+    by the sketch size. Means are exact in both modes.
+    """
+    STRATEGIES = ("auto", "mean", "median", "mode", "constant")
+
+    def __init__(self, max_workers: int = 1, approximate: bool = False, chunk_rows: int = 1_000_000,
+                 sample_rows: Optional[int] = None):
+        self.max_workers = max(1, max_workers)
+        self.approximate = approximate
+        self.chunk_rows = chunk_rows
+        self.sample_rows = sample_rows
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'NullImputer':
+        """Maps the engine config (`threading`: bool or worker count, `approximate`) to an imputer."""
+        threading = config.get("threading")
+        if threading is True:
+            workers = os.cpu_count() or 1
+        elif isinstance(threading, int) and threading > 1:
+            workers = threading
+        else:
+            workers = 1
+        return cls(workers, approximate=config.get("approximate", False),
+                   chunk_rows=config.get("sketch_chunk_rows", 1_000_000),
+                   sample_rows=config.get("sketch_sample_rows"))
+
+    def impute(self, df: pd.DataFrame, strategy: str = "auto", constant: Any = None,
+               group_by: Optional[str] = None, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, List[str]]:
+        """Returns the imputed frame and the list of columns that were filled."""
+        fills = self.compute_fill_values(df, strategy, constant, group_by, columns)
+        return self.apply(df, fills), list(fills)
+
+    def compute_fill_values(self, df: pd.DataFrame, strategy: str = "auto", constant: Any = None,
+                            group_by: Optional[str] = None, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Maps each column with nulls to a scalar or row-aligned Series of fill values."""
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy '{strategy}'. Choose from {self.STRATEGIES}.")
+        if group_by is not None and group_by not in df.columns:
+            raise KeyError(f"Group column '{group_by}' not found in data.")
+
+        candidates = list(columns) if columns is not None else list(df.columns)
+        with_nulls = [col for col, has in zip(candidates, self._map(lambda c: df[c].hasnans, candidates, len(df))) if has]
+        if not with_nulls:
+            return {}
+        if strategy == "constant":
+            return {col: constant for col in with_nulls} if constant is not None else {}
+
+        numeric_how = {"auto": "mean", "mean": "mean", "median": "median"}.get(strategy)
+        numeric = [c for c in with_nulls if numeric_how and _is_numeric(df[c])]
+        others = [c for c in with_nulls if c not in set(numeric)]
+
+        fills = {}
+        fills.update(self._numeric_stats(df, numeric, numeric_how))
+        fills.update(self._mode_stats(df, others))
+        for col in with_nulls:
+            if pd.isna(fills[col]):
+                if _is_numeric(df[col]):
+                    del fills[col]  # all-null numeric column: nothing sensible to fill with
+                else:
+                    fills[col] = "Unknown"
+
+        if group_by is not None:
+            numeric = [c for c in numeric if c in fills]
+            others = [c for c in others if c in fills and c != group_by]
+            fills = self._group_fills(df, group_by, numeric, numeric_how, others, fills)
+        return fills
+
+    def apply(self, df: pd.DataFrame, fills: Dict[str, Any]) -> pd.DataFrame:
+        """Fills into a shallow copy; only the filled columns get new buffers."""
+        new_df = df.copy(deep=False)
+        cols = list(fills)
+        for col, filled in zip(cols, self._map(lambda c: self._fill_column(df[c], fills[c]), cols, len(df))):
+            new_df[col] = filled
+        return new_df
+
+    def _numeric_stats(self, df: pd.DataFrame, cols: List[str], how: str) -> Dict[str, Any]:
+        if self.approximate and how == "median":
+            stat = lambda c: sketch_column(df[c], self.chunk_rows, ["quantiles"])["quantiles"].quantile(0.5)
+        else:
+            # Column-wise reductions beat a 2-D DataFrame.mean() over the block
+            stat = lambda c: getattr(df[c], how)()
+        return dict(zip(cols, self._map(stat, cols, len(df))))
+
+    def _mode_stats(self, df: pd.DataFrame, cols: List[str]) -> Dict[str, Any]:
+        if self.approximate:
+            stat = lambda c: sketch_column(df[c], self.chunk_rows, ["heavy_hitters"],
+                                           sample_rows=self.sample_rows)["heavy_hitters"].mode()
+        else:
+            stat = lambda c: _first_mode(df[c])
+        return dict(zip(cols, self._map(stat, cols, len(df))))
+
+    def _group_fills(self, df: pd.DataFrame, group_by: str, numeric: List[str], how: Optional[str],
+                     others: List[str], global_fills: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-group statistics broadcast back to rows, falling back to the global value."""
+        fills = dict(global_fills)
+        grouped = df.groupby(group_by, sort=False, observed=True)
+        if numeric:
+            group_stats = grouped[numeric].transform(how)
+            for col in numeric:
+                fills[col] = group_stats[col].fillna(global_fills[col])
+        keys = df[group_by]
+        for col in others:
+            group_modes = grouped[col].agg(_first_mode)
+            fills[col] = keys.map(group_modes).fillna(global_fills[col])
+        return fills
+
+    @staticmethod
+    def _fill_column(series: pd.Series, value: Any) -> pd.Series:
+        if pd.api.types.is_integer_dtype(series.dtype) and _is_numeric(series):
+            # Integer columns keep their dtype: round the statistic
+            value = value.round() if isinstance(value, pd.Series) else round(float(value))
+        # A compacted (float32 / narrow int) column is widened rather than storing a rounded fill
+        series = widen_for(series, value)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            new_values = pd.unique(value.dropna()) if isinstance(value, pd.Series) else [value]
+            missing = [v for v in new_values if v not in series.cat.categories]
+            if missing:
+                series = series.cat.add_categories(missing)
+        return series.fillna(value)
+
+    def _parallel(self, rows: int, cols: List[Any]) -> bool:
+        return self.max_workers > 1 and len(cols) > 1 and rows >= PARALLEL_MIN_ROWS
+
+    def _map(self, func: Callable, cols: List[Any], rows: int) -> List[Any]:
+        if not self._parallel(rows, cols):
+            return [func(c) for c in cols]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(cols))) as pool:
+            return list(pool.map(func, cols))
@@ -0,0 +1,224 @@
+import bisect
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Dict, Optional
+
+import psutil
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (1e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_PROCESS: Optional[psutil.Process] = None
+
+class PhaseStats:
+    """Counters, a fixed-bucket latency histogram and a window of recent latencies for one phase."""
+    __slots__ = ("count", "errors", "seconds", "max", "rows", "nbytes", "buckets", "recent")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.nbytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds: float, rows: int, nbytes: int, failed: bool):
+        self.count += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.nbytes += nbytes
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def quantiles(self) -> Dict[str, float]:
+        """p50/p95/p99 in milliseconds over the recent window (nearest rank)."""
+        ordered = sorted(self.recent)
+        if not ordered:
+            return {f"p{round(q * 100)}_ms": 0.0 for q in QUANTILES}
+        return {f"p{round(q * 100)}_ms": round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 3)
+                for q in QUANTILES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.seconds, 6),
+            "mean_ms": round(self.seconds / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows,
+            "rows_per_sec": round(self.rows / self.seconds) if self.rows and self.seconds else 0,
+            "bytes": self.nbytes
+        }
+        stats.update(self.quantiles())
+        return stats
+
+class PhaseTimer:
+    """Context manager returned by `Instrumentation.phase`; set `rows`/`nbytes` before it exits."""
+    __slots__ = ("_owner", "name", "rows", "nbytes", "_start", "_traced")
+
+    def __init__(self, owner: 'Instrumentation', name: str, rows: int, nbytes: int):
+        self._owner = owner
+        self.name = name
+        self.rows = rows
+        self.nbytes = nbytes
+
+    def __enter__(self) -> 'PhaseTimer':
+        self._traced = tracemalloc.get_traced_memory()[0] if self._owner.track_allocations else 0
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self._start
+        if self._owner.track_allocations:
+            self.nbytes += max(tracemalloc.get_traced_memory()[0] - self._traced, 0)
+        self._owner.observe(self.name, elapsed, self.rows, self.nbytes, failed=exc_type is not None)
+        return False
+
+class _NullTimer:
+    """Shared no-op timer handed out while instrumentation is disabled."""
+    rows = 0
+    nbytes = 0
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def __setattr__(self, name: str, value: Any):
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+class Instrumentation:
+    """
+    Low-overhead engine instrumentation: per-phase latency histograms,
+    rows and bytes processed, error counts and free-form counters.
+
+    Timing a phase costs two `perf_counter` calls and one locked update;
+    while disabled, `phase()` returns a shared no-op context manager.
+    `track_allocations` adds the net tracemalloc growth of each phase to its
+    byte count (tracemalloc slows allocation-heavy code noticeably).
+    Quantiles cover the last `window` observations of each phase.
+    """
+
+    def __init__(self, enabled: bool = True, track_allocations: bool = False, window: int = 2048):
+        self.enabled = enabled
+        self.track_allocations = enabled and track_allocations
+        self.window = window
+        self.started = time.time()
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name: str, rows: int = 0, nbytes: int = 0):
+        """Times a `with` block as one observation of `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return PhaseTimer(self, name, rows, nbytes)
+
+    def observe(self, name: str, seconds: float, rows: int = 0, nbytes: int = 0, failed: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats(self.window)
+            stats.add(seconds, rows, nbytes, failed)
+
+    def increment(self, name: str, value: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self.phases.clear()
+            self.counters.clear()
+        self.started = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time view of every phase, counter and a fresh process sample."""
+        with self._lock:
+            phases = {name: stats.to_dict() for name, stats in self.phases.items()}
+            counters = dict(self.counters)
+        return {
+            "enabled": self.enabled,
+            "uptime_s": round(time.time() - self.started, 3),
+            "phases": phases,
+            "counters": counters,
+            "process": sample_process()
+        }
+
+    def to_prometheus(self, openmetrics: bool = False, prefix: str = "hyperinsight") -> str:
+        """Prometheus text exposition (0.0.4), or OpenMetrics 1.0 with `openmetrics=True`."""
+        with self._lock:
+            phases = [(name, stats.count, stats.seconds, list(stats.buckets), stats.rows, stats.nbytes, stats.errors)
+                      for name, stats in sorted(self.phases.items())]
+            counters = sorted(self.counters.items())
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            # OpenMetrics names the counter family without its _total suffix
+            declared = name[:-len("_total")] if openmetrics and kind == "counter" else name
+            lines.append(f"# HELP {declared} {help_text}")
+            lines.append(f"# TYPE {declared} {kind}")
+
+        metric = f"{prefix}_phase_seconds"
+        family(metric, "histogram", "Latency of engine phases.")
+        for name, count, seconds, buckets, *_ in phases:
+            label = f'phase="{_escape(name)}"'
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+                cumulative += hits
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{label}}} {seconds!r}")
+            lines.append(f"{metric}_count{{{label}}} {count}")
+        for suffix, position, help_text in (("rows_total", 4, "Rows processed by engine phases."),
+                                            ("bytes_total", 5, "Bytes allocated by engine phases."),
+                                            ("errors_total", 6, "Engine phases that raised.")):
+            metric = f"{prefix}_phase_{suffix}"
+            family(metric, "counter", help_text)
+            for entry in phases:
+                lines.append(f'{metric}{{phase="{_escape(entry[0])}"}} {entry[position]}')
+        for name, value in counters:
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            family(metric, "counter", f"Engine counter {name}.")
+            lines.append(f"{metric} {value}")
+        for name, value in sample_process().items():
+            metric = f"{prefix}_process_{name}"
+            family(metric, "gauge", f"Process {name.replace('_', ' ')}.")
+            lines.append(f"{metric} {value}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+def sample_process() -> Dict[str, float]:
+    """Current resource usage of this process and host (CPU is averaged since the previous sample)."""
+    global _PROCESS
+    if _PROCESS is None:
+        _PROCESS = psutil.Process()
+    return {
+        "rss_bytes": _PROCESS.memory_info().rss,
+        "cpu_percent": _PROCESS.cpu_percent(),
+        "threads": _PROCESS.num_threads(),
+        "system_memory_percent": psutil.virtual_memory().percent
+    }
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in name)
@@ -0,0 +1,167 @@
+import os
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from .statistics import ColumnStats, count_outliers, fused_stats
+from .imputation import NullImputer, _is_numeric
+from ..utils.sketches import MisraGries, TDigest
+
+class OutOfCoreEngine:
+    """
+    Disk-resident analysis engine.
+
+    The file is never loaded whole: every operation streams it through
+    `DataConnector.iter_file` and folds each chunk into mergeable state
+    (ColumnStats, sketches), so peak memory follows `chunk_rows`, not the
+    file size. With a `query`, `path` is a DSN and chunks are streamed from
+    a server-side cursor instead. The one-pass profile is kept and reused; anything that needs
+    the profile first (outlier counts, imputation) costs a second pass.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 100_000, columns: Optional[Sequence[str]] = None,
+                 dtype: Optional[Dict[str, Any]] = None, filters: Optional[List[Any]] = None, connector=None,
+                 query: Optional[str] = None):
+        if connector is None:
+            from ..connectors.ingestion import DataConnector
+            connector = DataConnector()
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.columns = list(columns) if columns is not None else None
+        self.dtype = dtype
+        self.filters = filters
+        self.connector = connector
+        self.query = query
+        self._profile: Optional[Dict[str, Any]] = None
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        """Typed chunks of the (projected, filtered) file or query result."""
+        if self.query is None:
+            return self.connector.iter_file(self.path, self.chunk_rows, self.columns, self.dtype, self.filters)
+        return self._sql_chunks()
+
+    def _sql_chunks(self) -> Iterator[pd.DataFrame]:
+        from ..connectors.ingestion import apply_filters
+        for chunk in self.connector.iter_sql(self.path, self.query, self.chunk_rows):
+            chunk = apply_filters(chunk, self.filters)
+            if self.columns is not None:
+                chunk = chunk[self.columns]
+            if self.dtype:
+                chunk = chunk.astype(self.dtype)
+            if len(chunk):
+                yield chunk
+
+    def profile(self) -> Dict[str, Any]:
+        """One pass: row count, per-column nulls and ColumnStats for numeric columns."""
+        if self._profile is not None:
+            return self._profile
+        rows, chunks = 0, 0
+        nulls: Dict[str, int] = {}
+        stats: Dict[str, ColumnStats] = {}
+        numeric: Optional[set] = None
+        for chunk in self.chunks():
+            chunks += 1
+            rows += len(chunk)
+            for col, count in chunk.isna().sum().items():
+                nulls[col] = nulls.get(col, 0) + int(count)
+            chunk_numeric = {col for col in chunk.columns if _is_numeric(chunk[col])}
+            # A column is numeric only if every chunk parsed it as numeric
+            numeric = chunk_numeric if numeric is None else numeric & chunk_numeric
+            for col, part in fused_stats(chunk, [col for col in chunk.columns if col in numeric]).items():
+                stats[col] = stats[col].merge(part) if col in stats else part
+        numeric = numeric or set()
+        self._profile = {
+            "rows": rows,
+            "chunks": chunks,
+            "columns": list(nulls),
+            "nulls": nulls,
+            "stats": {col: s for col, s in stats.items() if col in numeric}
+        }
+        return self._profile
+
+    def analyze_trends(self) -> str:
+        """Total change between the first and last value of each numeric column."""
+        stats = self.profile()["stats"]
+        if not stats: return "No numeric data for trend analysis."
+        trends = {}
+        for col, s in stats.items():
+            change = (s.last - s.first) / (abs(s.first) + 1e-9)
+            trends[col] = f"{change*100:.1f}% total change"
+        return f"Real Trend Analysis: {trends}"
+
+    def detect_anomalies(self) -> str:
+        """3-sigma outlier counts; bounds come from the profile, counts from a second pass."""
+        stats = self.profile()["stats"]
+        if not stats: return "No numeric data for anomaly detection."
+        bounds = {col: s.bounds(3.0) for col, s in stats.items()}
+        counts = dict.fromkeys(bounds, 0)
+        for chunk in self.chunks():
+            for col, count in count_outliers(chunk, bounds).items():
+                counts[col] += count
+        anomalies = {col: f"{count} statistical outliers detected." for col, count in counts.items() if count}
+        return f"Real Anomaly Audit: {anomalies or 'System is within 3-sigma bounds.'}"
+
+    def fill_values(self, strategy: str = "auto", constant: Any = None) -> Dict[str, Any]:
+        """
+        Fill value per column with nulls. Means are exact (from the profile);
+        medians and modes come from t-digest / Misra-Gries sketches merged
+        across chunks, as in the in-memory engine's approximate mode.
+        """
+        if strategy not in NullImputer.STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy '{strategy}'. Choose from {NullImputer.STRATEGIES}.")
+        profile = self.profile()
+        with_nulls = [col for col, count in profile["nulls"].items() if count]
+        if strategy == "constant":
+            return {col: constant for col in with_nulls} if constant is not None else {}
+
+        numeric_how = {"auto": "mean", "mean": "mean", "median": "median"}.get(strategy)
+        numeric = [col for col in with_nulls if numeric_how and col in profile["stats"]]
+        fills: Dict[str, Any] = {}
+        if numeric_how == "mean":
+            fills.update({col: profile["stats"][col].mean for col in numeric})
+
+        sketches = {col: TDigest() for col in numeric if numeric_how == "median"}
+        sketches.update({col: MisraGries() for col in with_nulls if col not in numeric})
+        if sketches:
+            for chunk in self.chunks():
+                for col, sketch in sketches.items():
+                    sketch.update(chunk[col])
+            for col, sketch in sketches.items():
+                fills[col] = sketch.quantile(0.5) if isinstance(sketch, TDigest) else sketch.mode()
+
+        for col in with_nulls:
+            if pd.isna(fills[col]):
+                if col in profile["stats"]:
+                    del fills[col]  # all-null numeric column: nothing sensible to fill with
+                else:
+                    fills[col] = "Unknown"
+        return fills
+
+    def fill_nulls(self, output_path: str, strategy: str = "auto", constant: Any = None) -> str:
+        """Streams an imputed copy of the file to `output_path` (.parquet or CSV)."""
+        fills = self.fill_values(strategy, constant)
+        imputer = NullImputer()
+        parquet = os.path.splitext(output_path)[1].lower() in ('.parquet', '.pq')
+        writer, rows = None, 0
+        try:
+            for i, chunk in enumerate(self.chunks()):
+                chunk = imputer.apply(chunk, {col: v for col, v in fills.items() if chunk[col].hasnans})
+                rows += len(chunk)
+                if parquet:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    if writer is None:
+                        table = pa.Table.from_pandas(chunk, preserve_index=False)
+                        writer = pq.ParquetWriter(output_path, table.schema)
+                    else:
+                        table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                    writer.write_table(table)
+                else:
+                    chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        finally:
+            if writer is not None:
+                writer.close()
+        return f"Nulls neutralized in {len(fills)} columns across {rows} rows -> {output_path}"
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materializes the projected/filtered data (only sensible once it fits in memory)."""
+        frames = list(self.chunks())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=self.columns)
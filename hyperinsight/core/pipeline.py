@@ -0,0 +1,149 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.dtypes import replace_in_series
+
+class LazyPlan:
+    """
+    Logical plan of deferred cleaning operations.
+
+    Operations are recorded, not run. On execution the plan is split into
+    stages whose operations already appear in the canonical order
+    replace -> impute -> drop NA -> dedup; each stage is fused into a
+    single pass: chained replacements on a column collapse into one mapping,
+    imputation statistics are taken from the replaced values, and the NA
+    and duplicate filters are combined into one row mask applied with a
+    single take. An operation that goes "backwards" (e.g. an imputation
+    after a clean) starts a new stage, so results always match eager
+    execution.
+    """
+    RANKS = {"replace": 0, "impute": 1, "dropna": 2, "dedup": 3}
+
+    def __init__(self):
+        self.ops: List[Tuple[str, Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def replace(self, column: str, target: Any, replacement: Any) -> 'LazyPlan':
+        self.ops.append(("replace", {"column": column, "target": target, "replacement": replacement}))
+        return self
+
+    def impute(self, strategy: str = "auto", constant: Any = None, group_by: Optional[str] = None,
+               columns: Optional[List[str]] = None) -> 'LazyPlan':
+        self.ops.append(("impute", {"strategy": strategy, "constant": constant, "group_by": group_by, "columns": columns}))
+        return self
+
+    def clean(self, subset: Optional[List[str]] = None) -> 'LazyPlan':
+        self.ops.append(("dropna", {}))
+        self.ops.append(("dedup", {"subset": subset}))
+        return self
+
+    def clear(self):
+        self.ops.clear()
+
+    def stages(self) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        stages, last = [], None
+        for kind, params in self.ops:
+            rank = self.RANKS[kind]
+            # Only replacements stack within a stage; anything else at or below the last rank starts a new one
+            if not stages or rank < last or (rank == last and kind != "replace"):
+                stages.append([])
+            stages[-1].append((kind, params))
+            last = rank
+        return stages
+
+    def describe(self) -> str:
+        parts = []
+        for stage in self.stages():
+            kinds = [kind for kind, _ in stage]
+            replaces = kinds.count("replace")
+            steps = [f"replace({replaces})"] if replaces else []
+            steps += [kind if kind != "impute" else f"impute({params['strategy']})"
+                      for kind, params in stage if kind != "replace"]
+            parts.append(" -> ".join(steps))
+        return " | ".join(parts) or "empty plan"
+
+    def execute(self, df: pd.DataFrame, imputer) -> Tuple[pd.DataFrame, List[str]]:
+        """Runs every stage; returns the result and the columns whose values changed."""
+        changed: List[str] = []
+        for stage in self.stages():
+            df, touched = _run_stage(df, stage, imputer)
+            changed += [col for col in touched if col not in changed]
+        return df, changed
+
+def _is_plain_scalar(value: Any) -> bool:
+    """Hashable, non-null, non-container values can be matched through a dict key."""
+    if isinstance(value, (dict, list, tuple, set, re.Pattern)) or np.ndim(value) != 0:
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return not pd.isna(value)
+
+def _compose_replacements(chain: List[Tuple[Any, Any]]) -> Optional[Dict[Any, Any]]:
+    """
+    Collapses sequential scalar replacements into one simultaneous mapping
+    (a->b then b->c becomes {a: c, b: c}); None if any target is not a plain scalar.
+    """
+    mapping: Dict[Any, Any] = {}
+    for target, replacement in chain:
+        if not _is_plain_scalar(target):
+            return None
+        for key, value in mapping.items():
+            if value == target:
+                mapping[key] = replacement
+        mapping.setdefault(target, replacement)
+    return mapping
+
+def _apply_replacements(series: pd.Series, chain: List[Tuple[Any, Any]]) -> pd.Series:
+    mapping = _compose_replacements(chain)
+    if mapping is None:
+        for target, replacement in chain:
+            series = replace_in_series(series, target, replacement)
+        return series
+    return replace_in_series(series, mapping) if mapping else series
+
+def _run_stage(df: pd.DataFrame, ops: List[Tuple[str, Dict[str, Any]]], imputer) -> Tuple[pd.DataFrame, List[str]]:
+    chains: Dict[str, List[Tuple[Any, Any]]] = {}
+    for kind, params in ops:
+        if kind == "replace":
+            if params["column"] not in df.columns:
+                raise KeyError(f"Column '{params['column']}' not found in data.")
+            chains.setdefault(params["column"], []).append((params["target"], params["replacement"]))
+
+    # Shallow copy: only replaced/imputed columns get new buffers
+    work = df.copy(deep=False) if chains else df
+    for col, chain in chains.items():
+        work[col] = _apply_replacements(df[col], chain)
+    changed = list(chains)
+
+    impute = next((params for kind, params in ops if kind == "impute"), None)
+    if impute is not None:
+        fills = imputer.compute_fill_values(work, **impute)
+        work = imputer.apply(work, fills)
+        changed += [col for col in fills if col not in changed]
+
+    kinds = {kind for kind, _ in ops}
+    keep = None
+    if "dropna" in kinds:
+        keep = np.ones(len(work), dtype=bool)
+        for col in work.columns:
+            series = work[col]
+            if series.hasnans:
+                keep &= series.notna().to_numpy()
+    dedup = next((params for kind, params in ops if kind == "dedup"), None)
+    if dedup is not None:
+        # Duplicates only count among complete rows (with a subset, a row with a null elsewhere could match)
+        complete = work[keep] if keep is not None and dedup["subset"] is not None else work
+        unique = ~complete.duplicated(subset=dedup["subset"]).to_numpy()
+        if complete is not work:
+            expanded = np.zeros(len(work), dtype=bool)
+            expanded[keep] = unique
+            unique = expanded
+        keep = unique if keep is None else keep & unique
+    if keep is not None and not keep.all():
+        work = work[keep]
+    return work, changed
@@ -0,0 +1,431 @@
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Block shape of the fused kernel: small enough that the scratch buffers are
+# reused from the heap (and stay cache-resident) instead of being page-faulted in
+KERNEL_CHUNK_ROWS = 8_192
+KERNEL_CHUNK_COLS = 16
+
+# Outlier tails are retained this many standard deviations inside the sigma
+# bounds, so appends can shift the bounds that far before a rescan is needed
+TAIL_MARGIN = 0.5
+
+class ColumnStats:
+    """
+    Mergeable per-column aggregates: count, sum, sum of squares, min, max,
+    first and last value.
+
+    Sums are accumulated around a `shift` (the first valid value) so that
+    the variance stays numerically stable for columns with a large mean.
+    """
+    __slots__ = ("rows", "count", "sum", "sum_sq", "shift", "min", "max", "first", "last")
+
+    def __init__(self, rows: int = 0, count: int = 0, sum: float = 0.0, sum_sq: float = 0.0, shift: float = 0.0,
+                 min: float = np.nan, max: float = np.nan, first: float = np.nan, last: float = np.nan):
+        self.rows = rows
+        self.count = count
+        self.sum = sum
+        self.sum_sq = sum_sq
+        self.shift = shift
+        self.min = min
+        self.max = max
+        self.first = first
+        self.last = last
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'ColumnStats':
+        """Builds aggregates from a float64 array (NaN = missing) in one pass."""
+        if values.size == 0:
+            return cls()
+        valid = values[~np.isnan(values)]
+        if valid.size == 0:
+            return cls(rows=values.size, first=values[0], last=values[-1])
+        shift = float(valid[0])
+        centered = valid - shift
+        return cls(int(values.size), int(valid.size), float(centered.sum()), float(np.dot(centered, centered)), shift,
+                   float(valid.min()), float(valid.max()), float(values[0]), float(values[-1]))
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> 'ColumnStats':
+        return cls.from_values(series.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    @property
+    def mean(self) -> float:
+        return self.shift + self.sum / self.count if self.count else np.nan
+
+    @property
+    def var(self) -> float:
+        if self.count < 2:
+            return np.nan
+        return max(self.sum_sq - self.sum ** 2 / self.count, 0.0) / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+    def copy(self) -> 'ColumnStats':
+        return ColumnStats(*(getattr(self, name) for name in self.__slots__))
+
+    def merge(self, other: 'ColumnStats') -> 'ColumnStats':
+        """
+        Combines with the aggregates of rows that come *after* these ones
+        (the pairwise form of Welford's update, on shift-centred sums).
+        """
+        if not other.rows:
+            return self
+        if not self.count:
+            self.shift = other.shift
+        delta = other.shift - self.shift
+        # Re-centre the other side's sums on our shift before adding
+        self.sum_sq += other.sum_sq + 2 * delta * other.sum + other.count * delta ** 2
+        self.sum += other.sum + other.count * delta
+        self.count += other.count
+        self.min = float(np.fmin(self.min, other.min))
+        self.max = float(np.fmax(self.max, other.max))
+        if not self.rows:
+            self.first = other.first
+        self.rows += other.rows
+        self.last = other.last
+        return self
+
+    def bounds(self, sigma: float = 3.0) -> Tuple[float, float]:
+        """The mean -/+ `sigma` standard deviations."""
+        return self.mean - sigma*self.std, self.mean + sigma*self.std
+
+    def to_dict(self) -> Dict[str, float]:
+        stats = {name: getattr(self, name) for name in self.__slots__ if name not in ("rows", "shift")}
+        stats.update(mean=self.mean, std=self.std)
+        return stats
+
+class OutlierTails:
+    """
+    The sorted values of one column that lie outside a retention band
+    (low, high). Sigma-rule bounds at or beyond the band are counted exactly
+    from them, and appended rows only need their own extremes merged in.
+    """
+    __slots__ = ("low", "high", "below", "above")
+
+    def __init__(self, low: float, high: float, below: np.ndarray, above: np.ndarray):
+        self.low = low
+        self.high = high
+        self.below = below
+        self.above = above
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, low: float, high: float) -> 'OutlierTails':
+        return cls(low, high, np.sort(values[values < low]), np.sort(values[values > high]))
+
+    def covers(self, low: float, high: float) -> bool:
+        """True if every value outside (low, high) is retained (NaN bounds count nothing)."""
+        return (np.isnan(low) or low <= self.low) and (np.isnan(high) or high >= self.high)
+
+    def count(self, low: float, high: float) -> int:
+        below = 0 if np.isnan(low) else int(np.searchsorted(self.below, low, side="left"))
+        above = 0 if np.isnan(high) else self.above.size - int(np.searchsorted(self.above, high, side="right"))
+        return below + above
+
+    def extend(self, values: np.ndarray) -> 'OutlierTails':
+        """A new set of tails that also covers `values` (this one is left untouched)."""
+        batch = OutlierTails.from_values(values, self.low, self.high)
+        return OutlierTails(self.low, self.high, np.sort(np.concatenate([self.below, batch.below])),
+                            np.sort(np.concatenate([self.above, batch.above])))
+
+    @property
+    def nbytes(self) -> int:
+        return self.below.nbytes + self.above.nbytes
+
+class StatsCache:
+    """
+    Version-aware statistics cache.
+
+    Entries are keyed by the StateManager version that last wrote each
+    column, so a commit only invalidates the columns it touched (or all of
+    them when rows were filtered), and rolling back makes older entries
+    valid again. Each entry holds the column aggregates plus any derived
+    facts (e.g. outlier counts) computed from them.
+    """
+
+    def __init__(self, state_manager, max_entries: int = 4096):
+        self.state_manager = state_manager
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Any, Dict[str, Any]]' = OrderedDict()
+
+    def get(self, df: pd.DataFrame, col: Hashable, name: str = "aggregates",
+            compute: Optional[Callable[[pd.Series], Any]] = None) -> Any:
+        """
+        Returns a cached fact about a column of the current version, computing
+        it with `compute(series)` on a miss. `df` must be the engine's data at
+        the StateManager's current version.
+        """
+        found, missing = self._lookup([col], name)
+        if missing:
+            found = self._store(name, {col: (compute or ColumnStats.from_series)(df[col])})
+        return found[col]
+
+    def aggregates(self, df: pd.DataFrame, columns: Optional[List[Hashable]] = None) -> Dict[Hashable, ColumnStats]:
+        """ColumnStats for every numeric column (or the given ones); misses share one fused kernel pass."""
+        if columns is None:
+            columns = numeric_columns(df)
+        found, missing = self._lookup(columns, "aggregates")
+        if missing:
+            found.update(self._store("aggregates", fused_stats(df, missing)))
+        return {col: found[col] for col in columns}
+
+    def outliers(self, df: pd.DataFrame, sigma: float = 3.0,
+                 columns: Optional[List[Hashable]] = None) -> Dict[Hashable, int]:
+        """
+        Count of values outside mean -/+ sigma*std per numeric column, read
+        off cached outlier tails; a column is rescanned only when its bounds
+        have moved inside the retained band.
+        """
+        aggregates = self.aggregates(df, columns)
+        name = f"outliers_{sigma:g}sigma"
+        bounds = {col: s.bounds(sigma) for col, s in aggregates.items()}
+        found, missing = self._lookup(list(aggregates), name)
+        missing += [col for col, tails in found.items() if not tails.covers(*bounds[col])]
+        if missing:
+            bands = {col: aggregates[col].bounds(max(sigma - TAIL_MARGIN, 0.0)) for col in missing}
+            found.update(self._store(name, outlier_tails(df, bands)))
+        return {col: found[col].count(*bounds[col]) for col in aggregates}
+
+    def entries(self, columns: Sequence[Hashable]) -> Dict[Hashable, Dict[str, Any]]:
+        """Every cached fact about the given columns of the current version."""
+        entries = {}
+        for col in columns:
+            entry = self._entries.get(self._key(col))
+            if entry is not None:
+                entries[col] = dict(entry)
+        return entries
+
+    def extend(self, previous: Dict[Hashable, Dict[str, Any]], rows: pd.DataFrame):
+        """
+        Carries cached facts across an append of `rows` to the current
+        version: aggregates are merged with the batch's and outlier tails
+        absorb its extremes, in O(batch). Other facts are recomputed on demand.
+        """
+        columns = [col for col, entry in previous.items() if "aggregates" in entry]
+        batch = fused_stats(rows, columns)
+        for col in columns:
+            self._store("aggregates", {col: previous[col]["aggregates"].copy().merge(batch[col])})
+            tails = [(name, value) for name, value in previous[col].items() if isinstance(value, OutlierTails)]
+            if tails:
+                values = rows[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                for name, value in tails:
+                    self._store(name, {col: value.extend(values)})
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by cached outlier tails (aggregates and sketches are small and bounded)."""
+        return sum(int(getattr(value, "nbytes", 0)) for entry in self._entries.values() for value in entry.values())
+
+    def _key(self, col: Hashable) -> Tuple[Any, Hashable]:
+        return (self.state_manager.column_source(col), col)
+
+    def _lookup(self, columns: Sequence[Hashable], name: str) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        found, missing = {}, []
+        for col in columns:
+            key = self._key(col)
+            entry = self._entries.get(key)
+            if entry is not None and name in entry:
+                self._entries.move_to_end(key)
+                found[col] = entry[name]
+            else:
+                missing.append(col)
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def _store(self, name: str, values: Dict[Hashable, Any]) -> Dict[Hashable, Any]:
+        for col, value in values.items():
+            key = self._key(col)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {}
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            entry[name] = value
+        return values
+
+    def clear(self):
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries)
+        }
+
+def numeric_columns(df: pd.DataFrame) -> List[Hashable]:
+    """Numeric (non-bool) columns, read off the dtypes without building a sub-frame."""
+    return [col for col, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+
+def _float_sources(df: pd.DataFrame, columns: Sequence[Hashable]) -> List[Any]:
+    """Per-column value arrays: zero-copy NumPy views, or extension arrays converted per block."""
+    sources = []
+    for col in columns:
+        series = df[col]
+        sources.append(series.to_numpy() if isinstance(series.dtype, np.dtype) else series.array)
+    return sources
+
+def _stacked_view(sources: List[Any]) -> Optional[np.ndarray]:
+    """
+    A zero-copy (columns x rows) view when the column arrays are equally
+    spaced rows of one consolidated float64 block (the common case for a
+    numeric frame); None otherwise.
+    """
+    first = sources[0]
+    if not all(isinstance(a, np.ndarray) and a.dtype == np.float64 and a.flags.c_contiguous
+               and a.base is not None and a.base is first.base for a in sources):
+        return None
+    if len(sources) == 1:
+        return first[None, :]
+    addresses = [a.__array_interface__["data"][0] for a in sources]
+    stride = addresses[1] - addresses[0]
+    if stride <= 0 or any(b - a != stride for a, b in zip(addresses, addresses[1:])):
+        return None
+    return np.lib.stride_tricks.as_strided(first, shape=(len(sources), first.size),
+                                           strides=(stride, first.itemsize), writeable=False)
+
+def _block_reader(sources: List[Any]) -> Callable[[np.ndarray, int, int], np.ndarray]:
+    """Returns read(block, start, stop): rows [start, stop) of every column, as a view or copied into `block`."""
+    stacked = _stacked_view(sources)
+    if stacked is not None:
+        return lambda block, start, stop: stacked[:, start:stop]
+
+    def read(block: np.ndarray, start: int, stop: int) -> np.ndarray:
+        view = block[:, :stop - start]
+        for row, source in zip(view, sources):
+            if isinstance(source, np.ndarray):
+                row[:] = source[start:stop]
+            else:
+                row[:] = source[start:stop].to_numpy(dtype=np.float64, na_value=np.nan)
+        return view
+    return read
+
+def _as_float(value: Any) -> float:
+    return np.nan if pd.isna(value) else float(value)
+
+def _column_groups(columns: Sequence[Hashable], chunk_cols: Optional[int]) -> List[List[Hashable]]:
+    width = chunk_cols or max(len(columns), 1)
+    return [list(columns[i:i + width]) for i in range(0, len(columns), width)]
+
+def fused_stats(df: pd.DataFrame, columns: Optional[Sequence[Hashable]] = None,
+                chunk_rows: Optional[int] = KERNEL_CHUNK_ROWS,
+                chunk_cols: Optional[int] = KERNEL_CHUNK_COLS) -> Dict[Hashable, ColumnStats]:
+    """
+    ColumnStats for many numeric columns at once.
+
+    Columns are stacked into a (columns x rows) float64 block and reduced
+    with whole-matrix NumPy operations, `chunk_rows` rows and `chunk_cols`
+    columns at a time (None = everything in one block). The NaN mask is only
+    built for columns whose block sum comes out NaN.
+    """
+    columns = list(numeric_columns(df) if columns is None else columns)
+    rows = len(df)
+    result: Dict[Hashable, ColumnStats] = {}
+    if rows == 0:
+        return {col: ColumnStats() for col in columns}
+    step = min(chunk_rows or rows, rows)
+    for group in _column_groups(columns, chunk_cols):
+        sources = _float_sources(df, group)
+        read = _block_reader(sources)
+        k = len(group)
+        block = np.empty((k, step))
+        count = np.zeros(k, dtype=np.int64)
+        total = np.zeros(k)
+        total_sq = np.zeros(k)
+        low = np.full(k, np.nan)
+        high = np.full(k, np.nan)
+        shift = None
+        for start in range(0, rows, step):
+            raw = read(block, start, min(start + step, rows))
+            width = raw.shape[1]
+            np.fmin(low, np.fmin.reduce(raw, axis=1), out=low)
+            np.fmax(high, np.fmax.reduce(raw, axis=1), out=high)
+            if shift is None:
+                # Centre on the first valid value (or any valid one) to keep the variance stable
+                shift = np.where(np.isnan(raw[:, 0]), low, raw[:, 0])
+                shift = np.where(np.isnan(shift), 0.0, shift)[:, None]
+            # Never writes through to the frame: a view is centred into the scratch block
+            values = np.subtract(raw, shift, out=block[:, :width])
+            sums = values.sum(axis=1)
+            nulls = np.isnan(sums)
+            if nulls.any():
+                rows_with_nulls = np.flatnonzero(nulls)
+                mask = np.isnan(values[rows_with_nulls])
+                values[rows_with_nulls] = np.where(mask, 0.0, values[rows_with_nulls])
+                count[rows_with_nulls] -= mask.sum(axis=1)
+                sums = values.sum(axis=1)
+            count += width
+            total += sums
+            total_sq += np.einsum("ij,ij->i", values, values)
+        for j, (col, source) in enumerate(zip(group, sources)):
+            first, last = _as_float(source[0]), _as_float(source[-1])
+            if count[j]:
+                result[col] = ColumnStats(rows, int(count[j]), float(total[j]), float(total_sq[j]), float(shift[j, 0]),
+                                          float(low[j]), float(high[j]), first, last)
+            else:
+                result[col] = ColumnStats(rows=rows, first=first, last=last)
+    return result
+
+def count_outliers(df: pd.DataFrame, bounds: Dict[Hashable, Tuple[float, float]],
+                   chunk_rows: Optional[int] = KERNEL_CHUNK_ROWS,
+                   chunk_cols: Optional[int] = KERNEL_CHUNK_COLS) -> Dict[Hashable, int]:
+    """Per column, how many values fall strictly outside its (low, high) bounds, in blocked matrix passes."""
+    columns = list(bounds)
+    rows = len(df)
+    result: Dict[Hashable, int] = {}
+    if rows == 0:
+        return dict.fromkeys(columns, 0)
+    step = min(chunk_rows or rows, rows)
+    for group in _column_groups(columns, chunk_cols):
+        read = _block_reader(_float_sources(df, group))
+        block = np.empty((len(group), step))
+        flags = np.empty((len(group), step), dtype=bool)
+        low = np.array([bounds[col][0] for col in group], dtype=np.float64)[:, None]
+        high = np.array([bounds[col][1] for col in group], dtype=np.float64)[:, None]
+        counts = np.zeros(len(group), dtype=np.int64)
+        for start in range(0, rows, step):
+            values = read(block, start, min(start + step, rows))
+            out = flags[:, :values.shape[1]]
+            counts += np.count_nonzero(np.greater(values, high, out=out), axis=1)
+            counts += np.count_nonzero(np.less(values, low, out=out), axis=1)
+        result.update(zip(group, counts.tolist()))
+    return result
+
+def outlier_tails(df: pd.DataFrame, bands: Dict[Hashable, Tuple[float, float]],
+                  chunk_rows: Optional[int] = KERNEL_CHUNK_ROWS,
+                  chunk_cols: Optional[int] = KERNEL_CHUNK_COLS) -> Dict[Hashable, OutlierTails]:
+    """Per column, the values strictly outside its (low, high) band, in blocked matrix passes."""
+    columns = list(bands)
+    rows = len(df)
+    if rows == 0:
+        return {col: OutlierTails.from_values(np.empty(0), *bands[col]) for col in columns}
+    result: Dict[Hashable, OutlierTails] = {}
+    step = min(chunk_rows or rows, rows)
+    for group in _column_groups(columns, chunk_cols):
+        read = _block_reader(_float_sources(df, group))
+        block = np.empty((len(group), step))
+        low = np.array([bands[col][0] for col in group], dtype=np.float64)[:, None]
+        high = np.array([bands[col][1] for col in group], dtype=np.float64)[:, None]
+        below: List[List[np.ndarray]] = [[] for _ in group]
+        above: List[List[np.ndarray]] = [[] for _ in group]
+        for start in range(0, rows, step):
+            values = read(block, start, min(start + step, rows))
+            for j in np.flatnonzero(np.count_nonzero(values < low, axis=1)):
+                below[j].append(values[j][values[j] < low[j, 0]])
+            for j in np.flatnonzero(np.count_nonzero(values > high, axis=1)):
+                above[j].append(values[j][values[j] > high[j, 0]])
+        for j, col in enumerate(group):
+            result[col] = OutlierTails(float(low[j, 0]), float(high[j, 0]),
+                                       np.sort(np.concatenate(below[j])) if below[j] else np.empty(0),
+                                       np.sort(np.concatenate(above[j])) if above[j] else np.empty(0))
+    return result
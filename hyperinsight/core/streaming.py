@@ -0,0 +1,144 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Hashable, Iterable, Iterator, List, Optional
+from .statistics import ColumnStats, numeric_columns
+
+ANOMALY_COLUMNS = ["batch", "index", "column", "value", "score", "low", "high"]
+
+class StreamingAnomalyDetector:
+    """
+    Sigma-rule anomaly monitor over a stream of DataFrame micro-batches.
+
+    State is three float64 arrays per monitored column set: the decayed
+    weight, mean and sum of squared deviations. Each batch is scored against
+    the state as of its start (so a burst of outliers cannot widen its own
+    bounds), then folded in with one vectorized weighted merge. With a
+    `halflife` (in rows) older rows decay exponentially; None keeps
+    cumulative statistics. Batches longer than `max_batch_rows` are split,
+    which bounds the time from a row arriving to its anomaly being emitted.
+    """
+
+    def __init__(self, columns: Optional[List[Hashable]] = None, sigma: float = 3.0,
+                 halflife: Optional[float] = 10_000, warmup: int = 30, max_batch_rows: int = 65_536):
+        self.columns = list(columns) if columns is not None else None
+        self.sigma = sigma
+        self.halflife = halflife
+        self.warmup = warmup
+        self.max_batch_rows = max_batch_rows
+        self.decay = 0.5 ** (1.0 / halflife) if halflife else 1.0
+        self.batches = 0
+        self.rows = 0
+        self.anomalies = 0
+        self.busy_seconds = 0.0
+        self.max_latency = 0.0
+        self._weight = self._mean = self._m2 = None
+        if self.columns is not None:
+            self._reset_state()
+
+    @classmethod
+    def from_stats(cls, aggregates: Dict[Hashable, ColumnStats], **kwargs) -> 'StreamingAnomalyDetector':
+        """Seeds the state with historical aggregates (e.g. `engine.stats.aggregates(engine.data)`)."""
+        detector = cls(columns=list(aggregates), **kwargs)
+        for j, stats in enumerate(aggregates.values()):
+            if stats.count:
+                detector._weight[j] = stats.count
+                detector._mean[j] = stats.mean
+                detector._m2[j] = stats.var * (stats.count - 1) if stats.count > 1 else 0.0
+        return detector
+
+    def _reset_state(self):
+        k = len(self.columns)
+        self._weight = np.zeros(k)
+        self._mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+
+    def bounds(self) -> Dict[Hashable, tuple]:
+        """Current (low, high) per column; NaN until the column has `warmup` weight."""
+        low, high = self._bounds()
+        return {col: (low[j], high[j]) for j, col in enumerate(self.columns or [])}
+
+    def _bounds(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self._m2 / self._weight)
+        warm = self._weight >= self.warmup
+        low = np.where(warm, self._mean - self.sigma * std, np.nan)
+        high = np.where(warm, self._mean + self.sigma * std, np.nan)
+        return low, high
+
+    def update(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Scores one micro-batch, folds it into the state and returns its anomalies."""
+        if self.columns is None:
+            self.columns = numeric_columns(batch)
+            self._reset_state()
+        frames = [self._update(batch.iloc[start:start + self.max_batch_rows])
+                  for start in range(0, max(len(batch), 1), self.max_batch_rows)]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def _update(self, batch: pd.DataFrame) -> pd.DataFrame:
+        start = time.perf_counter()
+        values = batch[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        low, high = self._bounds()
+        with np.errstate(invalid="ignore"):
+            flags = (values < low) | (values > high)
+        rows, cols = np.nonzero(flags)
+        flagged = values[rows, cols]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = (flagged - self._mean[cols]) / np.sqrt(self._m2[cols] / self._weight[cols])
+        found = pd.DataFrame({
+            "batch": self.batches, "index": batch.index[rows], "column": np.asarray(self.columns, dtype=object)[cols],
+            "value": flagged, "score": scores, "low": low[cols], "high": high[cols]
+        }, columns=ANOMALY_COLUMNS)
+        self._fold(values)
+
+        elapsed = time.perf_counter() - start
+        self.batches += 1
+        self.rows += len(batch)
+        self.anomalies += len(found)
+        self.busy_seconds += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+        return found
+
+    def _fold(self, values: np.ndarray):
+        """Weighted (Chan/Welford) merge of a batch into the decayed state."""
+        m = values.shape[0]
+        if not m:
+            return
+        # Row i of the batch is m-1-i rows old by the end of it
+        weights = self.decay ** np.arange(m - 1, -1, -1, dtype=np.float64)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        batch_weight = weights @ valid
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch_mean = np.where(batch_weight > 0, (weights @ filled) / batch_weight, 0.0)
+        centered = np.where(valid, values - batch_mean, 0.0)
+        batch_m2 = weights @ (centered * centered)
+
+        carried = self.decay ** m
+        old_weight = self._weight * carried
+        total = old_weight + batch_weight
+        delta = batch_mean - self._mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = np.where(total > 0, batch_weight / total, 0.0)
+        self._mean = self._mean + delta * share
+        self._m2 = self._m2 * carried + batch_m2 + delta * delta * old_weight * share
+        self._weight = total
+
+    def run(self, batches: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Yields the anomalies of each batch as soon as it has been scored."""
+        for batch in batches:
+            yield self.update(batch)
+
+    async def arun(self, batches: AsyncIterable[pd.DataFrame]) -> AsyncIterator[pd.DataFrame]:
+        async for batch in batches:
+            yield self.update(batch)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "anomalies": self.anomalies,
+            "rows_per_sec": round(self.rows / self.busy_seconds) if self.busy_seconds else 0,
+            "max_batch_latency_ms": round(self.max_latency * 1000, 3),
+            "state_bytes": sum(a.nbytes for a in (self._weight, self._mean, self._m2) if a is not None)
+        }
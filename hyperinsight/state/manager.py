@@ -1,23 +1,113 @@
 import pandas as pd
 import copy
-from typing import Dict, List, Optional, Any
+import shutil
+import tempfile
+import weakref
+from typing import Dict, List, Optional, Any, Hashable
+from .versioning import DeltaStore
+from .spill import require_pyarrow
 
 class StateManager:
     """
     Handles data versioning, checkpoints, and rollbacks.
+
+    History is kept in a copy-on-write `DeltaStore`: each commit stores only
+    the columns that changed (plus a row mask when rows were dropped) and
+    shares every other column block with earlier versions.
+
+    With a `memory_budget` (bytes), the history becomes tiered: once the
+    in-memory versions exceed the budget, the least recently used ones are
+    spilled to Arrow IPC files in `spill_dir` and memory-mapped back on
+    rollback. The current version is always kept hot.
+
+    With `copy=False`, the initial version adopts `initial_df`'s arrays
+    instead of copying them (for read-only frames shared between engines).
     """
-    def __init__(self, initial_df: pd.DataFrame):
-        self._history: List[pd.DataFrame] = [initial_df.copy()]
+    def __init__(self, initial_df: pd.DataFrame, memory_budget: Optional[int] = None, spill_dir: Optional[str] = None,
+                 copy: bool = True):
+        self._history = DeltaStore()
+        self._history.snapshot(initial_df, "Initial state", copy=copy)
         self._checkpoints: Dict[str, int] = {"initial": 0}
         self._current_index = 0
         self._rollback_allowed = True
+        self._memory_budget = None
+        self._spill_dir = spill_dir
+        self._access_clock = 0
+        self._last_access: Dict[int, int] = {}
+        self.set_memory_budget(memory_budget)
+        self._touch(0)
 
-    def commit(self, df: pd.DataFrame, message: str = "Update"):
-        """Saves a new state of the data."""
-        self._history = self._history[:self._current_index + 1]
-        self._history.append(df.copy())
+    def commit(self, df: pd.DataFrame, message: str = "Update", changed: Optional[List[Hashable]] = None):
+        """
+        Saves a new state of the data.
+
+        `changed` optionally lists the only columns whose values may differ
+        from the current version, letting the store skip equality scans.
+        """
+        self._history.truncate(self._current_index + 1)
+        self._history.append(df, self._current_index, message, changed=changed)
         self._current_index += 1
         print(f"State Committed: {message} (Version {self._current_index})")
+        self._touch(self._current_index)
+
+    def append(self, rows: pd.DataFrame, message: str = "Append"):
+        """
+        Saves a new state that adds `rows` after the current data. Only the
+        new rows are stored; they must match the current columns and dtypes.
+        """
+        self._history.truncate(self._current_index + 1)
+        self._history.extend(rows, self._current_index, message)
+        self._current_index += 1
+        print(f"State Committed: {message} (Version {self._current_index})")
+        self._touch(self._current_index)
+
+    def rebase(self, df: pd.DataFrame):
+        """Replaces the initial version with `df` (only allowed before any commit)."""
+        if self._current_index != 0:
+            raise RuntimeError("Cannot rebase a history that already has commits.")
+        self._history.replace(0, df, "Initial state")
+
+    @property
+    def current_version(self) -> int:
+        return self._current_index
+
+    @property
+    def version_id(self) -> int:
+        """Process-unique identity of the current version; unlike the index it is never reused."""
+        return self._history[self._current_index].uid
+
+    @property
+    def stored_bytes(self) -> int:
+        """Bytes held by the history's deltas (in memory or spilled)."""
+        return self._history.stored_bytes()
+
+    @property
+    def hot_bytes(self) -> int:
+        """Bytes of history currently held in process memory."""
+        return self._history.hot_bytes()
+
+    @property
+    def memory_budget(self) -> Optional[int]:
+        return self._memory_budget
+
+    def set_memory_budget(self, budget: Optional[int]) -> int:
+        """
+        Changes the in-memory history budget and enforces it right away,
+        spilling least recently used versions. Returns the bytes spilled.
+        """
+        if budget is not None:
+            require_pyarrow()
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="hyperinsight-history-")
+                weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        before = self._history.hot_bytes()
+        self._memory_budget = budget
+        self._enforce_budget()
+        return before - self._history.hot_bytes()
+
+    def column_source(self, col: Hashable) -> int:
+        """Identifier of the last write to `col` as of the current version (stable across unrelated commits)."""
+        return self._history.column_source(self._current_index, col)
 
     def create_checkpoint(self, name: str):
         """Creates a named pointer to the current state."""
@@ -28,7 +118,7 @@ class StateManager:
         """Rolls back the data to a previous state or checkpoint."""
         if not self._rollback_allowed:
             raise PermissionError("Rollback is currently disabled by administrative policy.")
-        
+
         if to:
             if to in self._checkpoints:
                 self._current_index = self._checkpoints[to]
@@ -41,18 +131,61 @@ class StateManager:
                 print(f"Rolled back one step to Version {self._current_index}")
             else:
                 print("Already at initial state. Cannot rollback further.")
-        
-        return self._history[self._current_index].copy()
+
+        self._touch(self._current_index)
+        return self._history.materialize(self._current_index)
 
     def set_lock(self, locked: bool):
         self._rollback_allowed = not locked
         status = "LOCKED" if locked else "UNLOCKED"
         print(f"Data Rollback system is now {status}")
 
+    def _touch(self, version: int):
+        """Marks a version as recently used and enforces the memory budget."""
+        self._access_clock += 1
+        self._last_access[version] = self._access_clock
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        if self._memory_budget is None:
+            return
+        hot = self._history.hot_bytes()
+        if hot <= self._memory_budget:
+            return
+        # Least recently used first; the current version never leaves memory
+        candidates = sorted(
+            (v for v in range(len(self._history))
+             if v != self._current_index and not self._history[v].spilled and self._history[v].nbytes),
+            key=lambda v: self._last_access.get(v, 0)
+        )
+        for version in candidates:
+            try:
+                hot -= self._history.spill(version, self._spill_dir)
+            except Exception as e:
+                print(f"History spill skipped for Version {version}: {e}")
+            if hot <= self._memory_budget:
+                break
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Compares history storage against a full copy per version."""
+        full_copy = self._history.logical_bytes()
+        stored = self._history.stored_bytes()
+        return {
+            "full_copy_bytes": full_copy,
+            "stored_bytes": stored,
+            "saved_bytes": full_copy - stored,
+            "compression_ratio": round(full_copy / stored, 2) if stored else 1.0,
+            "hot_bytes": self._history.hot_bytes(),
+            "spilled_bytes": self._history.disk_bytes(),
+            "spilled_versions": sum(1 for v in range(len(self._history)) if self._history[v].spilled),
+            "memory_budget": self._memory_budget
+        }
+
     def get_status(self) -> Dict[str, Any]:
         return {
             "current_version": self._current_index,
             "total_history": len(self._history),
             "checkpoints": list(self._checkpoints.keys()),
-            "rollback_allowed": self._rollback_allowed
+            "rollback_allowed": self._rollback_allowed,
+            "memory": self.get_memory_usage()
         }
@@ -0,0 +1,109 @@
+import os
+import numpy as np
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+_ROWS_FIELD = "__row_positions__"
+
+def require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("History spilling requires pyarrow: pip install pyarrow") from e
+    return pa
+
+class SpilledColumns:
+    """
+    Read-only column mapping backed by an Arrow IPC file on local disk.
+
+    The file is memory-mapped lazily on first access. Fixed-width numeric
+    columns are returned as zero-copy views over the mapping; other dtypes
+    are converted column by column, so only what a rollback touches is ever
+    pulled into Python objects.
+    """
+
+    def __init__(self, path: str, keys: List[Hashable], dtypes: Dict[Hashable, Any], has_rows: bool, nbytes: int):
+        self.path = path
+        self._names = {key: f"c{i}" for i, key in enumerate(keys)}
+        self._dtypes = dtypes
+        self._has_rows = has_rows
+        self._table = None
+        self.disk_bytes = nbytes
+
+    def _mapped(self):
+        if self._table is None:
+            pa = require_pyarrow()
+            self._table = pa.ipc.open_file(pa.memory_map(self.path, "r")).read_all()
+        return self._table
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._names
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def keys(self):
+        return self._names.keys()
+
+    def values(self):
+        return (self[key] for key in self._names)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return _to_values(self._mapped().column(self._names[key]), self._dtypes[key])
+
+    @property
+    def row_positions(self) -> Optional[np.ndarray]:
+        if not self._has_rows:
+            return None
+        return _to_values(self._mapped().column(_ROWS_FIELD), np.dtype(np.intp))
+
+    def release(self):
+        """Drops the mapping and deletes the backing file."""
+        self._table = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _to_values(chunked, dtype: Any) -> Any:
+    if isinstance(dtype, np.dtype):
+        if chunked.num_chunks == 1 and chunked.null_count == 0:
+            try:
+                values = chunked.chunk(0).to_numpy(zero_copy_only=True)
+                if values.dtype == dtype:
+                    return values
+            except Exception:
+                pass
+        if dtype.kind != "O":
+            return chunked.to_numpy().astype(dtype, copy=False)
+    series = chunked.to_pandas()
+    if series.dtype != dtype:
+        series = series.astype(dtype)
+    return series.to_numpy() if isinstance(dtype, np.dtype) else series.array
+
+def write_columns(path: str, columns: Dict[Hashable, Any], row_positions: Optional[np.ndarray] = None) -> SpilledColumns:
+    """
+    Persists a version's stored columns (and row mask) as one Arrow IPC file.
+    Raises pyarrow's conversion errors for columns Arrow cannot represent.
+    """
+    pa = require_pyarrow()
+    keys = list(columns)
+    arrays, names = [], []
+    for i, key in enumerate(keys):
+        values = columns[key]
+        if isinstance(values, np.ndarray) and values.dtype.kind != "O":
+            arrays.append(pa.array(values))
+        else:
+            arrays.append(pa.array(values, from_pandas=True))
+        names.append(f"c{i}")
+    if row_positions is not None:
+        arrays.append(pa.array(row_positions.astype(np.int64, copy=False)))
+        names.append(_ROWS_FIELD)
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    dtypes = {key: columns[key].dtype for key in keys}
+    return SpilledColumns(path, keys, dtypes, row_positions is not None, os.path.getsize(path))
@@ -0,0 +1,305 @@
+import itertools
+import os
+import uuid
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from .spill import SpilledColumns, write_columns
+
+_VERSION_IDS = itertools.count()
+
+class ColumnVersion:
+    """
+    A single entry in the version history.
+
+    Only the columns that changed relative to the parent version are stored.
+    Unchanged column blocks are resolved through the parent chain, and row
+    filters (dropna, dedup) are recorded as a position array instead of a
+    full copy of the surviving rows. An append version (`tail` set) stores
+    only the rows it added, for every column, after the parent's rows.
+    A `shared` base version references a read-only frame's arrays instead
+    of copying them, so it holds (and reports) no bytes of its own.
+    """
+    __slots__ = ("uid", "parent", "order", "index", "tail", "columns", "_row_positions", "message",
+                 "logical_bytes", "nbytes", "shared")
+
+    def __init__(self, parent: Optional[int], order: pd.Index, columns: Dict[Hashable, Any],
+                 row_positions: Optional[np.ndarray] = None, index: Optional[pd.Index] = None,
+                 message: str = "", logical_bytes: int = 0, tail: Optional[pd.Index] = None,
+                 shared: bool = False):
+        # Process-unique id: history positions get reused after rollback + commit
+        self.uid = next(_VERSION_IDS)
+        self.parent = parent
+        self.order = order
+        self.index = index
+        self.tail = tail
+        self.columns = columns
+        self._row_positions = row_positions
+        self.message = message
+        self.logical_bytes = logical_bytes
+        self.shared = shared
+        if shared:
+            # The arrays belong to the frame the version was adopted from
+            self.nbytes = 0
+            return
+        self.nbytes = sum(_array_nbytes(values) for values in columns.values())
+        if row_positions is not None:
+            self.nbytes += row_positions.nbytes
+        if index is not None and parent is None:
+            self.nbytes += index.memory_usage()
+        if tail is not None:
+            self.nbytes += tail.memory_usage()
+
+    @property
+    def is_base(self) -> bool:
+        return self.parent is None
+
+    @property
+    def row_positions(self) -> Optional[np.ndarray]:
+        if self.spilled:
+            return self.columns.row_positions
+        return self._row_positions
+
+    @property
+    def filters_rows(self) -> bool:
+        """True if this version selects a subset of its parent's rows."""
+        if self.spilled:
+            return self.columns._has_rows
+        return self._row_positions is not None
+
+    @property
+    def spilled(self) -> bool:
+        return isinstance(self.columns, SpilledColumns)
+
+    @property
+    def hot_bytes(self) -> int:
+        """Bytes this version currently holds in process memory."""
+        if self.spilled:
+            labels = self.index if self.index is not None else self.tail
+            return labels.memory_usage() if labels is not None else 0
+        return self.nbytes
+
+
+def column_values(series: pd.Series) -> Any:
+    """Returns the backing array of a column (ndarray or ExtensionArray)."""
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    return series.array
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Shallow byte size of a frame, i.e. what a full `df.copy()` allocates."""
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def _array_nbytes(values: Any) -> int:
+    return int(getattr(values, "nbytes", 0))
+
+
+def _concat(parts: List[Any]) -> Any:
+    """Concatenates row blocks of one column (ndarrays, extension arrays or indexes)."""
+    first = parts[0]
+    if isinstance(first, pd.Index):
+        return first.append(parts[1:])
+    if isinstance(first, np.ndarray):
+        return np.concatenate(parts)
+    return type(first)._concat_same_type(parts)
+
+
+def _same_values(left: Any, right: Any) -> bool:
+    if left is right:
+        return True
+    if len(left) != len(right) or left.dtype != right.dtype:
+        return False
+    return pd.Series(left, copy=False).equals(pd.Series(right, copy=False))
+
+
+class DeltaStore:
+    """
+    Copy-on-write column store backing the StateManager history.
+
+    Versions are appended as deltas against their parent. Reading a version
+    walks the parent chain per column, composing row filters along the way,
+    so a rebuild costs one `take` per column regardless of chain length.
+    """
+
+    def __init__(self):
+        self.versions: List[ColumnVersion] = []
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def __getitem__(self, version: int) -> ColumnVersion:
+        return self.versions[version]
+
+    def truncate(self, length: int):
+        """Drops every version at position `length` and beyond."""
+        for version in self.versions[length:]:
+            self._release(version)
+        del self.versions[length:]
+
+    def snapshot(self, df: pd.DataFrame, message: str = "", copy: bool = True) -> ColumnVersion:
+        """
+        Appends a self-contained base version holding private copies of every
+        column. With `copy=False` it adopts `df`'s arrays as they are (a
+        `shared` version); the caller guarantees they are never written to.
+        """
+        if not copy:
+            columns = {col: column_values(df[col]) for col in df.columns}
+            version = ColumnVersion(None, df.columns, columns, index=df.index, message=message,
+                                    logical_bytes=frame_nbytes(df), shared=True)
+            self.versions.append(version)
+            return version
+        columns = {col: column_values(df[col]).copy() for col in df.columns}
+        version = ColumnVersion(None, df.columns, columns, index=df.index.copy(),
+                                message=message, logical_bytes=frame_nbytes(df))
+        self.versions.append(version)
+        return version
+
+    def replace(self, version: int, df: pd.DataFrame, message: str = ""):
+        """Overwrites a version in place with a fresh snapshot of `df`."""
+        self.snapshot(df, message)
+        self._release(self.versions[version])
+        self.versions[version] = self.versions.pop()
+
+    def append(self, df: pd.DataFrame, parent: int, message: str = "",
+               changed: Optional[List[Hashable]] = None) -> ColumnVersion:
+        """
+        Appends `df` as a delta against version `parent`.
+
+        If `changed` is given, the caller guarantees that every other column
+        holds the same values as the parent (after any row filter) and the
+        equality scan is skipped for them.
+        """
+        if not df.columns.is_unique or not df.index.is_unique:
+            return self.snapshot(df, message)
+
+        parent_index = self.index(parent)
+        row_positions = None
+        if not df.index.equals(parent_index):
+            if not parent_index.is_unique:
+                return self.snapshot(df, message)
+            positions = parent_index.get_indexer(df.index)
+            if (positions < 0).any():
+                return self.snapshot(df, message)
+            row_positions = positions.astype(np.intp, copy=False)
+
+        parent_order = set(self.versions[parent].order)
+        candidates = set(changed) if changed is not None else None
+        columns = {}
+        for col in df.columns:
+            new_values = column_values(df[col])
+            if col in parent_order and (candidates is None or col in candidates):
+                if _same_values(new_values, self.column(parent, col, row_positions)):
+                    continue
+            elif col in parent_order:
+                continue
+            columns[col] = new_values.copy()
+
+        version = ColumnVersion(parent, df.columns, columns, row_positions=row_positions,
+                                message=message, logical_bytes=frame_nbytes(df))
+        self.versions.append(version)
+        return version
+
+    def extend(self, rows: pd.DataFrame, parent: int, message: str = "") -> ColumnVersion:
+        """
+        Appends an append-only version: the rows of version `parent` followed
+        by `rows`. Only `rows` is stored. The caller guarantees that `rows`
+        has the parent's columns (in order) and dtypes, and new index labels.
+        """
+        columns = {col: column_values(rows[col]).copy() for col in rows.columns}
+        version = ColumnVersion(parent, self.versions[parent].order, columns, message=message,
+                                logical_bytes=self.versions[parent].logical_bytes + frame_nbytes(rows),
+                                tail=rows.index.copy())
+        self.versions.append(version)
+        return version
+
+    def index(self, version: int) -> pd.Index:
+        """Resolves the row index of a version."""
+        return self._resolve(version, None, lambda node: node.index, lambda node: node.tail)
+
+    def column(self, version: int, col: Hashable, row_positions: Optional[np.ndarray] = None) -> Any:
+        """Resolves a single column of a version, optionally sub-selecting rows."""
+        return self._resolve(version, row_positions, lambda node: node.columns[col] if col in node.columns else None,
+                             lambda node: node.columns[col])
+
+    def _resolve(self, version: int, positions: Optional[np.ndarray], stored: Callable[[ColumnVersion], Any],
+                 tail: Callable[[ColumnVersion], Any]) -> Any:
+        """
+        Walks the parent chain until `stored(node)` yields values, composing
+        row filters on the way and collecting the rows added by append versions.
+        """
+        tails = []
+        while True:
+            node = self.versions[version]
+            if node.tail is not None:
+                if positions is not None:
+                    # Rows were filtered after this append: resolve it in full, then select
+                    values = self._resolve(version, None, stored, tail).take(positions)
+                    positions = None
+                    break
+                tails.append(tail(node))
+                version = node.parent
+                continue
+            values = stored(node)
+            if values is not None:
+                break
+            positions = self._compose(node.row_positions, positions)
+            version = node.parent
+        if positions is not None:
+            values = values.take(positions)
+        return _concat([values] + tails[::-1]) if tails else values
+
+    def column_source(self, version: int, col: Hashable) -> int:
+        """
+        Uid of the version that last wrote `col` as seen by `version`: the
+        nearest ancestor that stored the column or filtered rows. Two versions
+        with the same source hold identical values for that column.
+        """
+        node = self.versions[version]
+        while col not in node.columns and not node.filters_rows and node.parent is not None:
+            node = self.versions[node.parent]
+        return node.uid
+
+    def materialize(self, version: int) -> pd.DataFrame:
+        """Rebuilds a version as a standalone DataFrame (one allocation per column)."""
+        node = self.versions[version]
+        data = {col: self.column(version, col) for col in node.order}
+        return pd.DataFrame(data, index=self.index(version), columns=node.order)
+
+    def spill(self, version: int, directory: str) -> int:
+        """
+        Moves a version's stored columns to an Arrow IPC file under `directory`.
+        Returns the number of process-memory bytes released.
+        """
+        node = self.versions[version]
+        if node.spilled or node.nbytes == 0:
+            return 0
+        released = node.hot_bytes
+        path = os.path.join(directory, f"version-{uuid.uuid4().hex}.arrow")
+        node.columns = write_columns(path, node.columns, node._row_positions)
+        node._row_positions = None
+        return released - node.hot_bytes
+
+    def stored_bytes(self) -> int:
+        return sum(v.nbytes for v in self.versions)
+
+    def hot_bytes(self) -> int:
+        return sum(v.hot_bytes for v in self.versions)
+
+    def disk_bytes(self) -> int:
+        return sum(v.columns.disk_bytes for v in self.versions if v.spilled)
+
+    def logical_bytes(self) -> int:
+        return sum(v.logical_bytes for v in self.versions)
+
+    @staticmethod
+    def _release(version: ColumnVersion):
+        if version.spilled:
+            version.columns.release()
+
+    @staticmethod
+    def _compose(outer: Optional[np.ndarray], inner: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if outer is None:
+            return inner
+        return outer if inner is None else outer[inner]
@@ -0,0 +1,13 @@
+import importlib
+from typing import Any
+
+def __getattr__(name: str) -> Any:
+    # Submodules load on first access (hyperinsight.utils.<module>) without importing their siblings
+    try:
+        module = importlib.import_module(f".{name}", __name__)
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = module
+    return module
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .memory import compact_series, format_size
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class DtypeReport:
+    """
+    Per-column outcome of `optimize_dtypes`: the original and optimized
+    dtypes and deep byte sizes. Keeps what `restore_dtypes` needs to undo it.
+    """
+
+    def __init__(self, columns: Dict[Hashable, Dict[str, Any]]):
+        self.columns = columns
+
+    @property
+    def changed(self) -> Dict[Hashable, Dict[str, Any]]:
+        return {col: entry for col, entry in self.columns.items() if entry["original"] != entry["optimized"]}
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(entry["bytes_before"] for entry in self.columns.values())
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(entry["bytes_after"] for entry in self.columns.values())
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def then(self, later: 'DtypeReport') -> 'DtypeReport':
+        """A report of this optimization followed by `later`, reverting to this one's original dtypes."""
+        columns = {}
+        for col, entry in later.columns.items():
+            entry = dict(entry)
+            if col in self.columns:
+                entry["original"] = self.columns[col]["original"]
+                entry["bytes_before"] = self.columns[col]["bytes_before"]
+                entry["saved_bytes"] = entry["bytes_before"] - entry["bytes_after"]
+            columns[col] = entry
+        return DtypeReport(columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per column: original, optimized, bytes_before, bytes_after, saved_bytes."""
+        rows = {col: {**entry, "original": str(entry["original"]), "optimized": str(entry["optimized"])}
+                for col, entry in self.columns.items()}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def summary(self) -> Dict[str, Any]:
+        before = self.bytes_before
+        return {
+            "columns_changed": len(self.changed),
+            "bytes_before": before,
+            "bytes_after": self.bytes_after,
+            "saved_bytes": self.saved_bytes,
+            "saved_ratio": round(self.saved_bytes / before, 4) if before else 0.0
+        }
+
+    def __repr__(self):
+        summary = self.summary()
+        return (f"<DtypeReport {summary['columns_changed']} columns compacted, "
+                f"{format_size(summary['bytes_before'])} -> {format_size(summary['bytes_after'])} "
+                f"({summary['saved_ratio']:.0%} saved)>")
+
+def optimize_dtypes(df: pd.DataFrame, categorical_ratio: float = 0.5,
+                    arrow_strings: bool = False, numeric: bool = True) -> Tuple[pd.DataFrame, DtypeReport]:
+    """
+    Rewrites each column in the narrowest dtype that holds the same values
+    (see `compact_series`): downcast integers, float32 where exact, and
+    categoricals for text with at most `categorical_ratio` distinct values
+    per row. With `numeric=False` numbers keep their dtypes, so arithmetic
+    on them cannot overflow or lose precision. With `arrow_strings`, the
+    remaining text columns are stored as Arrow-backed strings (requires
+    pyarrow). Only changed columns are reallocated; returns the new frame
+    and its DtypeReport.
+    """
+    arrow = arrow_strings and _has_pyarrow()
+    optimized = df.copy(deep=False)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        before = int(series.memory_usage(index=False, deep=True))
+        compact = compact_series(series, categorical_ratio, numeric)
+        if compact is None and arrow:
+            compact = _arrow_strings(series)
+        if compact is not None:
+            optimized[col] = compact
+        after = int(compact.memory_usage(index=False, deep=True)) if compact is not None else before
+        columns[col] = {"original": series.dtype, "optimized": optimized[col].dtype,
+                        "bytes_before": before, "bytes_after": after, "saved_bytes": before - after}
+    return optimized, DtypeReport(columns)
+
+def restore_dtypes(df: pd.DataFrame, report: DtypeReport) -> pd.DataFrame:
+    """Casts the columns `report` changed back to their original dtypes (columns since dropped are skipped)."""
+    restored = df.copy(deep=False)
+    for col, entry in report.changed.items():
+        if col in restored.columns and restored[col].dtype != entry["original"]:
+            restored[col] = restored[col].astype(entry["original"])
+    return restored
+
+def _arrow_strings(series: pd.Series) -> Optional[pd.Series]:
+    dtype = pd.StringDtype("pyarrow", na_value=np.nan)
+    if series.dtype == dtype:
+        return None
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return None
+    if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+        return None
+    compact = series.astype(dtype)
+    if compact.memory_usage(index=False, deep=True) >= series.memory_usage(index=False, deep=True):
+        return None
+    return compact
+
+def widen_for(series: pd.Series, values: Any) -> pd.Series:
+    """
+    `series` in a dtype that stores `values` exactly, for writes into a
+    compacted column: float32 goes back to float64 when a value would round,
+    and narrow integers widen to int64 when a value falls outside their range.
+    """
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf" or dtype.itemsize == 8:
+        return series
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    elif not pd.api.types.is_list_like(values):
+        values = [values]
+    try:
+        values = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Non-numeric values: pandas upcasts to object itself
+        return series
+    values = values[~np.isnan(values)]
+    if dtype.kind == "f":
+        fits = np.array_equal(values.astype(dtype).astype(np.float64), values)
+        return series if fits else series.astype(np.float64)
+    info = np.iinfo(dtype)
+    integral = values[values == np.round(values)]
+    fits = not len(integral) or (integral.min() >= info.min and integral.max() <= info.max)
+    return series if fits else series.astype(np.uint64 if dtype.kind == "u" and integral.min() >= 0 else np.int64)
+
+def replace_in_series(series: pd.Series, target: Any, replacement: Any = None) -> pd.Series:
+    """
+    `Series.replace` (a dict `target` is a mapping and `replacement` is
+    ignored) that also accepts new values on categoricals: missing
+    replacement values are added as categories and categories left without
+    rows are dropped. Compacted numeric columns are widened first when a
+    replacement would not fit exactly (see `widen_for`).
+    """
+    mapping = isinstance(target, dict)
+    if mapping:
+        values = list(target.values())
+    else:
+        values = replacement if pd.api.types.is_list_like(replacement) else [replacement]
+    series = widen_for(series, values)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        new = [value for value in dict.fromkeys(values)
+               if not pd.isna(value) and value not in series.cat.categories]
+        if new:
+            series = series.cat.add_categories(new)
+    replaced = series.replace(target) if mapping else series.replace(target, replacement)
+    if isinstance(replaced.dtype, pd.CategoricalDtype):
+        replaced = replaced.cat.remove_unused_categories()
+    return replaced
+
+def conform_dtypes(rows: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """
+    Casts incoming rows to a frame's (compacted) dtypes where that loses
+    nothing: integers within range, floats that round-trip, and values
+    already among a categorical's categories. Other columns are left as is.
+    """
+    conformed = None
+    for col, dtype in dtypes.items():
+        if col not in rows.columns or rows[col].dtype == dtype:
+            continue
+        series = rows[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            fits = series.dropna().isin(dtype.categories).all()
+        elif isinstance(dtype, np.dtype) and dtype.kind in "iu" and pd.api.types.is_integer_dtype(series.dtype):
+            info = np.iinfo(dtype)
+            fits = series.empty or (series.min() >= info.min and series.max() <= info.max)
+        elif isinstance(dtype, np.dtype) and dtype == np.float32 and pd.api.types.is_float_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64)
+            fits = np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+        else:
+            fits = False
+        if fits:
+            if conformed is None:
+                conformed = rows.copy(deep=False)
+            conformed[col] = series.astype(dtype)
+    return rows if conformed is None else conformed
@@ -0,0 +1,60 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Optional, Union
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+def parse_size(value: Optional[Union[str, int, float]]) -> Optional[int]:
+    """
+    Converts a human-readable size such as "512MB" or "8GB" into bytes.
+    Integers are taken as byte counts; None passes through.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?B?)\s*', value.upper())
+    if not match:
+        raise ValueError(f"Unrecognized memory size: {value!r}")
+    number, unit = match.groups()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(number) * _UNITS[unit])
+
+def format_size(num_bytes: int) -> str:
+    """Renders a byte count with the largest fitting binary unit."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f}{unit}" if unit != "B" else f"{num_bytes}B"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}TB"
+
+def compact_series(series: pd.Series, categorical_ratio: float = 0.5, numeric: bool = True) -> Optional[pd.Series]:
+    """
+    Lossless smaller representation of a column, or None if there is none:
+    integers shrink to the narrowest type holding their range, floats to
+    float32 when every value round-trips exactly, and object/string columns
+    with at most `categorical_ratio` distinct values per row become categorical.
+    With `numeric=False`, only text columns are considered.
+    """
+    dtype = series.dtype
+    if not numeric and isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return None
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        compact = pd.to_numeric(series, downcast="unsigned" if dtype.kind == "u" else "integer")
+    elif isinstance(dtype, np.dtype) and dtype == np.float64:
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        if not np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            return None
+        compact = pd.Series(narrow, index=series.index, name=series.name, copy=False)
+    elif dtype == object or pd.api.types.is_string_dtype(dtype):
+        if len(series) == 0 or series.nunique(dropna=False) > categorical_ratio * len(series):
+            return None
+        compact = series.astype("category")
+    else:
+        return None
+    if compact.dtype == dtype or compact.memory_usage(index=False, deep=True) >= series.memory_usage(index=False, deep=True):
+        return None
+    return compact
@@ -0,0 +1,259 @@
+"""
+Mergeable streaming sketches for approximate statistics.
+
+Every sketch supports `update(values)` with a whole chunk (vectorized) and
+`merge(other)`, so sketches can be built per chunk or per worker and
+combined. Each one reports its own error bound.
+"""
+import math
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+def iter_chunks(series: pd.Series, chunk_rows: int) -> Iterator[pd.Series]:
+    """Yields consecutive row slices of a column (views, no copies)."""
+    for start in range(0, len(series), max(1, chunk_rows)):
+        yield series.iloc[start:start + chunk_rows]
+
+class MisraGries:
+    """
+    Heavy-hitter / mode sketch with at most `k` counters.
+
+    Counts are underestimates by at most `error_bound`, i.e.
+    (n - sum(counters)) / (k + 1); any value occurring more than n / (k + 1)
+    times is guaranteed to be tracked.
+
+    With `sample_rows`, an update larger than that counts only a uniform
+    sample of `sample_rows` rows (drawn with replacement) and scales the
+    counts up, so hashing work per chunk is bounded. `error_bound` then adds
+    three standard deviations of the sampling error (n_chunk^2 / 4m summed
+    over updates), and counts may also overestimate within it; `n` is then
+    estimated from the samples too.
+    """
+
+    def __init__(self, k: int = 256, sample_rows: Optional[int] = None, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.sample_rows = sample_rows
+        # Total (scaled) count absorbed into the counters, and the variance sampling added to it
+        self.weight = 0
+        self.sample_variance = 0.0
+        self._rng = np.random.default_rng(seed)
+        self.counters = pd.Series(dtype="int64")
+
+    def update(self, values: pd.Series) -> 'MisraGries':
+        if self.sample_rows and len(values) > self.sample_rows:
+            sample = values.iloc[self._rng.integers(0, len(values), self.sample_rows)]
+            scale = len(values) / self.sample_rows
+            counts = (sample.value_counts(dropna=True, sort=False) * scale).round()
+            # An exact non-null count would itself scan every row (slow on object columns)
+            self.n += int(round(sample.count() * scale))
+            self.sample_variance += len(values) ** 2 / (4 * self.sample_rows)
+        else:
+            counts = values.value_counts(dropna=True, sort=False)
+            self.n += int(counts.sum())
+        counts = counts[counts > 0].astype("int64")
+        self.weight += int(counts.sum())
+        self._absorb(counts)
+        return self
+
+    def merge(self, other: 'MisraGries') -> 'MisraGries':
+        self.n += other.n
+        self.weight += other.weight
+        self.sample_variance += other.sample_variance
+        self._absorb(other.counters)
+        return self
+
+    def _absorb(self, counts: pd.Series):
+        combined = self.counters.add(counts, fill_value=0) if len(self.counters) else counts
+        if len(combined) > self.k:
+            # Subtract the (k+1)-th largest count and keep what stays positive
+            ordered = combined.sort_values(ascending=False, kind="stable")
+            combined = ordered.iloc[:self.k] - ordered.iloc[self.k]
+            combined = combined[combined > 0]
+        self.counters = combined.astype("int64")
+
+    @property
+    def error_bound(self) -> float:
+        return (self.weight - int(self.counters.sum())) / (self.k + 1) + 3 * math.sqrt(self.sample_variance)
+
+    def mode(self) -> Any:
+        return self.counters.idxmax() if len(self.counters) else np.nan
+
+    def heavy_hitters(self, top: int = 10) -> Dict[Any, int]:
+        return self.counters.nlargest(top).to_dict()
+
+class TDigest:
+    """
+    Merging t-digest for quantiles.
+
+    Centroids are bucketed along the k1 scale function in one vectorized
+    pass, so compression cost is a sort, not a per-point loop. The rank
+    error of a quantile estimate is bounded by the weight of the centroid it
+    falls in (`rank_error`).
+    """
+
+    def __init__(self, compression: float = 200.0):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def n(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: Any) -> 'TDigest':
+        values = np.asarray(pd.Series(values).dropna(), dtype=np.float64)
+        if values.size:
+            # Compress the sorted chunk on its own first, then fold in the (small) centroid set
+            chunk = TDigest(self.compression)
+            chunk._compress(np.sort(values), np.ones(values.size), presorted=True)
+            chunk.min, chunk.max = values.min(), values.max()
+            self.merge(chunk)
+        return self
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        if other.weights.size and not self.weights.size:
+            self.means, self.weights = other.means.copy(), other.weights.copy()
+            self.min, self.max = other.min, other.max
+        elif other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray, presorted: bool = False):
+        if not presorted:
+            order = np.argsort(means, kind="mergesort")
+            means, weights = means[order], weights[order]
+        total = weights.sum()
+        # Quantile at each centroid's left edge, mapped onto the k1 scale
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        buckets = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q: float) -> float:
+        if not self.weights.size:
+            return np.nan
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.n
+        return float(np.interp(q, np.r_[0.0, centers, 1.0], np.r_[self.min, self.means, self.max]))
+
+    def rank_error(self, q: float) -> float:
+        """Upper bound on |true rank - q| for `quantile(q)`, as a fraction of n."""
+        if not self.weights.size:
+            return 0.0
+        edges = np.cumsum(self.weights) / self.n
+        i = min(int(np.searchsorted(edges, q)), self.weights.size - 1)
+        return float(self.weights[i] / self.n)
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length() for uint64 arrays."""
+    values = values.copy()
+    length = np.zeros(values.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        length += high * shift
+        values = np.where(high, values >> np.uint64(shift), values)
+    return length + (values > 0)
+
+class HyperLogLog:
+    """
+    Distinct-count sketch with 2**p registers.
+    Standard error of the estimate is `relative_error` = 1.04 / sqrt(2**p).
+    """
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> 'HyperLogLog':
+        values = values.dropna()
+        if len(values):
+            hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+            index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+            rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+            rank = (64 - self.p) - _bit_length(rest) + 1
+            np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)  # small-range (linear counting) correction
+        return int(round(estimate))
+
+def _sketch_chunk(chunk: pd.Series, kinds: Iterable[str], sample_rows: Optional[int] = None,
+                  seed: int = 0) -> Dict[str, Any]:
+    sketches = {}
+    for kind in kinds:
+        sketch = MisraGries(sample_rows=sample_rows, seed=seed) if kind == "heavy_hitters" else SKETCHES[kind]()
+        sketches[kind] = sketch.update(chunk)
+    return sketches
+
+SKETCHES = {"distinct": HyperLogLog, "heavy_hitters": MisraGries, "quantiles": TDigest}
+
+def default_sketch_kinds(series: pd.Series) -> List[str]:
+    """Numeric columns get a t-digest, everything else Misra-Gries; all get HyperLogLog."""
+    numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    return ["distinct", "quantiles" if numeric else "heavy_hitters"]
+
+def sketch_column(series: pd.Series, chunk_rows: int = 1_000_000, kinds: Optional[Iterable[str]] = None,
+                  max_workers: int = 1, sample_rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Builds one set of sketches per chunk (optionally on a thread pool) and
+    merges them. Memory stays bounded by the sketch sizes plus one chunk.
+    `sample_rows` caps the rows Misra-Gries counts per chunk.
+    """
+    kinds = list(kinds) if kinds is not None else default_sketch_kinds(series)
+    chunks = list(iter_chunks(series, chunk_rows))
+    sketch = lambda i: _sketch_chunk(chunks[i], kinds, sample_rows, seed=i)
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            partials = list(pool.map(sketch, range(len(chunks))))
+    else:
+        partials = [sketch(i) for i in range(len(chunks))]
+    if not partials:
+        return _sketch_chunk(series, kinds, sample_rows)
+    merged = partials[0]
+    for partial in partials[1:]:
+        for name, sketch in partial.items():
+            merged[name].merge(sketch)
+    return merged
+
+def summarize_sketches(sketches: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens a column's sketches into estimates plus their error bounds."""
+    summary = {}
+    hll = sketches.get("distinct")
+    if hll is not None:
+        summary["distinct"] = hll.count()
+        summary["distinct_relative_error"] = round(hll.relative_error, 4)
+    mg = sketches.get("heavy_hitters")
+    if mg is not None:
+        summary["mode"] = mg.mode()
+        summary["mode_count_error"] = mg.error_bound
+    digest = sketches.get("quantiles")
+    if digest is not None:
+        summary["median"] = digest.quantile(0.5)
+        summary["median_rank_error"] = round(digest.rank_error(0.5), 6)
+    return summary
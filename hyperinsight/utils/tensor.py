@@ -1,5 +1,38 @@
+import threading
 import numpy as np
-from typing import List, Tuple, Any
+from typing import Dict, List, Tuple, Any
+
+# Process-wide core state, shared by every matcher (and therefore every engine).
+# Keyed by dimension; entries are read-only float32 arrays built on first use.
+_CORE_SEED = 128
+_CORE_FIBRES: Dict[int, np.ndarray] = {}
+_CORE_TENSORS: Dict[int, np.ndarray] = {}
+_CORE_LOCK = threading.Lock()
+
+def _core_fibre(dimensions: int) -> np.ndarray:
+    """The `[0, 0, :]` fibre of the core tensor, without building the tensor."""
+    fibre = _CORE_FIBRES.get(dimensions)
+    if fibre is None:
+        with _CORE_LOCK:
+            fibre = _CORE_FIBRES.get(dimensions)
+            if fibre is None:
+                # Same stream as the full tensor, so it equals tensor[0, 0, :]
+                fibre = np.random.default_rng(_CORE_SEED).standard_normal(dimensions, dtype=np.float32)
+                fibre.setflags(write=False)
+                _CORE_FIBRES[dimensions] = fibre
+    return fibre
+
+def _core_tensor(dimensions: int) -> np.ndarray:
+    tensor = _CORE_TENSORS.get(dimensions)
+    if tensor is None:
+        with _CORE_LOCK:
+            tensor = _CORE_TENSORS.get(dimensions)
+            if tensor is None:
+                shape = (dimensions, dimensions, dimensions)
+                tensor = np.random.default_rng(_CORE_SEED).standard_normal(shape, dtype=np.float32)
+                tensor.setflags(write=False)
+                _CORE_TENSORS[dimensions] = tensor
+    return tensor
 
 class TensorPatternMatcher:
     """
@@ -7,11 +40,19 @@ class TensorPatternMatcher:
     
     Uses high-dimensional tensor decompositions to identify non-linear 
     relationships and feature interactions that standard models overlook.
+
+    The core tensor is never allocated up front: projections only read the
+    `[0, 0, :]` fibre, which is built lazily in float32 and shared across all
+    matchers in the process.
     """
     
     def __init__(self, dimensions: int = 128):
         self.dim = dimensions
-        self._core_tensor = np.random.randn(dimensions, dimensions, dimensions)
+
+    @property
+    def _core_tensor(self) -> np.ndarray:
+        """Full (dim, dim, dim) core tensor, materialized only if explicitly requested."""
+        return _core_tensor(self.dim)
 
     def find_latent_patterns(self, data_vector: np.ndarray) -> List[Tuple[str, float]]:
         """
@@ -25,7 +66,7 @@ class TensorPatternMatcher:
         
         # Simulated CP Decomposition with dimension alignment
         res_vector = data_vector[:process_dim]
-        core_slice = self._core_tensor[0, 0, :process_dim]
+        core_slice = _core_fibre(self.dim)[:process_dim]
         
         resonance_score = np.dot(res_vector, core_slice) / (np.linalg.norm(res_vector) + 1e-9)
         
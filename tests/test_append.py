@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.statistics import ColumnStats
+
+class TestAppend(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+        self.df = self.batch(5_000)
+        self.engine = hi.core.engine.AnalysisEngine(self.df.copy())
+
+    def batch(self, n, scale=1.0):
+        return pd.DataFrame({
+            'sales': self.rng.standard_normal(n) * scale + 100,
+            'units': self.rng.integers(0, 4, n),
+            'region': self.rng.choice(['North', 'South'], n)
+        })
+
+    def test_profile_matches_full_recompute(self):
+        self.engine.numeric_profile()
+        for scale in (1.0, 3.0, 0.5):
+            self.engine.append(self.batch(300, scale))
+        expected = hi.core.engine.AnalysisEngine(self.engine.data.copy()).numeric_profile()
+        profile = self.engine.numeric_profile()
+        for col in expected:
+            self.assertEqual(profile[col]['outliers'], expected[col]['outliers'])
+            self.assertEqual(profile[col]['last'], expected[col]['last'])
+            self.assertAlmostEqual(profile[col]['std'], expected[col]['std'])
+
+    def test_cached_statistics_are_merged_not_recomputed(self):
+        self.engine.numeric_profile()
+        misses = self.engine.stats.misses
+        self.engine.append(self.batch(100))
+        self.engine.numeric_profile()
+        self.assertEqual(self.engine.stats.misses, misses)
+
+    def test_append_only_version_and_rollback(self):
+        stored = self.engine.state_manager.get_memory_usage()['stored_bytes']
+        self.engine.append(self.batch(100).to_dict('records'))
+        self.assertEqual(len(self.engine.data), 5_100)
+        self.assertEqual(list(self.engine.data.index[-2:]), [5_098, 5_099])
+        self.assertLess(self.engine.state_manager.get_memory_usage()['stored_bytes'] - stored, 20_000)
+        self.engine.rollback()
+        pd.testing.assert_frame_equal(self.engine.data, self.df)
+
+    def test_clean_after_append_and_history_rebuild(self):
+        self.engine.clean_data()
+        duplicates = self.engine.data.iloc[:50].reset_index(drop=True)
+        self.engine.append(duplicates)
+        self.assertEqual(self.engine._row_index.version_id, self.engine.state_manager.version_id)
+        self.engine.clean_data()
+        cleaned = self.engine.data
+        self.engine.rollback()
+        self.assertEqual(len(self.engine.data), len(cleaned) + 50)
+
+    def test_schema_change_falls_back_to_a_full_commit(self):
+        self.engine.append(pd.DataFrame({'sales': [1.0], 'units': [1.5], 'region': ['East']}))
+        self.assertEqual(self.engine.data['units'].dtype, np.float64)
+        with self.assertRaises(ValueError):
+            self.engine.append(pd.DataFrame({'sales': [1.0]}, index=[3]))
+
+    def test_column_stats_merge(self):
+        values = self.rng.standard_normal(1_000) + 1e6
+        merged = ColumnStats.from_values(values[:400]).merge(ColumnStats.from_values(values[400:]))
+        self.assertAlmostEqual(merged.mean, values.mean())
+        self.assertAlmostEqual(merged.var, values.var(ddof=1), places=6)
+
+if __name__ == '__main__':
+    unittest.main()
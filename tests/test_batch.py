@@ -0,0 +1,67 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.batch import BatchProcessor, frame_from_shared, frame_to_shared
+
+class TestBatchProcessing(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = hi.core.engine.AnalysisEngine()
+        self.feeds = [
+            pd.DataFrame({
+                'sales': [10.0 * i + 1, np.nan, 30.0, 30.0],
+                'region': ['North', None, 'South', 'South']
+            })
+            for i in range(1, 5)
+        ]
+
+    def _check(self, results):
+        self.assertEqual([r.index for r in results], list(range(len(self.feeds))))
+        for result in results:
+            self.assertTrue(result.ok, result.error)
+            self.assertEqual(result.value['rows_in'], 4)
+            self.assertEqual(result.value['rows_out'], 3)
+
+    def test_process_pool(self):
+        self._check(self.engine.batch_process(self.feeds, max_workers=2))
+
+    def test_thread_and_serial_modes(self):
+        self._check(self.engine.batch_process(self.feeds, mode="thread", max_workers=2))
+        self._check(self.engine.batch_process(self.feeds, parallel=False))
+
+    def test_failures_are_isolated(self):
+        feeds = self.feeds[:2] + ["missing.csv"] + self.feeds[2:]
+        results = self.engine.batch_process(feeds, max_workers=2, max_in_flight=1)
+        self.assertEqual([r.ok for r in results], [True, True, False, True, True])
+        self.assertIn("FileNotFoundError", results[2].error)
+
+    def test_unordered_iteration_and_intent(self):
+        results = list(self.engine.batch_process(self.feeds, query="show hidden growth",
+                                                 mode="thread", ordered=False))
+        self.assertEqual(sorted(r.index for r in results), list(range(4)))
+        self.assertIn("trends", results[0].value['intent'].data)
+
+    def test_shared_memory_round_trip(self):
+        try:
+            segment, size = frame_to_shared(self.feeds[0])
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        try:
+            pd.testing.assert_frame_equal(frame_from_shared(segment.name, size), self.feeds[0], check_dtype=False)
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_rejects_unknown_steps(self):
+        with self.assertRaises(ValueError):
+            BatchProcessor(pipeline=("explode",))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight and the benchmark scripts are importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import suite
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_generators(self):
+        narrow = suite.make_frame(1000)
+        wide = suite.make_frame(1000, "wide")
+        self.assertEqual(narrow.shape, (1000, 9))
+        self.assertEqual(wide.shape, (1000, 9 + suite.WIDE_FEATURES))
+        self.assertGreaterEqual(narrow.duplicated().sum(), 1)
+        self.assertGreater(narrow["sales"].isna().sum(), 0)
+        self.assertEqual(narrow["units"].dtype.kind, "i")
+
+    def test_run_and_compare(self):
+        report = suite.run_suite([500], ["narrow"], ["clean_data", "load_excel", "audit_dataset"], repeat=1,
+                                 progress=lambda line: None)
+        self.assertIn("pandas", report["meta"])
+        self.assertEqual([r["status"] for r in report["results"]], ["ok", "ok", "ok"])
+
+        slower = {"results": [dict(r, best_s=r["best_s"] * 2) for r in report["results"]]}
+        diff = suite.compare(report, slower, threshold=0.10)
+        self.assertEqual(len(diff["regressions"]), 3)
+        self.assertEqual(suite.compare(report, report)["regressions"], [])
+        self.assertEqual(len(suite.compare(slower, report)["improvements"]), 3)
+
+if __name__ == '__main__':
+    unittest.main()
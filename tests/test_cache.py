@@ -0,0 +1,117 @@
+import unittest
+import time
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.cache import ResultCache
+
+class TestIntentResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = hi.core.engine.AnalysisEngine()
+        self.query = "Analyze growth and hidden anomalies"
+
+    def test_repeat_query_is_served_from_cache(self):
+        first = self.engine.process_intent(self.query)
+        second = self.engine.process_intent(self.query)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.ethics, second.ethics)
+        metrics = self.engine.diagnostic_report()['intent_cache']
+        self.assertEqual((metrics['hits'], metrics['misses']), (1, 1))
+
+    def test_equivalent_phrasing_shares_an_entry(self):
+        self.engine.process_intent("analyze hidden growth")
+        self.assertTrue(self.engine.process_intent("Hidden GROWTH: analyze!").cached)
+
+    def test_commit_and_rollback(self):
+        self.engine.process_intent(self.query)
+        self.engine.replace_values('region', 'North', 'Nord')
+        self.assertFalse(self.engine.process_intent(self.query).cached)
+        self.engine.rollback()
+        self.assertTrue(self.engine.process_intent(self.query).cached)
+        # A new commit after the rollback reuses the version index, never the identity
+        self.engine.replace_values('region', 'South', 'Sud')
+        self.assertFalse(self.engine.process_intent(self.query).cached)
+
+    def test_context_change_misses(self):
+        self.engine.process_intent(self.query)
+        self.engine.set_context("Industry", "Retail")
+        self.assertFalse(self.engine.process_intent(self.query).cached)
+        self.assertTrue(self.engine.process_intent(self.query).cached)
+
+    def test_policy_from_config(self):
+        engine = hi.core.engine.AnalysisEngine(config={"cache_policy": "NONE"})
+        engine.process_intent(self.query)
+        self.assertFalse(engine.process_intent(self.query).cached)
+        with self.assertRaises(ValueError):
+            hi.core.engine.AnalysisEngine(config={"cache_policy": "FIFO"})
+
+class TestSharedScans(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = hi.core.engine.AnalysisEngine()
+        self.calls = {"trends": 0, "anomalies": 0, "ethics": 0}
+        self._count("trends", "_analyze_trends")
+        self._count("anomalies", "_detect_anomalies")
+        audit = self.engine.ethics.audit_dataset
+        def counted_audit(data):
+            self.calls["ethics"] += 1
+            return audit(data)
+        self.engine.ethics.audit_dataset = counted_audit
+
+    def _count(self, name, method):
+        original = getattr(self.engine, method)
+        def counted():
+            self.calls[name] += 1
+            return original()
+        setattr(self.engine, method, counted)
+
+    def test_each_analysis_runs_once_per_version(self):
+        queries = ["show growth", "find hidden growth", "analyze hidden sales", "explain churn"] * 5
+        results = self.engine.process_intents(queries)
+        self.assertEqual(self.calls, {"trends": 1, "anomalies": 1, "ethics": 1})
+        self.assertEqual([r.query for r in results], queries)
+        self.assertEqual(set(results[0].data), {"trends"})
+        self.assertEqual(set(results[1].data), {"trends", "anomalies"})
+        self.assertEqual(set(results[2].data), {"anomalies"})
+        self.assertEqual(results[3].data, {})
+        self.assertEqual(results[1].data["trends"], self.engine._analyze_trends())
+
+    def test_matches_single_query_path(self):
+        batch = self.engine.process_intents(["find hidden growth"])[0]
+        single = self.engine.process_intent("find hidden growth")
+        self.assertEqual(batch.data, single.data)
+        self.assertEqual(batch.ethics, single.ethics)
+        self.engine.replace_values('region', 'North', 'Nord')
+        self.engine.process_intents(["find hidden growth", "show growth"])
+        self.assertEqual(self.calls["ethics"], 2)
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('b'), (False, None))
+        self.assertEqual(cache.get('a'), (True, 1))
+        self.assertEqual(cache.metrics()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        cache = ResultCache(ttl=0.05)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), (True, 1))
+        time.sleep(0.1)
+        self.assertEqual(cache.get('a'), (False, None))
+        self.assertEqual(cache.metrics()['expirations'], 1)
+        self.assertEqual(cache.metrics()['hit_rate'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
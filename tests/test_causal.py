@@ -0,0 +1,105 @@
+import pandas as pd
+import numpy as np
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.causal import intelligence
+from hyperinsight.causal.intelligence import CausalEngine
+
+class TestCausalDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 5_000
+        spend = rng.normal(size=n)
+        season = rng.normal(size=n)
+        visits = 0.8 * spend + 0.6 * season + rng.normal(size=n)
+        self.df = pd.DataFrame({
+            'ad_spend': spend,
+            'season': season,
+            'visits': visits,
+            'revenue': 0.9 * visits + rng.normal(size=n),
+            'noise': rng.normal(size=n),
+            'channel': rng.choice(['Social', 'Search'], n)
+        })
+
+    def random_dag(self, variables, rows, density, seed):
+        rng = np.random.default_rng(seed)
+        weights = np.triu(rng.normal(0, 0.5, (variables, variables)) * (rng.random((variables, variables)) < density), 1)
+        values = np.zeros((rows, variables))
+        for j in range(variables):
+            values[:, j] = values @ weights[:, j] + rng.normal(size=rows)
+        return pd.DataFrame(values, columns=[f"v{j}" for j in range(variables)]), weights
+
+    def test_recovers_known_dag(self):
+        graph = CausalEngine().discover_graph(self.df, alpha=0.01)
+        self.assertEqual(graph['nodes'], ['ad_spend', 'season', 'visits', 'revenue', 'noise'])
+        self.assertEqual(set(graph['edges']), {('ad_spend', 'visits', '->'), ('season', 'visits', '->'),
+                                               ('visits', 'revenue', '->')})
+        self.assertEqual(graph['sepsets'][('ad_spend', 'revenue')], ['visits'])
+
+    def test_root_cause_follows_the_graph(self):
+        causal = hi.HyperInsight.find_root_cause(self.df, "revenue_drop_detected", confidence_threshold=0.99)
+        self.assertEqual(causal['target'], 'revenue')
+        self.assertEqual(causal['root_cause'], 'ad_spend')
+        self.assertEqual(causal['causal_path'], ['ad_spend', 'visits', 'revenue'])
+        self.assertIn('visits', causal['confounders_removed'])
+        self.assertTrue(causal['summary'].startswith("ad_spend caused"))
+
+        unknown = CausalEngine().analyze_cause(self.df, "churn_spike")
+        self.assertIsNone(unknown['root_cause'])
+        self.assertIsNone(unknown['target'])
+        isolated = CausalEngine().analyze_cause(self.df, "noise_burst")
+        self.assertEqual(isolated['target'], 'noise')
+        self.assertIsNone(isolated['root_cause'])
+
+    def test_graph_is_reused_across_events(self):
+        engine = CausalEngine()
+        engine.analyze_cause(self.df, "revenue_drop")
+        graph = next(iter(engine.knowledge_graph.values()))
+        engine.analyze_cause(self.df, "visits_drop")
+        self.assertEqual(len(engine.knowledge_graph), 1)
+        with mock.patch.object(pd.DataFrame, "corr", side_effect=AssertionError("recomputed")):
+            self.assertIs(engine.discover_graph(self.df), graph)
+        self.assertEqual(graph['correlation'].shape, (5, 5))
+        engine.discover_graph(self.df.assign(noise=self.df['noise'] * 2 + self.df['season']))
+        self.assertEqual(len(engine.knowledge_graph), 2)
+
+    def test_rows_are_pairwise_complete(self):
+        df = self.df.copy()
+        df.loc[:99, 'visits'] = np.nan
+        df.loc[50:199, 'noise'] = np.nan
+        self.assertEqual(CausalEngine().discover_graph(df)['rows'], len(df) - 200)
+        self.assertEqual(CausalEngine().discover_graph(self.df)['rows'], len(self.df))
+
+    def test_pool_matches_serial(self):
+        df, _ = self.random_dag(60, 3_000, 0.06, seed=1)
+        serial = CausalEngine(max_workers=1).discover_graph(df, alpha=0.01)
+        threshold = intelligence.PARALLEL_MIN_EDGES
+        intelligence.PARALLEL_MIN_EDGES = 1
+        try:
+            pooled = CausalEngine(max_workers=2).discover_graph(df, alpha=0.01)
+        finally:
+            intelligence.PARALLEL_MIN_EDGES = threshold
+        self.assertEqual(pooled['edges'], serial['edges'])
+        self.assertEqual(pooled['sepsets'], serial['sepsets'])
+
+    def test_skeleton_accuracy_and_depth_bound(self):
+        df, weights = self.random_dag(100, 10_000, 0.03, seed=2)
+        graph = CausalEngine().discover_graph(df, alpha=0.01)
+        truth = {tuple(sorted((f"v{i}", f"v{j}"))) for i, j in zip(*np.nonzero(weights))}
+        found = {tuple(sorted((a, b))) for a, b, _ in graph['edges']}
+        self.assertGreater(len(found & truth) / len(truth), 0.85)
+        self.assertGreater(len(found & truth) / len(found), 0.9)
+        shallow = CausalEngine().discover_graph(df, alpha=0.01, max_depth=1)
+        self.assertEqual(shallow['depth'], 1)
+        self.assertTrue(all(len(s) <= 1 for s in shallow['sepsets'].values()))
+
+if __name__ == '__main__':
+    unittest.main()
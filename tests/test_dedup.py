@@ -0,0 +1,82 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.dedup import RowHashIndex
+
+class TestIncrementalDedup(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.df = self.frame(rng, 2_000)
+        self.more = self.frame(rng, 500, offset=2_000)
+
+    @staticmethod
+    def frame(rng, n, offset=0):
+        return pd.DataFrame({
+            'region': rng.choice(['North', 'South', None], n),
+            'units': rng.integers(0, 5, n),
+            'price': rng.choice([1.5, 2.5, np.nan], n)
+        }, index=range(offset, offset + n))
+
+    def test_matches_pandas(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.copy())
+        engine.clean_data()
+        pd.testing.assert_frame_equal(engine.data, self.df.dropna().drop_duplicates())
+        engine.rollback()
+        pd.testing.assert_frame_equal(engine.data, self.df)
+
+    def test_appended_rows_only_are_hashed(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.copy())
+        engine.clean_data()
+        hashed = []
+        hash_rows = engine._row_index.hash_rows
+        engine._row_index.hash_rows = lambda df: hashed.append(len(df)) or hash_rows(df)
+        engine.data = pd.concat([engine.data, self.more])
+        engine.clean_data()
+        self.assertEqual(hashed, [len(self.more)])
+        expected = pd.concat([self.df, self.more]).dropna().drop_duplicates()
+        pd.testing.assert_frame_equal(engine.data, expected)
+
+    def test_subset_key(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.copy())
+        engine.clean_data(subset=['region'])
+        pd.testing.assert_frame_equal(engine.data, self.df.dropna().drop_duplicates(subset=['region']))
+        lazy = hi.core.engine.AnalysisEngine(self.df.copy(), config={"lazy": True})
+        lazy.clean_data(subset=['region'])
+        lazy.commit()
+        pd.testing.assert_frame_equal(lazy.data, engine.data)
+
+    def test_rollback_rebuilds_the_index(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.copy())
+        engine.clean_data()
+        engine.rollback()
+        engine.clean_data()
+        pd.testing.assert_frame_equal(engine.data, self.df.dropna().drop_duplicates())
+
+class TestRowHashIndex(unittest.TestCase):
+
+    def test_spills_runs_beyond_memory_limit(self):
+        index = RowHashIndex(memory_limit=4_000)
+        rng = np.random.default_rng(0)
+        seen = set()
+        for _ in range(10):
+            batch = rng.integers(0, 5_000, 1_000, dtype=np.uint64)
+            keep = index.insert_hashes(batch)
+            expected = ~pd.Series(batch).duplicated().to_numpy() & ~np.isin(batch, list(seen))
+            np.testing.assert_array_equal(keep, expected)
+            seen.update(batch.tolist())
+        self.assertEqual(len(index), len(seen))
+        self.assertLessEqual(index.memory_bytes, 4_000)
+        self.assertGreater(index.disk_bytes, 0)
+        index.release()
+        self.assertEqual(len(index), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+import unittest
+import tempfile
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.utils.dtypes import optimize_dtypes, restore_dtypes
+
+class TestCompactDtypes(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 5_000
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "passengers.csv")
+        pd.DataFrame({
+            'Age': rng.integers(1, 80, n),
+            'Fare': rng.choice([7.25, 8.5, 71.25, np.nan], n),
+            'Sex': rng.choice(['male', 'female'], n),
+            'Embarked': rng.choice(['S', 'C', 'Q', None], n),
+            'Name': [f"Passenger {i}" for i in range(n)]
+        }).to_csv(self.path, index=False)
+        self.raw = pd.read_csv(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_report_and_restore(self):
+        optimized, report = optimize_dtypes(self.raw)
+        self.assertEqual(optimized['Age'].dtype, np.int8)
+        self.assertEqual(optimized['Fare'].dtype, np.float32)
+        self.assertIsInstance(optimized['Sex'].dtype, pd.CategoricalDtype)
+        self.assertEqual(optimized['Name'].dtype, self.raw['Name'].dtype)
+        self.assertEqual(set(report.changed), {'Age', 'Fare', 'Sex', 'Embarked'})
+        self.assertGreater(report.columns['Sex']['saved_bytes'], 0)
+        self.assertEqual(report.saved_bytes, report.to_frame()['saved_bytes'].sum())
+        self.assertGreater(report.summary()['saved_ratio'], 0.3)
+        pd.testing.assert_frame_equal(restore_dtypes(optimized, report), self.raw)
+
+    def test_arrow_strings(self):
+        df = pd.DataFrame({'Name': pd.Series([f"n{i}" for i in range(1_000)], dtype=object)})
+        optimized, report = optimize_dtypes(df, arrow_strings=True)
+        self.assertEqual(optimized['Name'].dtype, pd.StringDtype("pyarrow", na_value=np.nan))
+        self.assertEqual(optimized['Name'].tolist(), df['Name'].tolist())
+
+    def test_engine_optimizes_loaded_sources(self):
+        engine = hi.core.engine.AnalysisEngine(self.path)
+        self.assertIsInstance(engine.data['Embarked'].dtype, pd.CategoricalDtype)
+        self.assertGreater(engine.dtype_report.saved_bytes, 0)
+        self.assertIsNotNone(engine.diagnostic_report()['dtypes'])
+        plain = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": False})
+        self.assertIsNone(plain.dtype_report)
+        pd.testing.assert_frame_equal(plain.data, self.raw)
+
+    def test_default_keeps_numeric_dtypes(self):
+        engine = hi.core.engine.AnalysisEngine(self.path)
+        plain = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": False})
+        self.assertEqual(set(engine.dtype_report.changed), {'Sex', 'Embarked'})
+        self.assertEqual((engine.data['Age'] * 3).max(), (plain.data['Age'] * 3).max())
+        self.assertEqual((engine.data['Age'] * 3).max(), (self.raw['Age'] * 3).max())
+        for e in (engine, plain):
+            e.fill_nulls(columns=['Fare'])
+        pd.testing.assert_series_equal(engine.data['Fare'], plain.data['Fare'])
+
+    def test_engine_logic_on_compact_frame(self):
+        engine = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": "aggressive"})
+        plain = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": False})
+        for e in (engine, plain):
+            e.fill_nulls("mode")
+            e.replace_values('Embarked', 'Q', 'Queenstown')
+        self.assertIsInstance(engine.data['Embarked'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(engine.data, plain.data, check_dtype=False, check_categorical=False)
+
+        version = engine.state_manager.version_id
+        engine.append(self.raw.iloc[:5].assign(Embarked='S'))
+        self.assertEqual(engine.data['Age'].dtype, np.int8)
+        self.assertIsNotNone(engine.state_manager._history[engine.state_manager.current_version].tail)
+        self.assertNotEqual(engine.state_manager.version_id, version)
+
+        engine.restore_dtypes()
+        self.assertEqual(engine.data['Age'].dtype, self.raw['Age'].dtype)
+        self.assertEqual(engine.data['Sex'].dtype, self.raw['Sex'].dtype)
+        self.assertIsNone(engine.dtype_report)
+
+    def test_writes_that_do_not_fit_widen_the_column(self):
+        engine = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": "aggressive"})
+        plain = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": False})
+        self.assertEqual(engine.data['Fare'].dtype, np.float32)
+        for e in (engine, plain):
+            e.replace_values('Fare', 7.25, 0.1)
+            e.replace_values('Age', 1, 100_000)
+            e.fill_nulls("constant", constant=0.3, columns=["Fare"])
+        self.assertEqual(engine.data['Fare'].dtype, np.float64)
+        self.assertEqual((engine.data['Fare'] == 0.1).sum(), (self.raw['Fare'] == 7.25).sum())
+        self.assertIn(100_000, engine.data['Age'].tolist())
+        engine.restore_dtypes()
+        pd.testing.assert_frame_equal(engine.data, plain.data)
+
+        exact = hi.core.engine.AnalysisEngine(self.path, config={"optimize_dtypes": "aggressive"})
+        exact.replace_values('Fare', 7.25, 0.5)
+        self.assertEqual(exact.data['Fare'].dtype, np.float32)
+
+    def test_optimize_in_memory_frame(self):
+        engine = hi.core.engine.AnalysisEngine(self.raw.copy(), config={"optimize_dtypes": "aggressive"})
+        self.assertIsNone(engine.dtype_report)
+        report = engine.optimize_dtypes()
+        self.assertEqual(set(report.changed), {'Age', 'Fare', 'Sex', 'Embarked'})
+        engine.rollback()
+        pd.testing.assert_frame_equal(engine.data, self.raw)
+
+if __name__ == '__main__':
+    unittest.main()
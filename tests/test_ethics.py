@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.ethics.bias import EthicsModule
+
+class TestFairnessAudit(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        n = 50_000
+        sex = rng.choice(['male', 'female'], n, p=[0.65, 0.35])
+        self.df = pd.DataFrame({
+            'Sex': sex,
+            'Age': np.where(rng.random(n) < 0.02, np.nan, rng.integers(18, 70, n)),
+            'Region': rng.choice(['North', 'South', 'East', 'West'], n, p=[0.4, 0.3, 0.25, 0.05]),
+            'height': np.where(sex == 'male', 178, 165) + rng.normal(0, 7, n),
+            'salary': rng.normal(50, 10, n),
+            'hired': (rng.random(n) < np.where(sex == 'male', 0.5, 0.3)).astype(int)
+        })
+
+    def findings(self, audit, kind):
+        return [f for f in audit['findings'] if f['type'] == kind]
+
+    def test_metrics_match_pandas(self):
+        audit = EthicsModule().audit_dataset(self.df)
+        self.assertEqual(audit['outcome'], 'hired')
+        self.assertEqual(set(audit['attributes']), {'Sex', 'Age', 'Region'})
+
+        sex = audit['attributes']['Sex']
+        rates = self.df.groupby('Sex')['hired'].mean()
+        shares = self.df['Sex'].value_counts(normalize=True)
+        self.assertAlmostEqual(sex['groups']['female']['outcome_rate'], rates['female'], places=5)
+        self.assertAlmostEqual(sex['groups']['female']['representation_ratio'], shares['female'] * 2, places=3)
+        self.assertAlmostEqual(sex['adverse_impact_ratio'], rates.min() / rates.max(), places=3)
+        self.assertAlmostEqual(sex['outcome_rate_gap'], rates.max() - rates.min(), places=5)
+        self.assertEqual(audit['attributes']['Age']['rows'], self.df['Age'].notna().sum())
+
+        r = np.corrcoef(self.df['height'], self.df['Sex'] == 'female')[0, 1]
+        self.assertAlmostEqual(audit['proxies']['height']['Sex'], r, places=3)
+        self.assertLess(abs(audit['proxies']['salary']['Sex']), 0.05)
+
+    def test_findings(self):
+        audit = EthicsModule().audit_dataset(self.df)
+        self.assertEqual(audit['status'], 'Warning')
+        self.assertEqual([f['attribute'] for f in self.findings(audit, 'Adverse Impact')], ['Sex'])
+        self.assertEqual([f['attribute'] for f in self.findings(audit, 'Disparate Treatment')], ['Sex'])
+        self.assertEqual([f['feature'] for f in self.findings(audit, 'Proxy Variable Detected')], ['height'])
+        self.assertIn('West', [f['group'] for f in self.findings(audit, 'Representation Bias')])
+        self.assertAlmostEqual(audit['fairness_score'], audit['attributes']['Sex']['adverse_impact_ratio'])
+        self.assertTrue(any("'height'" in r for r in audit['recommendations']))
+
+    def test_fair_data_is_clear(self):
+        rng = np.random.default_rng(2)
+        n = 20_000
+        df = pd.DataFrame({'gender': rng.choice(['F', 'M'], n), 'approved': rng.integers(0, 2, n),
+                           'score': rng.normal(0, 1, n)})
+        audit = EthicsModule().audit_dataset(df)
+        self.assertEqual(audit['status'], 'Clear')
+        self.assertEqual(audit['findings'], [])
+
+    def test_configuration(self):
+        audit = EthicsModule(protected=['Region'], outcome='hired',
+                             reference_shares={'Region': {'North': 0.4, 'South': 0.3, 'East': 0.25, 'West': 0.05}}
+                             ).audit_dataset(self.df)
+        self.assertEqual(list(audit['attributes']), ['Region'])
+        self.assertEqual(self.findings(audit, 'Representation Bias'), [])
+        no_attributes = EthicsModule().audit_dataset(self.df[['height', 'salary']])
+        self.assertEqual(no_attributes['status'], 'Inconclusive')
+        self.assertEqual(no_attributes['findings'][0]['type'], 'Coverage Gap')
+
+    def test_high_cardinality_attribute_is_pooled(self):
+        rng = np.random.default_rng(4)
+        df = pd.DataFrame({'zip_code': rng.integers(10_000, 10_500, 100_000)})
+        groups = EthicsModule().audit_dataset(df)['attributes']['zip_code']['groups']
+        self.assertLessEqual(len(groups), 20)
+        self.assertIn('(other)', groups)
+        ratios = [g['representation_ratio'] for g in groups.values()]
+        self.assertTrue(all(0.7 < r < 1.3 for r in ratios))
+
+    def test_engine_audits_once_per_version(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.astype({'Sex': 'category'}))
+        first = engine.process_intent("Check bias in hiring")
+        self.assertEqual(first.ethics['outcome'], 'hired')
+        self.assertEqual(engine.metrics.snapshot()['phases']['audit']['count'], 1)
+        engine.process_intent("Analyze growth and hidden anomalies")
+        self.assertEqual(engine.metrics.snapshot()['phases']['audit']['count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
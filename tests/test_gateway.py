@@ -0,0 +1,110 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import sys
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.api.gateway import (APIInterface, EnginePool, PoolSaturated, create_app,
+                                      open_shared_dataset, share_dataset)
+
+class TestGateway(unittest.TestCase):
+
+    def test_analyze_over_http(self):
+        with TestClient(create_app(pool_size=2)) as client:
+            response = client.post("/analyze", json={"query": "Analyze growth and hidden anomalies"})
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["status"], "success")
+            self.assertIn("trends", body["insights"])
+            self.assertTrue(body["cached"])  # served from the warm-up
+
+            health = client.get("/health").json()
+            self.assertEqual((health["engines"], health["idle"], health["rows"]), (2, 2, 100))
+            metrics = client.get("/metrics")
+            self.assertTrue(metrics.headers["content-type"].startswith("text/plain"))
+            self.assertIn('hyperinsight_phase_seconds_count{phase="gateway.request"} 1', metrics.text)
+
+            pool = client.app.state.pool
+            self.assertIs(pool.engines[1].data, pool.engines[0].data)
+
+    def test_context_is_scoped_to_the_request(self):
+        with TestClient(create_app(pool_size=1, warmup=())) as client:
+            first = client.post("/analyze", json={"query": "Show growth", "context": {"quarter": "Q3"}}).json()
+            second = client.post("/analyze", json={"query": "Show growth"}).json()
+            self.assertFalse(first["cached"])
+            self.assertFalse(second["cached"])
+            self.assertEqual(client.app.state.pool.engines[0].context_window, {})
+
+    def test_backpressure(self):
+        pool = EnginePool(size=1, max_queue=1, queue_timeout=0.05, warmup=())
+
+        async def scenario():
+            pool.start()
+            async with pool.lease():
+                # One request may wait (and times out); a second waiter is rejected outright
+                waiter = asyncio.ensure_future(pool.analyze("Show growth"))
+                await asyncio.sleep(0)
+                with self.assertRaises(PoolSaturated):
+                    await pool.analyze("Show growth")
+                with self.assertRaises(PoolSaturated):
+                    await waiter
+            return await pool.analyze("Show growth")
+
+        self.assertEqual(asyncio.run(scenario())["status"], "success")
+        self.assertEqual(pool.metrics.counters["gateway_rejected"], 2)
+
+    def test_busy_pool_returns_503(self):
+        app = create_app(pool_size=1, max_queue=0, warmup=())
+        with TestClient(app) as client:
+            app.state.pool._idle.get_nowait()  # the only engine is leased elsewhere
+            response = client.post("/analyze", json={"query": "Show growth"})
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["retry-after"], "1")
+
+    def test_shared_dataset_is_memory_mapped(self):
+        df = pd.DataFrame({"sales": np.arange(1000, dtype=float), "region": ["North", "South"] * 500})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = share_dataset(df, os.path.join(tmp, "data.arrow"))
+            shared = open_shared_dataset(path)
+            pd.testing.assert_frame_equal(shared, df, check_dtype=False)
+            self.assertFalse(shared["sales"].to_numpy().flags.writeable)
+
+            pool = EnginePool(path, size=2, warmup=())
+            self.assertEqual(len(pool.data), 1000)
+            del shared, pool
+
+    def test_pooled_history_is_not_copied(self):
+        df = pd.DataFrame({"sales": np.random.rand(1_000_000), "cost": np.random.rand(1_000_000)})
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = EnginePool(share_dataset(df, os.path.join(tmp, "data.arrow")), size=4, warmup=())
+            frame_bytes = df.memory_usage(index=True).sum()
+            for engine in pool.engines:
+                self.assertLess(engine.state_manager.hot_bytes, frame_bytes * 0.01)
+            private = hi.core.engine.AnalysisEngine(pool.data)
+            self.assertGreaterEqual(private.state_manager.hot_bytes, frame_bytes * 0.99)
+            del pool, private
+
+    def test_module_level_app(self):
+        from hyperinsight.api import gateway
+        self.assertIsInstance(gateway.app, FastAPI)
+        self.assertIs(gateway.app, gateway.app)
+        with self.assertRaises(AttributeError):
+            gateway.missing
+
+    def test_api_interface(self):
+        engine = hi.core.engine.AnalysisEngine()
+        api = APIInterface(engine, pool_size=1)
+        with TestClient(api.app) as client:
+            self.assertEqual(client.post("/analyze", json={"query": "Show growth"}).status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import pandas as pd
+import numpy as np
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.governor import MemoryBudgetExceeded, frame_bytes
+from hyperinsight.utils.memory import compact_series
+
+class TestMemoryGovernor(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 20_000
+        self.df = pd.DataFrame({
+            'units': rng.integers(0, 50, n),
+            'price': rng.choice([1.5, 2.5, np.nan], n),
+            'region': rng.choice(np.array(['North', 'South', 'East', None], dtype=object), n),
+            **{f'f{i}': np.where(rng.random(n) < 0.1, np.nan, rng.standard_normal(n)) for i in range(6)}
+        })
+        self.bytes = frame_bytes(self.df)
+
+    def engine(self, budget_factor=None, **config):
+        if budget_factor is not None:
+            config["max_memory"] = int(self.bytes * budget_factor)
+        return hi.core.engine.AnalysisEngine(self.df.copy(), config=config)
+
+    def actions(self, engine):
+        return [a["action"] for a in engine.memory_status()["actions"]]
+
+    def test_usage_within_budget(self):
+        engine = self.engine()
+        engine.process_intent("Analyze growth and hidden anomalies")
+        status = engine.memory_status()
+        self.assertEqual(status["usage"]["data"], self.bytes)
+        self.assertGreater(status["usage"]["history"], 0)
+        self.assertGreater(status["usage"]["caches"], 0)
+        self.assertFalse(status["lean_mode"])
+        self.assertEqual(status["actions"], [])
+        self.assertIn("memory", engine.diagnostic_report())
+
+    def test_compact_series(self):
+        self.assertEqual(compact_series(self.df['units']).dtype, np.int8)
+        self.assertEqual(compact_series(self.df['price']).dtype, np.float32)
+        self.assertIsInstance(compact_series(self.df['region']).dtype, pd.CategoricalDtype)
+        self.assertIsNone(compact_series(self.df['f0']))
+
+    def test_lean_mode_compacts_losslessly(self):
+        engine = self.engine(2.0)
+        status = engine.memory_status()
+        self.assertTrue(status["lean_mode"])
+        self.assertLessEqual(status["usage"]["total"], status["budget"])
+        self.assertIn("compact_data", self.actions(engine))
+        self.assertIn("spill_history", self.actions(engine))
+        self.assertLessEqual(engine.intent_cache.max_entries, 32)
+        self.assertEqual(engine.data['units'].dtype, np.int8)
+        pd.testing.assert_frame_equal(engine.data, self.df, check_dtype=False, check_categorical=False)
+        engine.rollback(to="initial")
+        pd.testing.assert_frame_equal(engine.data, self.df)
+
+    def test_fill_nulls_is_chunked_to_fit(self):
+        expected = self.engine()
+        expected.fill_nulls()
+        engine = self.engine(1.6)
+        engine.fill_nulls()
+        self.assertIn("chunked", self.actions(engine))
+        self.assertLessEqual(engine.memory_status()["usage"]["total"], int(self.bytes * 1.6))
+        history = engine.state_manager._history
+        messages = [history[v].message for v in range(len(history))]
+        self.assertTrue(any("[part 1/" in m for m in messages))
+        pd.testing.assert_frame_equal(engine.data, expected.data, check_dtype=False, check_categorical=False)
+
+    def test_refuses_operations_over_budget(self):
+        engine = self.engine(1.2)
+        before = engine.data
+        with self.assertRaises(MemoryBudgetExceeded):
+            engine.append(self.df)
+        self.assertIs(engine.data, before)
+        self.assertEqual(self.actions(engine)[-1], "refused")
+        self.assertEqual(engine.metrics.snapshot()["counters"]["governor_refused"], 1)
+
+    def test_refused_clean_keeps_data_and_index_consistent(self):
+        rows = self.df.dropna()
+        df = pd.concat([rows, rows.iloc[:100]], ignore_index=True)
+        engine = hi.core.engine.AnalysisEngine(df, config={"max_memory": int(frame_bytes(df) * 1.2)})
+        version = engine.state_manager.version_id
+        with self.assertRaises(MemoryBudgetExceeded):
+            engine.clean_data()
+        self.assertIsNone(engine._row_index)
+        self.assertEqual(engine.state_manager.version_id, version)
+        self.assertEqual(len(engine.data), len(df))
+
+    def test_host_pressure_only_evicts_caches(self):
+        engine = self.engine()
+        engine.process_intent("Analyze growth and hidden anomalies")
+        version, dtypes = engine.state_manager.version_id, engine.data.dtypes.copy()
+        sample = {"cpu_percent": 0.0, "rss_bytes": 0, "system_memory_percent": 95.0}
+        with mock.patch("hyperinsight.core.engine.sample_process", return_value=sample):
+            engine.diagnostic_report()
+        self.assertEqual(engine.state_manager.version_id, version)
+        pd.testing.assert_series_equal(engine.data.dtypes, dtypes)
+        self.assertEqual(self.actions(engine), ["lean_mode", "evict_caches"])
+        self.assertEqual(len(engine.intent_cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import subprocess
+import unittest
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative microseconds that HyperInsight's own modules may add to startup
+BUDGET_US = 150_000
+
+def import_profile(code: str) -> dict:
+    """Runs `code` under `python -X importtime` and returns {module: (self_us, cumulative_us)}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, timeout=120, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def own_time(profile: dict) -> int:
+    return sum(self_us for name, (self_us, _) in profile.items() if name.split(".")[0] == "hyperinsight")
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        profile = import_profile("import hyperinsight as hi; hi.analyze; hi.HyperInsight")
+        for heavy in ("pandas", "numpy", "psutil", "sqlalchemy", "requests", "fastapi", "pyarrow"):
+            self.assertNotIn(heavy, profile)
+        self.assertLess(profile["hyperinsight"][1], BUDGET_US)
+
+    def test_engine_skips_optional_dependencies(self):
+        profile = import_profile(
+            "import logging, hyperinsight as hi\n"
+            "hi.core.engine.AnalysisEngine().process_intent('Show growth')\n"
+            "assert not logging.getLogger().handlers"
+        )
+        for optional in ("sqlalchemy", "requests", "fastapi", "uvicorn"):
+            self.assertNotIn(optional, profile)
+        self.assertLess(own_time(profile), BUDGET_US)
+
+    def test_submodules_resolve_in_any_order(self):
+        # Importing one submodule first must not hide its lazily loaded siblings
+        import_profile(
+            "import hyperinsight.core.statistics, hyperinsight.state.versioning\n"
+            "import hyperinsight as hi\n"
+            "hi.core.engine.AnalysisEngine, hi.state.manager.StateManager, hi.ethics.bias.EthicsModule"
+        )
+
+    def test_api_does_not_load_the_server(self):
+        profile = import_profile("import hyperinsight.api.gateway")
+        self.assertIn("fastapi", profile)
+        self.assertNotIn("uvicorn", profile)
+        self.assertNotIn("sqlalchemy", profile)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core import imputation
+from hyperinsight.core.imputation import NullImputer
+
+class TestNullImputer(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'sales': [10.0, np.nan, 30.0, 50.0, np.nan, 70.0],
+            'units': pd.array([1, None, 3, 5, 5, None], dtype="Int64"),
+            'score': np.array([1.0, np.nan, 2.0, 2.0, 4.0, 4.0], dtype=np.float32),
+            'region': ['North', 'North', 'North', 'South', 'South', 'South'],
+            'channel': ['Web', None, 'Web', 'Store', 'Store', None],
+            'segment': pd.Categorical(['A', 'A', None, 'B', 'B', 'B']),
+            'complete': range(6)
+        })
+
+    def test_auto_uses_mean_for_all_numeric_dtypes(self):
+        out, changed = NullImputer().impute(self.df, "auto")
+        self.assertEqual(out.loc[1, 'sales'], 40.0)
+        self.assertEqual(out.loc[1, 'score'], np.float32(2.6))
+        self.assertEqual(out['units'].dtype, "Int64")
+        self.assertEqual(out.loc[1, 'units'], 4)
+        self.assertEqual(out.loc[1, 'channel'], 'Store')
+        self.assertEqual(out.loc[2, 'segment'], 'B')
+        self.assertNotIn('complete', changed)
+        self.assertEqual(out.isna().sum().sum(), 0)
+
+    def test_median_strategy(self):
+        out, _ = NullImputer().impute(self.df, "median")
+        self.assertEqual(out.loc[1, 'sales'], 40.0)
+        self.assertEqual(out.loc[1, 'score'], 2.0)
+
+    def test_group_wise_imputation(self):
+        out, _ = NullImputer().impute(self.df, "auto", group_by='region')
+        self.assertEqual(out.loc[1, 'sales'], 20.0)
+        self.assertEqual(out.loc[4, 'sales'], 60.0)
+        self.assertEqual(out.loc[1, 'channel'], 'Web')
+        self.assertEqual(out.loc[5, 'channel'], 'Store')
+        self.assertEqual(out.loc[2, 'segment'], 'A')
+
+    def test_thread_pool_matches_serial(self):
+        original = imputation.PARALLEL_MIN_ROWS
+        imputation.PARALLEL_MIN_ROWS = 0
+        try:
+            threaded, _ = NullImputer(max_workers=4).impute(self.df, "auto", group_by='region')
+        finally:
+            imputation.PARALLEL_MIN_ROWS = original
+        serial, _ = NullImputer().impute(self.df, "auto", group_by='region')
+        pd.testing.assert_frame_equal(threaded, serial)
+
+    def test_untouched_columns_are_not_copied(self):
+        out, _ = NullImputer().impute(self.df, "auto")
+        self.assertTrue(np.shares_memory(out['complete'].to_numpy(), self.df['complete'].to_numpy()))
+        self.assertTrue(self.df['sales'].hasnans)
+
+    def test_engine_commits_only_filled_columns(self):
+        engine = hi.core.engine.AnalysisEngine(self.df, config={"threading": False})
+        engine.fill_nulls(strategy="median", group_by='region')
+        version = engine.state_manager._history[1]
+        self.assertEqual(set(version.columns), {'sales', 'units', 'score', 'channel', 'segment'})
+        self.assertEqual(engine.data.isna().sum().sum(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
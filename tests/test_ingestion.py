@@ -0,0 +1,190 @@
+import pandas as pd
+import numpy as np
+import unittest
+import tempfile
+import sys
+import os
+from sqlalchemy import create_engine, text
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.connectors.ingestion import DataConnector, PartitionColumnError
+from hyperinsight.core.statistics import ColumnStats
+
+class TestStreamingIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        n = 5_000
+        self.df = pd.DataFrame({
+            'sales': rng.normal(100, 10, n),
+            'units': rng.integers(0, 50, n),
+            'region': rng.choice(['North', 'South', 'East'], n)
+        })
+        self.df.loc[::7, 'sales'] = np.nan
+        self.df.loc[::11, 'region'] = None
+        self.df.loc[0, 'sales'] = 1e6  # one clear outlier
+        self.csv = os.path.join(self.tmp.name, 'data.csv')
+        self.parquet = os.path.join(self.tmp.name, 'data.parquet')
+        self.df.to_csv(self.csv, index=False)
+        self.df.to_parquet(self.parquet, index=False, row_group_size=1_000)
+        self.connector = DataConnector()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_are_bounded_and_complete(self):
+        for path in (self.csv, self.parquet):
+            chunks = list(self.connector.iter_file(path, chunk_rows=700))
+            self.assertTrue(all(len(c) <= 700 for c in chunks))
+            self.assertEqual(sum(len(c) for c in chunks), len(self.df))
+
+    def test_projection_and_dtype(self):
+        for path in (self.csv, self.parquet):
+            chunk = next(self.connector.iter_file(path, chunk_rows=500, columns=['units'], dtype={'units': 'int32'}))
+            self.assertEqual(list(chunk.columns), ['units'])
+            self.assertEqual(chunk['units'].dtype, np.int32)
+
+    def test_filters_match_pandas(self):
+        filters = [('units', '>=', 40), ('region', 'in', ['North', 'East'])]
+        expected = self.df[(self.df['units'] >= 40) & self.df['region'].isin(['North', 'East'])]
+        for path in (self.csv, self.parquet):
+            got = pd.concat(self.connector.iter_file(path, chunk_rows=600, columns=['sales'], filters=filters))
+            self.assertEqual(list(got.columns), ['sales'])
+            self.assertEqual(len(got), len(expected))
+            np.testing.assert_allclose(got['sales'].to_numpy(), expected['sales'].to_numpy())
+
+    def test_parquet_row_group_pushdown(self):
+        # Row groups hold 1000 rows each; only the ones overlapping the range should yield batches
+        self.df.assign(row=np.arange(len(self.df))).to_parquet(self.parquet, index=False, row_group_size=1_000)
+        batches = list(self.connector.iter_file(self.parquet, chunk_rows=10_000, filters=[('row', '<', 1_500)],
+                                                as_arrow=True))
+        self.assertEqual(sum(b.num_rows for b in batches), 1_500)
+        self.assertEqual(batches[0].schema.names, ['sales', 'units', 'region', 'row'])
+
+    def test_load_file_projection(self):
+        df = self.connector.load_file(self.parquet, columns=['region'], filters=[('units', '<', 5)])
+        self.assertEqual(list(df.columns), ['region'])
+        self.assertEqual(len(df), int((self.df['units'] < 5).sum()))
+
+class TestOutOfCoreEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(1)
+        n = 3_000
+        self.df = pd.DataFrame({
+            'sales': rng.normal(100, 10, n),
+            'region': rng.choice(['North', 'South'], n, p=[0.7, 0.3])
+        })
+        self.df.loc[::5, 'sales'] = np.nan
+        self.df.loc[::9, 'region'] = None
+        self.df.loc[3, 'sales'] = 500.0
+        self.csv = os.path.join(self.tmp.name, 'data.csv')
+        self.df.to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profile_matches_in_memory(self):
+        scan = hi.core.engine.AnalysisEngine.scan(self.csv, chunk_rows=250)
+        profile = scan.profile()
+        self.assertEqual(profile['rows'], len(self.df))
+        self.assertEqual(profile['chunks'], 12)
+        self.assertEqual(profile['nulls'], self.df.isna().sum().to_dict())
+        exact = ColumnStats.from_series(self.df['sales'])
+        self.assertAlmostEqual(profile['stats']['sales'].mean, exact.mean, places=9)
+        self.assertAlmostEqual(profile['stats']['sales'].std, exact.std, places=9)
+        self.assertNotIn('region', profile['stats'])
+
+    def test_trends_and_anomalies_match_engine(self):
+        scan = hi.core.engine.AnalysisEngine.scan(self.csv, chunk_rows=400)
+        engine = hi.core.engine.AnalysisEngine(pd.read_csv(self.csv))
+        self.assertEqual(scan.analyze_trends(), engine._analyze_trends())
+        self.assertEqual(scan.detect_anomalies(), engine._detect_anomalies())
+
+    def test_fill_nulls_streams_to_disk(self):
+        scan = hi.core.engine.AnalysisEngine.scan(self.csv, chunk_rows=400)
+        for name in ('filled.csv', 'filled.parquet'):
+            out = os.path.join(self.tmp.name, name)
+            scan.fill_nulls(out)
+            filled = pd.read_parquet(out) if name.endswith('parquet') else pd.read_csv(out)
+            self.assertEqual(len(filled), len(self.df))
+            self.assertEqual(int(filled.isna().sum().sum()), 0)
+            self.assertAlmostEqual(filled.loc[0, 'sales'], self.df['sales'].mean(), places=6)
+            self.assertEqual(filled.loc[0, 'region'], 'North')
+
+class TestSQLIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dsn = f"sqlite:///{os.path.join(self.tmp.name, 'warehouse.db')}"
+        rng = np.random.default_rng(2)
+        self.df = pd.DataFrame({
+            'id': np.arange(1, 1_001),
+            'revenue': rng.normal(50, 5, 1_000),
+            'channel': rng.choice(['web', 'store'], 1_000)
+        })
+        seed = create_engine(self.dsn)
+        self.df.to_sql('orders', seed, index=False)
+        seed.dispose()
+        self.connector = DataConnector(pool_size=2)
+
+    def tearDown(self):
+        DataConnector.dispose_connections()
+        self.tmp.cleanup()
+
+    def test_engine_is_pooled_per_dsn(self):
+        engine = self.connector.get_sql_engine(self.dsn)
+        self.assertIs(DataConnector().get_sql_engine(self.dsn), engine)
+        self.assertEqual(engine.pool.size(), 2)
+        self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders")
+        self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders")
+        self.assertEqual(engine.pool.checkedout(), 0)
+        DataConnector.dispose_connections(self.dsn)
+        self.assertIsNot(self.connector.get_sql_engine(self.dsn), engine)
+
+    def test_streamed_chunks(self):
+        chunks = list(self.connector.iter_sql(self.dsn, "SELECT * FROM orders WHERE channel = :c", 150, {'c': 'web'}))
+        self.assertTrue(all(len(c) <= 150 for c in chunks))
+        self.assertEqual(sum(len(c) for c in chunks), int((self.df['channel'] == 'web').sum()))
+        full = self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders", chunksize=300)
+        pd.testing.assert_frame_equal(full, self.df)
+
+    def test_partitioned_read(self):
+        got = self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders", partition_column='id', partitions=3)
+        pd.testing.assert_frame_equal(got.sort_values('id', ignore_index=True), self.df)
+        got = self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders WHERE id > 990",
+                                            partition_column='revenue', partitions=4)
+        self.assertEqual(sorted(got['id']), list(range(991, 1_001)))
+
+    def test_partitioned_read_keeps_null_keys(self):
+        engine = self.connector.get_sql_engine(self.dsn)
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE orders SET id = NULL WHERE id % 10 = 0"))
+        plain = self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders")
+        got = self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders", partition_column='id', partitions=3)
+        self.assertEqual(len(got), 1_000)
+        self.assertEqual(got['id'].isna().sum(), 100)
+        key = ['id', 'revenue']
+        pd.testing.assert_frame_equal(got.sort_values(key, ignore_index=True), plain.sort_values(key, ignore_index=True))
+
+    def test_partition_column_is_validated(self):
+        with self.assertRaises(PartitionColumnError):
+            self.connector.fetch_from_sql(self.dsn, "SELECT * FROM orders", partition_column='id) FROM orders; --')
+        quoted = self.connector.fetch_from_sql(self.dsn, 'SELECT id AS "order id", revenue FROM orders',
+                                               partition_column='order id', partitions=2)
+        self.assertEqual(sorted(quoted['order id']), list(range(1, 1_001)))
+
+    def test_scan_query(self):
+        scan = hi.core.engine.AnalysisEngine.scan(self.dsn, chunk_rows=128, query="SELECT * FROM orders")
+        profile = scan.profile()
+        self.assertEqual(profile['rows'], 1_000)
+        self.assertEqual(profile['chunks'], 8)
+        self.assertAlmostEqual(profile['stats']['revenue'].mean, self.df['revenue'].mean(), places=9)
+
+if __name__ == '__main__':
+    unittest.main()
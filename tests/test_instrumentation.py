@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.instrumentation import Instrumentation
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_engine_phases_are_measured(self):
+        engine = hi.core.engine.AnalysisEngine()
+        engine.process_intent("Analyze growth and hidden anomalies")
+        engine.process_intent("Analyze growth and hidden anomalies")
+        engine.fill_nulls()
+        engine.replace_values('region', 'North', 'Nord')
+        engine.clean_data()
+        engine.rollback()
+        phases = engine.metrics.snapshot()["phases"]
+        for name in ("ingestion", "intent", "intent.parse", "intent.validation", "intent.ethics",
+                     "audit", "imputation", "replace", "cleaning", "commit", "rollback"):
+            self.assertIn(name, phases)
+        self.assertEqual(phases["intent"]["count"], 2)
+        self.assertEqual(phases["audit"]["count"], 1)
+        self.assertEqual(phases["ingestion"]["rows"], len(engine.data))
+        self.assertGreater(phases["commit"]["bytes"], 0)
+        self.assertEqual(engine.metrics.counters["intent_cache_hits"], 1)
+
+        audit = engine.get_performance_audit()
+        self.assertTrue(audit["average_latency"].endswith("ms"))
+        self.assertTrue(audit["throughput"].endswith("rows/sec"))
+        counted = [phases[name] for name in ("ingestion", "imputation", "cleaning", "replace")]
+        rows = sum(p["rows"] for p in counted) / sum(p["total_s"] for p in counted)
+        self.assertEqual(audit["throughput"], f"{rows:,.0f} rows/sec")
+        self.assertEqual(audit["success_rate"], 1.0)
+        self.assertIn("rss_bytes", engine.diagnostic_report()["instrumentation"]["process"])
+
+    def test_failures_are_counted(self):
+        metrics = Instrumentation()
+        with self.assertRaises(KeyError):
+            with metrics.phase("replace"):
+                raise KeyError("missing")
+        self.assertEqual(metrics.snapshot()["phases"]["replace"]["errors"], 1)
+
+    def test_quantiles_and_histogram(self):
+        metrics = Instrumentation(window=100)
+        for ms in range(1, 201):
+            metrics.observe("intent", ms / 1000, rows=10)
+        stats = metrics.snapshot()["phases"]["intent"]
+        self.assertEqual((stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]), (151.0, 196.0, 200.0))
+        self.assertEqual(stats["rows"], 2000)
+        text = metrics.to_prometheus()
+        self.assertIn('hyperinsight_phase_seconds_bucket{phase="intent",le="0.1"} 100', text)
+        self.assertIn('hyperinsight_phase_seconds_count{phase="intent"} 200', text)
+        self.assertIn("# TYPE hyperinsight_phase_rows_total counter", text)
+        openmetrics = metrics.to_prometheus(openmetrics=True)
+        self.assertIn("# TYPE hyperinsight_phase_rows counter", openmetrics)
+        self.assertTrue(openmetrics.endswith("# EOF\n"))
+
+    def test_disabled_records_nothing(self):
+        engine = hi.core.engine.AnalysisEngine(config={"instrumentation": False})
+        engine.process_intent("Show growth")
+        with engine.metrics.phase("x") as timer:
+            timer.rows = 5
+        self.assertEqual(engine.metrics.snapshot()["phases"], {})
+        self.assertEqual(engine.get_performance_audit()["average_latency"], "n/a")
+        with self.assertRaises(ValueError):
+            engine.export_metrics("json")
+
+if __name__ == '__main__':
+    unittest.main()
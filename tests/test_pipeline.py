@@ -0,0 +1,79 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.pipeline import LazyPlan
+
+class TestLazyPipeline(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 400
+        self.df = pd.DataFrame({
+            'sales': rng.choice([10.0, 20.0, -1.0, np.nan], n),
+            'region': rng.choice(['N', 'S', 'North', None], n),
+            'units': rng.integers(0, 3, n)
+        })
+
+    def recipe(self, engine):
+        engine.replace_values('region', 'N', 'North')
+        engine.replace_values('region', 'S', 'South')
+        engine.replace_values('sales', -1.0, np.nan)
+        engine.fill_nulls(strategy="auto", columns=['region'])
+        engine.clean_data()
+
+    def test_matches_eager_execution_with_one_version(self):
+        eager = hi.core.engine.AnalysisEngine(self.df.copy())
+        self.recipe(eager)
+
+        lazy = hi.core.engine.AnalysisEngine(self.df.copy(), config={"lazy": True})
+        self.recipe(lazy)
+        self.assertEqual(lazy.state_manager.current_version, 0)
+        self.assertEqual(lazy.plan.describe(), "replace(3) -> impute(auto) -> dropna -> dedup")
+        lazy.commit()
+
+        pd.testing.assert_frame_equal(lazy.data, eager.data)
+        self.assertEqual(lazy.state_manager.current_version, 1)
+        self.assertEqual(len(lazy.plan), 0)
+        lazy.rollback()
+        pd.testing.assert_frame_equal(lazy.data, self.df)
+
+    def test_collect_previews_without_committing(self):
+        engine = hi.core.engine.AnalysisEngine(self.df.copy()).lazy()
+        engine.replace_values('units', 0, 100)
+        preview = engine.collect()
+        self.assertEqual(int((preview['units'] == 100).sum()), int((self.df['units'] == 0).sum()))
+        pd.testing.assert_frame_equal(engine.data, self.df)
+        self.assertEqual(engine.state_manager.current_version, 0)
+        engine.lazy(False)  # commits what is pending
+        self.assertEqual(engine.state_manager.current_version, 1)
+        engine.replace_values('units', 100, 0)
+        self.assertEqual(engine.state_manager.current_version, 2)
+
+    def test_out_of_order_operations_start_a_new_stage(self):
+        plan = LazyPlan().clean().impute("median").replace('region', 'N', 'North').replace('region', 'North', 'X')
+        self.assertEqual(plan.describe(), "dropna -> dedup | impute(median) | replace(2)")
+        eager = hi.core.engine.AnalysisEngine(self.df.copy())
+        eager.clean_data()
+        eager.fill_nulls("median")
+        eager.replace_values('region', 'N', 'North')
+        eager.replace_values('region', 'North', 'X')
+        result, changed = plan.execute(self.df, eager.imputer)
+        pd.testing.assert_frame_equal(result, eager.data)
+        self.assertEqual(changed, ['region'])
+
+    def test_chained_replacements_compose(self):
+        series = pd.Series(['a', 'b', 'c', 'a'], name='x')
+        plan = LazyPlan().replace('x', 'a', 'b').replace('x', 'b', 'c').replace('x', 'c', 'a')
+        result, _ = plan.execute(series.to_frame('x'), None)
+        expected = series.replace('a', 'b').replace('b', 'c').replace('c', 'a')
+        pd.testing.assert_series_equal(result['x'], expected)
+
+if __name__ == '__main__':
+    unittest.main()
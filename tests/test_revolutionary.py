@@ -37,8 +37,8 @@ class TestHyperInsightRevolutionary(unittest.TestCase):
             event="revenue_drop_detected",
             confidence_threshold=0.99
         )
-        self.assertEqual(causal['root_cause'], "Marketing channel X")
-        self.assertIn("p=0.02", causal['summary'])
+        self.assertEqual(causal['target'], 'revenue')
+        self.assertIn("revenue_drop_detected", causal['summary'])
 
     def test_what_if_simulations(self):
         print("\n🧪 Testing What-if Scenario Projections...")
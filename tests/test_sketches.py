@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.utils.sketches import HyperLogLog, MisraGries, TDigest, sketch_column
+
+class TestMergeableSketches(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.values = pd.Series(rng.normal(100, 15, 200_000))
+        weights = np.r_[0.3, np.full(999, 0.7 / 999)]
+        self.labels = pd.Series(rng.choice([f"id_{i}" for i in range(1000)], 200_000, p=weights))
+
+    def test_misra_gries_mode_within_bound(self):
+        sketch = MisraGries(k=64).update(self.labels)
+        exact = self.labels.value_counts()
+        self.assertEqual(sketch.mode(), exact.idxmax())
+        self.assertGreaterEqual(sketch.counters["id_0"], exact["id_0"] - sketch.error_bound)
+        self.assertLessEqual(sketch.counters["id_0"], exact["id_0"])
+
+    def test_misra_gries_merge_matches_bound(self):
+        left = MisraGries(k=64).update(self.labels.iloc[:100_000])
+        right = MisraGries(k=64).update(self.labels.iloc[100_000:])
+        merged = left.merge(right)
+        self.assertEqual(merged.n, len(self.labels))
+        self.assertLessEqual(len(merged.counters), 64)
+        self.assertEqual(merged.mode(), "id_0")
+
+    def test_sampled_misra_gries_within_bound(self):
+        labels = pd.concat([self.labels] * 10, ignore_index=True)
+        sketch = sketch_column(labels, chunk_rows=500_000, kinds=["heavy_hitters"], sample_rows=20_000)["heavy_hitters"]
+        exact = labels.value_counts()
+        self.assertEqual(sketch.mode(), "id_0")
+        self.assertGreater(sketch.sample_variance, 0)
+        self.assertLessEqual(abs(sketch.counters["id_0"] - exact["id_0"]), sketch.error_bound)
+        self.assertAlmostEqual(sketch.n, len(labels), delta=3 * np.sqrt(sketch.sample_variance))
+
+    def test_sampled_mode_counts_at_most_sample_rows_per_chunk(self):
+        labels = pd.concat([self.labels] * 5, ignore_index=True)
+        counted = []
+        value_counts = pd.Series.value_counts
+
+        def spy(series, *args, **kwargs):
+            counted.append(len(series))
+            return value_counts(series, *args, **kwargs)
+
+        with mock.patch.object(pd.Series, "value_counts", spy):
+            sketch = sketch_column(labels, 250_000, ["heavy_hitters"], sample_rows=10_000)["heavy_hitters"]
+        self.assertEqual(counted, [10_000] * 4)
+        self.assertEqual(sketch.mode(), "id_0")
+
+    def test_tdigest_quantiles_within_rank_error(self):
+        digest = TDigest().update(self.values)
+        for q in (0.01, 0.5, 0.99):
+            estimate = digest.quantile(q)
+            true_rank = (self.values < estimate).mean()
+            self.assertLessEqual(abs(true_rank - q), digest.rank_error(q) + 1e-3)
+
+    def test_tdigest_merge_is_equivalent_to_single_pass(self):
+        merged = TDigest().update(self.values.iloc[:50_000]).merge(TDigest().update(self.values.iloc[50_000:]))
+        self.assertAlmostEqual(merged.quantile(0.5), self.values.median(), delta=0.5)
+        self.assertEqual(merged.n, len(self.values))
+
+    def test_hyperloglog_count_within_error(self):
+        hll = HyperLogLog().update(self.values)
+        relative = abs(hll.count() - len(self.values)) / len(self.values)
+        self.assertLess(relative, 4 * hll.relative_error)
+        chunked = HyperLogLog().update(self.labels.iloc[:1000]).merge(HyperLogLog().update(self.labels.iloc[1000:]))
+        self.assertAlmostEqual(chunked.count(), self.labels.nunique(), delta=25)
+
+    def test_chunked_column_sketches(self):
+        sketches = sketch_column(self.labels, chunk_rows=30_000)
+        self.assertEqual(set(sketches), {"distinct", "heavy_hitters"})
+        self.assertEqual(sketches["heavy_hitters"].n, len(self.labels))
+
+    def test_engine_approximate_mode(self):
+        df = pd.DataFrame({'label': self.labels.where(self.labels.index % 10 != 0), 'value': self.values})
+        engine = hi.core.engine.AnalysisEngine(df, config={"approximate": True, "sketch_chunk_rows": 50_000})
+        summary = engine.stats_cache["approximate"]
+        self.assertEqual(summary["label"]["mode"], "id_0")
+        self.assertIn("mode_count_error", summary["label"])
+        self.assertAlmostEqual(summary["value"]["median"], self.values.median(), delta=0.5)
+        engine.fill_nulls(strategy="auto")
+        self.assertFalse(engine.data['label'].hasnans)
+        self.assertEqual(engine.data.loc[0, 'label'], "id_0")
+
+if __name__ == "__main__":
+    unittest.main()
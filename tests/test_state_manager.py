@@ -0,0 +1,111 @@
+import pandas as pd
+import numpy as np
+import unittest
+import tempfile
+import importlib.util
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.state.manager import StateManager
+
+class TestDeltaVersioning(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'sales': [100.0, np.nan, 300.0, 300.0, 50.0],
+            'region': ['North', 'South', None, 'South', 'North'],
+            'units': [1, 2, 3, 3, 5]
+        })
+
+    def test_unchanged_columns_are_shared(self):
+        manager = StateManager(self.df)
+        updated = self.df.copy()
+        updated['units'] = updated['units'] * 10
+        manager.commit(updated, "Scale units")
+        self.assertEqual(list(manager._history[1].columns), ['units'])
+
+    def test_row_filter_stored_as_mask(self):
+        manager = StateManager(self.df)
+        manager.commit(self.df.dropna(), "Drop NA", changed=[])
+        version = manager._history[1]
+        self.assertEqual(version.columns, {})
+        self.assertEqual(list(version.row_positions), [0, 3, 4])
+
+    def test_rollback_rebuilds_every_version(self):
+        manager = StateManager(self.df)
+        cleaned = self.df.dropna()
+        manager.commit(cleaned, "Drop NA")
+        manager.create_checkpoint("clean")
+        replaced = cleaned.copy()
+        replaced['region'] = replaced['region'].replace('North', 'N')
+        manager.commit(replaced, "Rename")
+
+        pd.testing.assert_frame_equal(manager.rollback(to="clean"), cleaned)
+        pd.testing.assert_frame_equal(manager.rollback(to="initial"), self.df)
+
+    def test_rollback_result_is_isolated_from_history(self):
+        manager = StateManager(self.df)
+        restored = manager.rollback()
+        restored.loc[0, 'sales'] = -1.0
+        self.assertEqual(manager.rollback().loc[0, 'sales'], 100.0)
+
+    def test_status_reports_memory_savings(self):
+        engine = hi.core.engine.AnalysisEngine(self.df)
+        engine.clean_data()
+        engine.replace_values('region', 'North', 'N')
+        memory = engine.state_manager.get_status()['memory']
+        self.assertLess(memory['stored_bytes'], memory['full_copy_bytes'])
+        self.assertEqual(memory['saved_bytes'], memory['full_copy_bytes'] - memory['stored_bytes'])
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+class TestTieredHistory(unittest.TestCase):
+
+    def setUp(self):
+        rows = 5000
+        self.df = pd.DataFrame({
+            'sales': np.random.randn(rows),
+            'region': np.random.choice(['North', 'South', None], rows).astype(object),
+            'segment': pd.Categorical(np.random.choice(['A', 'B'], rows)),
+            'units': pd.array(np.arange(rows), dtype="Int64")
+        })
+        self.spill_dir = tempfile.mkdtemp()
+
+    def _build_history(self, manager):
+        frames = [self.df]
+        for step in range(4):
+            frame = frames[-1].copy()
+            frame['sales'] = frame['sales'] + 1
+            if step == 1:
+                frame = frame.iloc[::2]
+            manager.commit(frame, f"Step {step}")
+            frames.append(frame)
+        return frames
+
+    def test_cold_versions_spill_within_budget(self):
+        manager = StateManager(self.df, memory_budget=100_000, spill_dir=self.spill_dir)
+        self._build_history(manager)
+        memory = manager.get_status()['memory']
+        self.assertGreater(memory['spilled_versions'], 0)
+        self.assertFalse(manager._history[manager._current_index].spilled)
+        self.assertEqual(len(os.listdir(self.spill_dir)), memory['spilled_versions'])
+
+    def test_rollback_restores_spilled_versions(self):
+        manager = StateManager(self.df, memory_budget=0, spill_dir=self.spill_dir)
+        frames = self._build_history(manager)
+        manager.create_checkpoint("latest")
+        pd.testing.assert_frame_equal(manager.rollback(to="initial"), frames[0])
+        pd.testing.assert_frame_equal(manager.rollback(to="latest"), frames[-1])
+        pd.testing.assert_frame_equal(manager.rollback(), frames[-2])
+
+    def test_spilled_numeric_columns_are_memory_mapped(self):
+        manager = StateManager(self.df, memory_budget=0, spill_dir=self.spill_dir)
+        self._build_history(manager)
+        values = manager._history.column(0, 'sales')
+        self.assertFalse(values.flags.owndata)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.statistics import ColumnStats, count_outliers, fused_stats
+
+class TestVersionAwareStats(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({
+            'revenue': np.r_[rng.normal(1000, 10, 199), 5000.0],
+            'cost': rng.normal(200, 5, 200),
+            'region': rng.choice(['North', 'South'], 200)
+        })
+        self.engine = hi.core.engine.AnalysisEngine(self.df)
+
+    def test_aggregates_match_pandas(self):
+        stats = ColumnStats.from_series(self.df['revenue'])
+        self.assertAlmostEqual(stats.mean, self.df['revenue'].mean())
+        self.assertAlmostEqual(stats.std, self.df['revenue'].std())
+        self.assertEqual(stats.first, self.df['revenue'].iloc[0])
+        self.assertEqual(stats.last, 5000.0)
+        self.assertEqual(stats.max, 5000.0)
+
+    def test_merge_equals_single_pass(self):
+        values = self.df['revenue'].to_numpy()
+        merged = ColumnStats.from_values(values[:50]).merge(ColumnStats.from_values(values[50:]))
+        whole = ColumnStats.from_values(values)
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.var, whole.var)
+        self.assertEqual((merged.first, merged.last), (whole.first, whole.last))
+
+    def test_warm_cache_serves_analysis(self):
+        misses = self.engine.stats.misses
+        self.engine._analyze_trends()
+        self.assertEqual(self.engine.stats.misses, misses)
+        self.assertIn("revenue", self.engine._detect_anomalies())
+
+    def test_commit_invalidates_only_touched_columns(self):
+        self.engine.replace_values('revenue', 5000.0, 1000.0)
+        misses = self.engine.stats.misses
+        self.assertAlmostEqual(self.engine.stats_cache['mean']['revenue'], self.engine.data['revenue'].mean())
+        self.assertEqual(self.engine.stats.misses, misses + 1)
+
+    def test_rollback_reuses_earlier_entries(self):
+        before = self.engine.stats_cache['mean']['revenue']
+        self.engine.replace_values('revenue', 5000.0, 1000.0)
+        self.engine.stats_cache
+        self.engine.rollback()
+        misses = self.engine.stats.misses
+        self.assertEqual(self.engine.stats_cache['mean']['revenue'], before)
+        self.assertEqual(self.engine.stats.misses, misses)
+
+    def test_row_filter_invalidates_every_column(self):
+        self.engine.data.loc[5, 'cost'] = np.nan
+        self.engine.clean_data()
+        misses = self.engine.stats.misses
+        self.assertAlmostEqual(self.engine.stats_cache['mean']['revenue'], self.engine.data['revenue'].mean())
+        self.assertEqual(self.engine.diagnostic_report()['cache_misses'], misses + 2)
+
+class TestFusedKernel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        n = 5_000
+        self.df = pd.DataFrame({
+            'a': rng.normal(1e6, 1, n),
+            'b': rng.integers(0, 9, n),
+            'c': pd.array(rng.integers(0, 5, n), dtype='Int64'),
+            'd': rng.normal(size=n).astype('float32'),
+            'e': np.nan,
+            'f': rng.normal(size=n)
+        })
+        self.df.loc[::3, 'a'] = np.nan
+        self.df.loc[5, 'c'] = pd.NA
+        self.df.loc[[7, 11], 'f'] = [40.0, -40.0]
+
+    def test_matches_per_column_stats_for_any_block_shape(self):
+        original = self.df.copy()
+        for chunk_rows, chunk_cols in ((None, None), (1_000, 2), (7, 4)):
+            stats = fused_stats(self.df, chunk_rows=chunk_rows, chunk_cols=chunk_cols)
+            for col in self.df.columns:
+                expected, got = ColumnStats.from_series(self.df[col]), stats[col]
+                for name in ('rows', 'count', 'mean', 'var', 'min', 'max', 'first', 'last'):
+                    self.assertTrue(np.isclose(getattr(expected, name), getattr(got, name), rtol=1e-9, equal_nan=True),
+                                    (chunk_rows, col, name))
+        # Zero-copy views of the frame are never written through
+        pd.testing.assert_frame_equal(self.df, original)
+
+    def test_outlier_counts(self):
+        bounds = {col: ColumnStats.from_series(self.df[col]).bounds(3.0) for col in ('a', 'd', 'f')}
+        counts = count_outliers(self.df, bounds, chunk_rows=333)
+        for col, (low, high) in bounds.items():
+            self.assertEqual(counts[col], int(((self.df[col] > high) | (self.df[col] < low)).sum()))
+        self.assertGreaterEqual(counts['f'], 2)
+
+    def test_engine_profile_is_structured_and_cached(self):
+        engine = hi.core.engine.AnalysisEngine(self.df)
+        profile = engine.numeric_profile()
+        self.assertEqual(set(profile), {'a', 'b', 'c', 'd', 'e', 'f'})
+        self.assertEqual(profile['f']['outliers'], count_outliers(self.df, {'f': (profile['f']['low'], profile['f']['high'])})['f'])
+        self.assertAlmostEqual(profile['a']['mean'], self.df['a'].mean())
+        misses = engine.stats.misses
+        engine.numeric_profile()
+        self.assertEqual(engine.stats.misses, misses)
+
+if __name__ == "__main__":
+    unittest.main()
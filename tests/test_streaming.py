@@ -0,0 +1,65 @@
+import asyncio
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.core.streaming import StreamingAnomalyDetector
+
+class TestStreamingAnomalyDetector(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.frame = pd.DataFrame(rng.standard_normal((3_000, 2)), columns=['latency', 'errors'])
+
+    def batches(self, size=400):
+        return [self.frame.iloc[i:i + size] for i in range(0, len(self.frame), size)]
+
+    def test_state_matches_exponential_weighting(self):
+        detector = StreamingAnomalyDetector(halflife=250)
+        for batch in self.batches():
+            detector.update(batch)
+        ewm = self.frame.ewm(halflife=250)
+        np.testing.assert_allclose(detector._mean, ewm.mean().iloc[-1].to_numpy())
+        np.testing.assert_allclose(detector._m2 / detector._weight, ewm.var(bias=True).iloc[-1].to_numpy())
+
+    def test_split_batches_give_the_same_state(self):
+        whole = StreamingAnomalyDetector(halflife=None)
+        whole.update(self.frame)
+        split = StreamingAnomalyDetector(halflife=None, max_batch_rows=128)
+        split.update(self.frame)
+        np.testing.assert_allclose(split._mean, self.frame.mean().to_numpy())
+        self.assertEqual(split.batches, -(-len(self.frame) // 128))
+        self.assertLess(abs(whole._m2 / whole._weight - self.frame.var(ddof=0).to_numpy()).max(), 1e-12)
+
+    def test_engine_monitor_flags_a_spike(self):
+        engine = hi.core.engine.AnalysisEngine(self.frame.copy())
+        live = self.frame.iloc[:100].copy()
+        live.index = range(10_000, 10_100)
+        live.loc[10_042, 'latency'] = 25.0
+        live.loc[10_043, 'errors'] = np.nan
+        found = pd.concat(list(engine.monitor([live.iloc[:50], live.iloc[50:]])))
+        self.assertIn((10_042, 'latency'), list(zip(found['index'], found['column'])))
+        self.assertGreater(found.loc[found['index'] == 10_042, 'score'].iloc[0], 20)
+        self.assertEqual(engine.detector.metrics()['rows'], 100)
+
+    def test_async_stream(self):
+        async def feed():
+            for batch in self.batches():
+                yield batch
+
+        async def consume():
+            detector = StreamingAnomalyDetector(warmup=100)
+            return [found async for found in detector.arun(feed())], detector
+
+        results, detector = asyncio.run(consume())
+        self.assertEqual(len(results), len(self.batches()))
+        self.assertEqual(detector.metrics()['anomalies'], sum(len(r) for r in results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hyperinsight.utils import tensor
+from hyperinsight.utils.tensor import TensorPatternMatcher
+
+class TestLazyCoreTensor(unittest.TestCase):
+
+    def test_construction_does_not_allocate_core(self):
+        matcher = TensorPatternMatcher(dimensions=96)
+        self.assertNotIn(96, tensor._CORE_TENSORS)
+        self.assertNotIn(96, tensor._CORE_FIBRES)
+        matcher.find_latent_patterns(np.arange(10, dtype=float))
+        self.assertIn(96, tensor._CORE_FIBRES)
+        self.assertNotIn(96, tensor._CORE_TENSORS)
+
+    def test_fibre_is_shared_float32_slice_of_core(self):
+        first, second = TensorPatternMatcher(dimensions=32), TensorPatternMatcher(dimensions=32)
+        first.find_latent_patterns(np.ones(8))
+        second.find_latent_patterns(np.ones(8))
+        fibre = tensor._core_fibre(32)
+        self.assertEqual(fibre.dtype, np.float32)
+        self.assertIs(fibre, tensor._core_fibre(32))
+        np.testing.assert_array_equal(first._core_tensor[0, 0, :], fibre)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import pandas as pd
+import numpy as np
+import unittest
+import sys
+import os
+
+# Ensure local hyperinsight is importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hyperinsight as hi
+from hyperinsight.causal import intelligence
+from hyperinsight.causal.intelligence import CausalEngine
+
+class TestBootstrapUplift(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 100_000
+        segment = rng.choice(['new', 'loyal'], n)
+        promo = rng.random(n) < 0.5
+        self.df = pd.DataFrame({
+            'segment': segment,
+            'age': rng.integers(18, 80, n),
+            'promo': promo,
+            'converted': (rng.random(n) < 0.1 + np.where(segment == 'new', 0.10, 0.02) * promo).astype(int),
+            'spend': rng.normal(50, 10, n) + np.where(segment == 'new', 5, 1) * promo
+        })
+
+    def test_stratified_effects_match_pandas(self):
+        uplift = CausalEngine().calculate_uplift('promo', 'converted', self.df, by='segment', seed=0)
+        means = self.df.groupby(['segment', 'promo'])['converted'].mean().unstack()
+        cate = means[True] - means[False]
+        sizes = self.df['segment'].value_counts()
+        self.assertEqual(uplift['method'], 'stratified')
+        self.assertEqual(uplift['rows'], len(self.df))
+        for segment in ('new', 'loyal'):
+            self.assertAlmostEqual(uplift['strata'][segment]['cate'], cate[segment])
+        self.assertAlmostEqual(uplift['ate'], (cate * sizes).sum() / sizes.sum())
+        self.assertEqual(uplift['strata']['new']['treated'], int((self.df['promo'] & (self.df['segment'] == 'new')).sum()))
+
+    def test_intervals_cover_the_true_effects(self):
+        causal = CausalEngine()
+        for outcome, truth in (('converted', {'new': 0.10, 'loyal': 0.02}), ('spend', {'new': 5.0, 'loyal': 1.0})):
+            uplift = causal.calculate_uplift('promo', outcome, self.df, by=['segment'], seed=2, replicates=400)
+            for segment, effect in truth.items():
+                low, high = uplift['strata'][segment]['ci']
+                self.assertLess(low, effect)
+                self.assertGreater(high, effect)
+            low, high = uplift['ci']
+            self.assertLess(low, uplift['ate'])
+            self.assertGreater(high, uplift['ate'])
+
+    def test_bootstrap_spread_matches_standard_error(self):
+        uplift = CausalEngine().calculate_uplift('promo', 'spend', self.df, seed=3, replicates=1_000)
+        arms = self.df.groupby('promo')['spend']
+        se = np.sqrt((arms.var() / arms.count()).sum())
+        low, high = uplift['ci']
+        self.assertAlmostEqual((high - low) / (2 * 1.96 * se), 1.0, delta=0.12)
+        self.assertEqual(list(uplift['strata']), ['all'])
+
+    def test_seeded_and_pooled_runs_agree(self):
+        df = self.df.iloc[:20_000]
+        serial = CausalEngine(max_workers=1).calculate_uplift('promo', 'spend', df, by='age', seed=5, replicates=100)
+        self.assertEqual(len(serial['strata']), intelligence.STRATA_BINS)
+        threshold = intelligence.PARALLEL_MIN_DRAWS
+        intelligence.PARALLEL_MIN_DRAWS = 1
+        try:
+            pooled = CausalEngine(max_workers=2).calculate_uplift('promo', 'spend', df, by='age', seed=5, replicates=100)
+        finally:
+            intelligence.PARALLEL_MIN_DRAWS = threshold
+        self.assertEqual(pooled, serial)
+
+    def test_treatment_levels(self):
+        df = self.df.assign(arm=np.where(self.df['promo'], 'email', 'none'))
+        with self.assertRaises(ValueError):
+            CausalEngine().calculate_uplift('arm', 'converted', df)
+        labelled = CausalEngine().calculate_uplift('arm', 'converted', df, treated='email', seed=1, replicates=50)
+        boolean = CausalEngine().calculate_uplift('promo', 'converted', df, seed=1, replicates=50)
+        self.assertEqual(labelled['ci'], boolean['ci'])
+        with self.assertRaises(ValueError):
+            CausalEngine().calculate_uplift('promo', 'converted')
+
+    def test_engine_uses_its_frame(self):
+        engine = hi.core.engine.AnalysisEngine(self.df)
+        first = engine.calculate_uplift('promo', 'converted', by='segment', seed=4, replicates=100)
+        self.assertIs(engine.calculate_uplift('promo', 'converted', by=['segment'], seed=4, replicates=100), first)
+        self.assertEqual(engine.metrics.snapshot()['phases']['analysis.uplift']['count'], 1)
+        engine.replace_values('segment', 'loyal', 'returning')
+        self.assertIn('returning', engine.calculate_uplift('promo', 'converted', by='segment', seed=4,
+                                                           replicates=100)['strata'])
+
+    def test_list_valued_options(self):
+        arms = np.where(self.df['promo'], np.where(self.df['age'] % 2 == 0, 'email', 'sms'), 'none')
+        engine = hi.core.engine.AnalysisEngine(self.df.assign(arm=arms))
+        uplift = engine.calculate_uplift('arm', 'converted', treated=['email', 'sms'], seed=6, replicates=50)
+        self.assertIs(engine.calculate_uplift('arm', 'converted', treated=['email', 'sms'], seed=6, replicates=50), uplift)
+        boolean = CausalEngine().calculate_uplift('promo', 'converted', self.df, seed=6, replicates=50)
+        self.assertEqual(uplift['ci'], boolean['ci'])
+
+    def test_tiny_stratum_with_few_replicates(self):
+        rng = np.random.default_rng(7)
+        df = pd.DataFrame({'promo': np.arange(2_000) % 2 == 0, 'y': rng.standard_normal(2_000),
+                           'group': ['rare'] + ['common'] * 1_999})
+        causal = CausalEngine()
+        for seed in range(20):
+            uplift = causal.calculate_uplift('promo', 'y', df, by='group', seed=seed, replicates=1)
+            self.assertTrue(np.isfinite(uplift['strata']['common']['cate']))
+
+if __name__ == '__main__':
+    unittest.main()